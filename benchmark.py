@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""The directly runnable script for benchmarking sorting algorithms without a window.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import os
+import sys
+import modules.algorithm_registry as algorithm_registry
+import modules.benchmark_engine as benchmark_engine
+import modules.input_generators as input_generators
+import modules.numpy_algorithms as numpy_algorithms
+import modules.parallel_algorithms as parallel_algorithms
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+# The names of every registered algorithm, used as the default when no algorithm is specified.
+ALGORITHM_NAMES = algorithm_registry.names() # (Read from the registry's index, without importing every algorithm.)
+# The names of the parallel algorithms, used as the default of a scaling benchmark.
+PARALLEL_ALGORITHM_NAMES = [parallel_algorithms.parallel_merge.__name__, parallel_algorithms.sample_sort.__name__]
+
+# The help text to be displayed on the screen.
+__help__ = f"""
+USAGE:
+    python benchmark.py -t [algorithms] -l [lengths]
+
+    Flags:
+        -t [algorithms] (Optional): Comma separated algorithms to benchmark. Defaults to all of them.
+            Choose from: {', '.join(ALGORITHM_NAMES)}
+        -l [lengths] (Optional): Comma separated array lengths to benchmark at. Defaults to 1000.
+        -r [repeats] (Optional): The number of times to repeat each algorithm at each length. Defaults to 3.
+        -dist [distributions] (Optional): Comma separated shapes of array to sort. Defaults to uniform.
+            Choose from: {', '.join(input_generators.__distributions__.keys())}
+        -seed [seed] (Optional): The random seed of the arrays, every algorithm sorts the same arrays. Defaults to 0.
+        -p [workers] (Optional): The number of worker processes to spread the repeats across. Defaults to 1.
+        -scaling (Optional): Time the algorithms with 1, 2, 4, ... worker processes each, up to -p (Defaults to every core), with the speedup over 1.
+            The algorithms default to the parallel ones: {', '.join(PARALLEL_ALGORITHM_NAMES)}
+        -numpy (Optional): Sort contiguous NumPy arrays instead of Python lists, requires NumPy.
+        -instrument (Optional): Also count comparisons, reads, writes, passes and peak memory (Lists only, runs are much slower).
+        -f [format] (Optional): The output format, csv or json. Defaults to csv.
+        -o [file] (Optional): The file to write the results to. Defaults to printing them.
+        -h (Optional): Prints this message.
+
+    Example: python benchmark.py -t quick_sort,shell -l 1000,10000 -r 5 -p 4 -dist uniform,nearly_sorted -f json
+    Example: python benchmark.py -scaling -l 1000000 -p 8
+"""
+
+
+def flag_value(flag, default):
+    """Get the value given after a command line flag.
+
+    Args:
+        flag (str): The flag to look for, e.g. "-l".
+        default (str): The value to return when the flag has not been given.
+
+    Returns:
+        str: The value after the flag, or the default.
+    """
+    if flag in sys.argv and sys.argv.index(flag) + 1 < len(sys.argv): # Checks if flag exists and has a value after it.
+        return sys.argv[sys.argv.index(flag) + 1]
+    return default
+
+
+if __name__ == "__main__": # If the file is being run directly (not imported as a library)...
+
+    if "-h" in sys.argv: # Checks if help flag exists.
+        print(__help__)
+        sys.exit()
+
+    scaling = "-scaling" in sys.argv # Whether to time the algorithms with more and more workers.
+    algorithms = flag_value("-t", ",".join(PARALLEL_ALGORITHM_NAMES if scaling else ALGORITHM_NAMES)).split(",") # The algorithms to benchmark.
+    lengths, repeats = flag_value("-l", "1000").split(","), flag_value("-r", "3") # The array lengths and the number of repeats.
+    workers = flag_value("-p", str(os.cpu_count() or 1) if scaling else "1") # The number of worker processes (The most to scale to, when scaling).
+    distributions, seed = flag_value("-dist", "uniform").split(","), flag_value("-seed", "0") # The shapes of array and their seed.
+    output_format, output_file = flag_value("-f", "csv"), flag_value("-o", None) # Where and how to write the results.
+
+    # Check every algorithm exists and every number is a digit before spending any time benchmarking.
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHM_NAMES:
+            print(f"ERROR: The algorithm '{algorithm}' does not exist.")
+            print(__help__)
+            sys.exit(1)
+    for distribution in distributions:
+        if distribution not in input_generators.__distributions__:
+            print(f"ERROR: The distribution '{distribution}' does not exist.")
+            print(__help__)
+            sys.exit(1)
+    if not all(length.isdigit() for length in lengths) or not all(value.isdigit() for value in (repeats, workers, seed)):
+        print("ERROR: Lengths, repeats, workers and the seed must be whole numbers.")
+        print(__help__)
+        sys.exit(1)
+    if int(repeats) < 1 or int(workers) < 1: # Every algorithm must be run at least once, by at least one process.
+        print("ERROR: There must be at least one repeat and at least one worker.")
+        print(__help__)
+        sys.exit(1)
+    if "-numpy" in sys.argv and numpy_algorithms.numpy is None:
+        print("ERROR: The -numpy flag requires NumPy, install it with 'pip install numpy'.")
+        sys.exit(1)
+    if "-instrument" in sys.argv and "-numpy" in sys.argv:
+        print("ERROR: The -instrument flag can only count Python lists, it cannot be used with -numpy.")
+        sys.exit(1)
+    if output_format not in ("csv", "json"):
+        print(f"ERROR: The output format '{output_format}' is not supported.")
+        print(__help__)
+        sys.exit(1)
+
+    if scaling and "-instrument" in sys.argv:
+        print("ERROR: The -instrument flag slows every run down the same, it cannot be used with -scaling.")
+        sys.exit(1)
+
+    # Run the benchmark and format the results.
+    if scaling: # Double the workers each time (1, 2, 4, ...), finishing with the most workers even when it is not a power of two.
+        worker_counts = [2**power for power in range(int(workers).bit_length()) if 2**power < int(workers)] + [int(workers)]
+        results = benchmark_engine.run_scaling(
+            algorithms, [int(length) for length in lengths], worker_counts, int(repeats),
+            "numpy" if "-numpy" in sys.argv else "list", distributions, int(seed),
+        )
+    else:
+        results = benchmark_engine.run_benchmark(
+            algorithms, [int(length) for length in lengths], int(repeats), int(workers),
+            "numpy" if "-numpy" in sys.argv else "list", distributions, int(seed), "-instrument" in sys.argv,
+        )
+    formatted_results = benchmark_engine.format_results(results, output_format)
+
+    if output_file: # If an output file was given, write the results to it...
+        with open(output_file, "w") as file:
+            file.write(formatted_results)
+    else: # ...otherwise print them.
+        print(formatted_results)
@@ -1,15 +1,22 @@
 #!/usr/bin/env python
 """The main, directly runnable, script for visualising sorting algorithms.
 
+pygame (and the window engine) are only imported once a window is actually opened, and only the module holding the chosen algorithm
+is imported (see algorithm_registry), so runs without a window (printing the help, recording, exporting, sorting a file headless)
+start in a fraction of the time. The engine, and the modules only some flags use, are imported once the flags show they are needed,
+so printing the help never builds the engine.
+
 Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
 """
 
-import math
-import pygame
+import argparse
+import os
 import sys
-import modules.algorithm_engine as algorithm_engine
-import modules.window_engine as window_engine
-import modules.sorting_algorithms as sorting_algorithms
+import time
+import modules.algorithm_registry as algorithm_registry
+import modules.input_generators as input_generators
+import modules.keyed_sort as keyed_sort
+import modules.numpy_algorithms as numpy_algorithms
 
 __author__ = "Archer Hume"
 __copyright__ = "Copyright (C) 2022 Archer Hume"
@@ -20,110 +27,438 @@ __email__ = "archer@hume.email"
 __status__ = "Development"
 
 
+DEFAULT_WIDTH, DEFAULT_HEIGHT = 1000, 500 # The size of the window (and exported frames) in pixels.
+
+
+def help_text():
+    """Get the help text to be displayed on the screen.
 
-ALGORITHM_ENGINE_OBJECT = algorithm_engine.Algorithm() # Declares the algorithm engine.
-# Assigns the algorithms to be used to the algorithm engine using the algorithm wrapper.
-for undecorated_algorithm in sorting_algorithms.__algorithms__:
-    ALGORITHM_ENGINE_OBJECT.algorithm_add(undecorated_algorithm)
+    It is only built when it is needed, the algorithm names come from the registry's index, so no algorithm has to be imported to print it.
 
-# The help text to be displayed on the screen.
-__help__ = f"""
+    Returns:
+        str: The help text.
+    """
+    return f"""
 USAGE:
     python main.py -t [algorithm]
 
     Flags:
         -t [algorithm] (Required): The algorithm you would like to run.
-            Choose from: {', '.join(ALGORITHM_ENGINE_OBJECT._algorithm_types.keys())}
+            Choose from: {', '.join(algorithm_registry.names())}
         -l [length] (Optional): The length of the array to be sorted. Defaults to 5000.
         -r [repeats] (Optional): The number of times to repeat the algorithm. Defaults to 3.
-        -d [delay] (Optional): The delay between each step of the algorithm, used to watch each individual step. Defaults to 0.
-        -width [width] (Optional): The width of the screen. Defaults to 800.
-        -height [height] (Optional): The height of the screen. Defaults to 600.
+        -d [delay] (Optional): The delay in seconds between each step of the algorithm (e.g. 0.01 for 100 steps per second). Defaults to 0.
+        -spf [steps] (Optional): The number of steps to run for each frame drawn, fractions run a step every few frames (e.g. 0.25). Overrides -d.
+        -dist [distribution] (Optional): The shape of the array to be sorted. Defaults to uniform.
+            Choose from: {', '.join(input_generators.__distributions__.keys())}
+        -seed [seed] (Optional): The random seed of the array, the same seed always gives the same arrays. Defaults to random.
+        -numpy (Optional): Sort a contiguous NumPy array instead of a Python list, requires NumPy.
+        -key [key] (Optional): Sort the elements by a key instead of by themselves, elements with equal keys keep their order.
+            Choose from: {', '.join(keyed_sort.KEYS.keys())}
+        -reverse (Optional): Sort largest first, elements that are equal keep their order.
+        -fps [rate] (Optional): The number of times per second the window is redrawn. Defaults to 66.
+        -history (Optional): Record every change made to the array, so a paused run can be scrubbed back and forth with the arrow keys.
+        -record [file] (Optional): Record one run of the algorithm to a trace file, headless and at full speed, instead of opening the window.
+        -compress (Optional): Compress the trace file written by -record.
+        -replay [file] (Optional): Replay a trace file in the window instead of running an algorithm (-t is not needed). Use -d or -spf to set the speed.
+        -export [file or directory] (Optional): Export the run (or the trace given to -replay) as a GIF (a file ending in .gif) or numbered PNG images, instead of opening the window.
+            The frames are drawn off-screen, so this takes far less time than the clip lasts. Requires NumPy.
+        -duration [seconds] (Optional): The length of the exported clip, used to work out the steps per frame unless -spf is given. Defaults to 10.
+        -p [workers] (Optional): The number of worker processes to draw exported frames on, and the parallel algorithms sort with. Defaults to one per CPU.
+        -stream [batch size] (Optional): Sort the array as if it arrived in batches of this size, each batch is sorted with the algorithm and merged into the runs sorted so far.
+        -sortfile [file] (Optional): Sort a file of fixed-width integers out of memory, sorting each run with the algorithm, instead of an array.
+        -output [file] (Optional): The file to write the sorted records to. Defaults to the -sortfile file with .sorted added.
+        -memory [MiB] (Optional): The memory the file is sorted with, in MiB. Defaults to 256.
+        -runlength [records] (Optional): The number of records sorted in memory at once. Defaults to as many as fit in -memory.
+        -recordbytes [bytes] (Optional): The width of each record, 4 or 8 bytes (little-endian signed integers). Defaults to 8.
+        -headless (Optional): Sort the file without opening the window (The runs are sorted at full speed).
+        -instrument (Optional): Count the comparisons, reads, writes and passes of each run and show them on screen (Lists only, runs are much slower).
+        -width [width] (Optional): The width of the screen. Defaults to {DEFAULT_WIDTH}.
+        -height [height] (Optional): The height of the screen. Defaults to {DEFAULT_HEIGHT}.
         -h (Optional): Prints this message.
-        -debug (Optional): Enables debug mode.
+        -debug (Optional): Enables debug mode (Profiles each repeat and prints where the time went).
+
+    Keys:
+        Space: Pause or resume the algorithm.
+        . (Full stop): Run one step while paused.
+        Left / Right arrows: Seek back or forward through the recorded changes (Needs -history).
+        Home / End: Seek to the start of the recording, or back to the live array and resume.
 
     Example: python main.py -t selection -l 10000 -r 6
+    Example: python main.py -t bubble -l 3000 -record bubble.trace -compress, then python main.py -replay bubble.trace -spf 200
+    Example: python main.py -t merge -l 100000 -export merge_frames -fps 60 -duration 20
+    Example: python main.py -t quick_sort -sortfile numbers.bin -memory 64 -headless
+    Example: python main.py -t insertion -l 20000 -stream 500
+    Example: python main.py -t radix -l 2000 -key last_digit -reverse
 """
 
 
+def whole_number(value):
+    """Flag type: a whole number, zero or more (e.g. a length).
+
+    Args:
+        value (str): The value given after a flag.
+
+    Raises:
+        argparse.ArgumentTypeError: When the value is not a whole number.
+
+    Returns:
+        int: The number.
+    """
+    if not value.isdigit():
+        raise argparse.ArgumentTypeError(f"'{value}' is not a whole number")
+    return int(value)
+
+
+def positive_whole_number(value):
+    """Flag type: a whole number greater than zero (e.g. a number of workers).
+
+    Args:
+        value (str): The value given after a flag.
+
+    Raises:
+        argparse.ArgumentTypeError: When the value is not a whole number greater than zero.
+
+    Returns:
+        int: The number.
+    """
+    if not value.isdigit() or int(value) == 0:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a whole number greater than zero")
+    return int(value)
+
+
+def positive_number(value):
+    """Flag type: a number greater than zero, fractions included (e.g. a delay).
+
+    Args:
+        value (str): The value given after a flag.
+
+    Raises:
+        argparse.ArgumentTypeError: When the value is not a number greater than zero.
+
+    Returns:
+        float: The number.
+    """
+    try:
+        number = float(value)
+    except ValueError: # The value is not a number at all.
+        number = None
+    if number is None or not number > 0:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a number greater than zero")
+    return number
+
+
+def non_negative_number(value):
+    """Flag type: a number of zero or more, fractions included (e.g. a delay, where zero is no delay).
+
+    Args:
+        value (str): The value given after a flag.
+
+    Raises:
+        argparse.ArgumentTypeError: When the value is not a number of zero or more.
+
+    Returns:
+        float: The number.
+    """
+    try:
+        number = float(value)
+    except ValueError: # The value is not a number at all.
+        number = None
+    if number is None or not number >= 0:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a number of zero or more")
+    return number
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser class that reports a mistake in the flags the same way as the rest of the script, followed by the help text."""
+
+    def error(self, message):
+        print(f"ERROR: {message[0].upper() + message[1:]}.")
+        print(help_text())
+        sys.exit(2)
+
+
+def parse_arguments(arguments=None):
+    """Read the command line flags.
+
+    Each flag is checked (e.g. that a length is a whole number, or that a distribution exists) before anything is run.
+
+    Args:
+        arguments (list, optional): The flags to read. Defaults to None (The flags the script was run with).
+
+    Returns:
+        argparse.Namespace: The value of every flag, named after it (e.g. .length for -l, see the dest of each flag below).
+    """
+    # The help is printed by the script itself (-h), and flags are never shortened (e.g. -rev for -reverse), as several start the same way.
+    parser = _ArgumentParser(prog="main.py", add_help=False, allow_abbrev=False)
+    parser.add_argument("-t", dest="algorithm")
+    parser.add_argument("-l", dest="length", type=positive_whole_number, default=5000)
+    parser.add_argument("-r", dest="repeats", type=positive_whole_number, default=3)
+    parser.add_argument("-d", dest="delay", type=non_negative_number, default=0)
+    parser.add_argument("-spf", dest="steps_per_frame", type=positive_number)
+    parser.add_argument("-dist", dest="distribution", choices=list(input_generators.__distributions__.keys()), default="uniform")
+    parser.add_argument("-seed", dest="seed", type=whole_number)
+    parser.add_argument("-numpy", dest="numpy", action="store_true")
+    parser.add_argument("-key", dest="key", choices=list(keyed_sort.KEYS.keys()))
+    parser.add_argument("-reverse", dest="reverse", action="store_true")
+    parser.add_argument("-fps", dest="fps", type=positive_whole_number)
+    parser.add_argument("-history", dest="history", action="store_true")
+    parser.add_argument("-record", dest="record")
+    parser.add_argument("-compress", dest="compress", action="store_true")
+    parser.add_argument("-replay", dest="replay")
+    parser.add_argument("-export", dest="export")
+    parser.add_argument("-duration", dest="duration", type=positive_number) # (Defaults to frame_export.DEFAULT_DURATION.)
+    parser.add_argument("-p", dest="workers", type=positive_whole_number)
+    parser.add_argument("-stream", dest="stream", type=positive_whole_number)
+    parser.add_argument("-sortfile", dest="sortfile")
+    parser.add_argument("-output", dest="output")
+    parser.add_argument("-memory", dest="memory", type=positive_number)
+    parser.add_argument("-runlength", dest="run_length", type=whole_number)
+    parser.add_argument("-recordbytes", dest="record_bytes", type=int, choices=[4, 8])
+    parser.add_argument("-headless", dest="headless", action="store_true")
+    parser.add_argument("-instrument", dest="instrument", action="store_true")
+    parser.add_argument("-width", dest="width", type=positive_whole_number, default=DEFAULT_WIDTH)
+    parser.add_argument("-height", dest="height", type=positive_whole_number, default=DEFAULT_HEIGHT)
+    parser.add_argument("-h", dest="help", action="store_true")
+    parser.add_argument("-debug", dest="debug", action="store_true")
+    return parser.parse_args(arguments)
+
+
+def export_run(func, sorting_array, arguments):
+    """Export a run as a GIF or PNG images, as asked for by the -export, -fps, -duration, -spf and -p flags, then exit.
+
+    Args:
+        func (function): The algorithm (Or a trace replay, see trace_file.replayer()).
+        sorting_array (array): The array to be sorted.
+        arguments (argparse.Namespace): The flags, see parse_arguments().
+    """
+    import modules.frame_export as frame_export # (Only imported when a run is exported.)
+    if frame_export.numpy is None: # If NumPy is not installed, the frames cannot be drawn.
+        print("ERROR: The -export flag requires NumPy, install it with 'pip install numpy'.")
+        sys.exit()
+    fps = arguments.fps or frame_export.DEFAULT_FPS # The frames per second of the clip.
+
+    steps_per_frame = arguments.steps_per_frame
+    if steps_per_frame is None: # Spread the whole run over the length of the clip, counting its steps with a run on a copy of the array.
+        duration = arguments.duration or frame_export.DEFAULT_DURATION # The length of the clip in seconds.
+        steps_per_frame = max(frame_export.count_steps(func, sorting_array) / (duration * fps), 1e-9)
+
+    print(f"Exporting {func.__name__} on {len(sorting_array)} elements to {arguments.export} at {fps} fps ({round(steps_per_frame, 2)} steps per frame)...")
+    start_time = time.perf_counter()
+    frame_count = frame_export.export_frames(
+        func(sorting_array), sorting_array, arguments.export, steps_per_frame, fps, arguments.width, arguments.height, arguments.workers,
+    )
+    print(f"Exported {frame_count} frames ({round(frame_count / fps, 2)} seconds of clip) in {round(time.perf_counter() - start_time, 2)} seconds.")
+    sys.exit()
+
+
+def external_sort_settings(arguments):
+    """Get the settings of an external sort, as asked for by the -sortfile, -output, -memory, -runlength and -recordbytes flags.
+
+    Args:
+        arguments (argparse.Namespace): The flags, see parse_arguments().
+
+    Returns:
+        dict: The settings, see algorithm_engine.Algorithm._external_sort.
+    """
+    if not os.path.isfile(arguments.sortfile): # The file to sort must exist.
+        print(f"ERROR: The file to sort '{arguments.sortfile}' does not exist.")
+        print(help_text())
+        sys.exit()
+    settings = {"input_path": arguments.sortfile, "output_path": arguments.output or arguments.sortfile + ".sorted"}
+
+    if arguments.memory is not None: # The memory budget is given in MiB.
+        settings["memory_budget"] = int(arguments.memory * 1024 * 1024)
+    if arguments.run_length is not None: # 0 means as many as fit in the memory budget.
+        settings["run_records"] = arguments.run_length or None
+    if arguments.record_bytes is not None:
+        settings["record_width"] = arguments.record_bytes
+    if os.path.getsize(arguments.sortfile) % settings.get("record_width", 8): # The file must be a whole number of records.
+        print(f"ERROR: The file '{arguments.sortfile}' is not a whole number of {settings.get('record_width', 8)} byte records.")
+        sys.exit()
+    return settings
+
+
+def open_window(engine, arguments):
+    """Open the window, and have the engine publish snapshots of the array for it to draw.
+
+    pygame is only imported here, the first time a window is needed, so runs that never open one do not wait for it.
+
+    Args:
+        engine (algorithm_engine.Algorithm): The engine whose array is drawn.
+        arguments (argparse.Namespace): The flags, see parse_arguments().
+
+    Returns:
+        window_engine.Window: The window.
+    """
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # pygame prints a banner when it is imported, the script has printed its own header.
+    import modules.snapshot_channel as snapshot_channel
+    import modules.window_engine as window_engine
+    # Initialise the new window.
+    display_window = window_engine.Window(arguments.width, arguments.height, engine)
+    engine._track_writes = True # Record the writes to the array, so the window only redraws what changed.
+    # Have the engine publish snapshots of the array for the window to draw (As often as asked for by -fps).
+    snapshot_interval = 1 / arguments.fps if arguments.fps else snapshot_channel.DEFAULT_INTERVAL
+    engine._snapshot_channel = snapshot_channel.SnapshotChannel(arguments.width, snapshot_interval)
+    return display_window
+
+
 if __name__ == "__main__": # If the file is being run directly (not imported as a library)...
-    
-    screen_width, screen_height = 1000, 500 # Set the width and height of the window.
-    
+
     # Print the header to command line.
     print("+" + "-"*65 + "+" + "\n| Sorting Algorithm Visualizer by Archer Hume                     |\n" + "+" + "-"*65 + "+\n")
-    
-    # Check if the user has specified a length of the array to be sorted.
-    if "-l" in sys.argv and sys.argv[sys.argv.index("-l") + 1].isdigit(): # Checks if flag exists and if value is a digit.
-        ALGORITHM_ENGINE_OBJECT._array_length = int(sys.argv[sys.argv.index("-l") + 1]) # Set the length of the array to be sorted.
-    
-    # Check if the user has specified the number of times to repeat the algorithm.
-    if "-r" in sys.argv and sys.argv[sys.argv.index("-r") + 1].isdigit(): # Checks if flag exists and if value is a digit.
-        ALGORITHM_ENGINE_OBJECT._repeats = int(sys.argv[sys.argv.index("-r") + 1]) # Set the number of times to repeat the algorithm.
-    
-    # Check if the user has specified a delay between each algorithm step.
-    if "-d" in sys.argv and sys.argv[sys.argv.index("-d") + 1].isnumeric(): # Checks if flag exists and if value is a number.
-        ALGORITHM_ENGINE_OBJECT._algorithm_delay = int(sys.argv[sys.argv.index("-d") + 1]) # Set the delay between each algorithm step.
-    
-    # Check if the user has specified a width of the window.
-    if "-width" in sys.argv and sys.argv[sys.argv.index("-w") + 1].isdigit(): # Checks if flag exists and if value is a digit.
-        screen_width = int(sys.argv[sys.argv.index("-w") + 1]) # Set the width of the window.
-    
-    # Check if the user has specified a height of the window.
-    if "-height" in sys.argv and sys.argv[sys.argv.index("-h") + 1].isdigit(): # Checks if flag exists and if value is a digit.
-        screen_height = int(sys.argv[sys.argv.index("-h") + 1]) # Set the height of the window.
-    
-    # Check if the user has specified an algorithm to run.
-    if len(sys.argv) > 1 and "-t" in sys.argv: # Checks if flag exists.
-        # Check if algorithm in flag exists.
-        if sys.argv[sys.argv.index("-t") + 1] in ALGORITHM_ENGINE_OBJECT._algorithm_types.keys():
-            # Initialise the new window.
-            display_window = window_engine.Window(screen_width, screen_height, ALGORITHM_ENGINE_OBJECT) 
-            # run the algorithm.
-            ALGORITHM_ENGINE_OBJECT.start(sys.argv[sys.argv.index("-t") + 1])
-        else:
-            print(f"ERROR: The algorithm '{sys.argv[sys.argv.index('-t') + 1]}' does not exist.")
-            print(__help__)
-            sys.exit()
-    elif "-h" in sys.argv: # Checks if help flag exists.
-        # If no algorithm is specified or the -h flag is used, print __help__ and exit.
-        print("No algorithm specified.")
-        print(__help__)
+
+    arguments = parse_arguments() # Read (and check) every flag.
+
+    if arguments.help or (arguments.algorithm is None and arguments.replay is None):
+        # If no algorithm is specified or the -h flag is used, print the help and exit.
+        if not arguments.help: print("No algorithm specified.")
+        print(help_text())
         sys.exit()
-    else:
-        # If no algorithm is specified or the -h flag is used, print __help__ and exit.
-        print("No algorithm specified.")
-        print(__help__)
+
+    # Check if the user has asked for a NumPy array to be sorted.
+    if arguments.numpy and numpy_algorithms.numpy is None: # If NumPy is not installed, the array cannot be created.
+        print("ERROR: The -numpy flag requires NumPy, install it with 'pip install numpy'.")
+        sys.exit()
+
+    # Batches are merged, and files are sorted, by the values themselves.
+    if (arguments.key or arguments.reverse) and (arguments.stream or arguments.sortfile):
+        print("ERROR: The -key and -reverse flags cannot be used with -stream or -sortfile.")
+        sys.exit()
+
+    # Only Python lists can be instrumented.
+    if arguments.instrument and arguments.numpy:
+        print("ERROR: The -instrument flag can only count Python lists, it cannot be used with -numpy.")
         sys.exit()
 
-    
+    import modules.algorithm_engine as algorithm_engine # (Imported once the flags are known to be good, so the help never waits for it.)
+    import modules.trace_file as trace_file
+
+    # Declare the algorithm engine with the settings given by the flags.
+    ALGORITHM_ENGINE_OBJECT = algorithm_engine.Algorithm(
+        arguments.length, arguments.repeats, arguments.delay, arguments.debug,
+        backend="numpy" if arguments.numpy else "list", # The type of array to be sorted.
+        distribution=arguments.distribution, seed=arguments.seed, # The shape of the array to be sorted and its random seed.
+        key=keyed_sort.KEYS.get(arguments.key), reverse=arguments.reverse, # The key the elements are sorted by, and whether largest first.
+    )
+    ALGORITHM_ENGINE_OBJECT._steps_per_frame = arguments.steps_per_frame # The steps run for each frame (None to use the delay).
+    ALGORITHM_ENGINE_OBJECT._instrument = arguments.instrument # Count what the algorithm does as well as timing it.
+    ALGORITHM_ENGINE_OBJECT._record_operations = arguments.history # Record the changes of each repeat, so they can be sought through.
+
+    # Check if the user has specified the number of worker processes the parallel algorithms sort with.
+    if arguments.workers is not None:
+        import modules.parallel_algorithms as parallel_algorithms # (Only imported when it is needed, it starts the worker processes.)
+        parallel_algorithms.set_workers(arguments.workers)
+
+    # Check if the user has asked to replay a trace file.
+    if arguments.replay is not None:
+        try:
+            ALGORITHM_ENGINE_OBJECT._replay_trace = trace_file.TraceReader(arguments.replay)
+        except (OSError, trace_file.TraceFormatError) as error: # The file does not exist, or is not a trace file.
+            print(f"ERROR: {error}")
+            sys.exit()
+        algorithm_name = ALGORITHM_ENGINE_OBJECT._replay_trace.metadata["algorithm"]
+        ALGORITHM_ENGINE_OBJECT._array_length = ALGORITHM_ENGINE_OBJECT._replay_trace.metadata["length"]
+        ALGORITHM_ENGINE_OBJECT._repeats = 1 # A trace holds one run.
+        if arguments.export is not None: # If the replay should be exported rather than shown...
+            with ALGORITHM_ENGINE_OBJECT._replay_trace as reader: # (The trace is closed when the export exits.)
+                export_run(trace_file.replayer(reader), reader.initial_array(), arguments)
+        display_window = open_window(ALGORITHM_ENGINE_OBJECT, arguments)
+        # replay the trace.
+        ALGORITHM_ENGINE_OBJECT.start(algorithm_name)
+    else: # An algorithm has been specified to run.
+        algorithm_name = arguments.algorithm
+        try: # Add the algorithm to the engine, importing only the module that holds it.
+            ALGORITHM_ENGINE_OBJECT.algorithm_add(algorithm_registry.load(algorithm_name))
+        except algorithm_registry.AlgorithmExistanceError:
+            print(f"ERROR: The algorithm '{algorithm_name}' does not exist.")
+            print(help_text())
+            sys.exit()
+        # Check if the user has asked for the array to arrive in batches.
+        if arguments.stream is not None:
+            # Register the streamed version of the algorithm and run it instead.
+            import modules.incremental_sort as incremental_sort
+            streamed_algorithm = incremental_sort.streamed(ALGORITHM_ENGINE_OBJECT._algorithm_types[algorithm_name], arguments.stream)
+            ALGORITHM_ENGINE_OBJECT.algorithm_add(streamed_algorithm)
+            algorithm_name = streamed_algorithm.__name__
+        # Check if the user has asked for a file to be sorted out of memory, rather than an array.
+        if arguments.sortfile is not None:
+            ALGORITHM_ENGINE_OBJECT._external_sort = external_sort_settings(arguments)
+            if arguments.headless: # If no window is wanted, sort the file on this thread and print how long it took.
+                print(f"Sorting {ALGORITHM_ENGINE_OBJECT._external_sort['input_path']} into {ALGORITHM_ENGINE_OBJECT._external_sort['output_path']} with {algorithm_name}...")
+                ALGORITHM_ENGINE_OBJECT.start(algorithm_name, threaded=False)
+                print(f"Sort Time: {round(ALGORITHM_ENGINE_OBJECT._finished_times[-1], 4)}")
+                sys.exit()
+        if arguments.record is not None: # If the run should be recorded rather than shown...
+            print(f"Recording {algorithm_name} on {ALGORITHM_ENGINE_OBJECT._array_length} elements to {arguments.record}...")
+            trace = trace_file.record_trace(
+                ALGORITHM_ENGINE_OBJECT.keyed(ALGORITHM_ENGINE_OBJECT._algorithm_types[algorithm_name]),
+                algorithm_engine.generate_array(ALGORITHM_ENGINE_OBJECT._array_length, ALGORITHM_ENGINE_OBJECT._array_backend, ALGORITHM_ENGINE_OBJECT._distribution, ALGORITHM_ENGINE_OBJECT._seed),
+                arguments.record, arguments.compress,
+                {"distribution": ALGORITHM_ENGINE_OBJECT._distribution, "seed": ALGORITHM_ENGINE_OBJECT._seed},
+            )
+            print(f"Sort Time: {round(trace['time_ns'] / 1e9, 4)} (Without recording)")
+            print(f"Trace Size: {os.path.getsize(arguments.record) / 1024:,.1f} KB")
+            sys.exit()
+        elif arguments.export is not None: # If the run should be exported rather than shown...
+            export_run(
+                ALGORITHM_ENGINE_OBJECT.keyed(ALGORITHM_ENGINE_OBJECT._algorithm_types[algorithm_name]),
+                algorithm_engine.generate_array(ALGORITHM_ENGINE_OBJECT._array_length, ALGORITHM_ENGINE_OBJECT._array_backend, ALGORITHM_ENGINE_OBJECT._distribution, ALGORITHM_ENGINE_OBJECT._seed),
+                arguments,
+            )
+        display_window = open_window(ALGORITHM_ENGINE_OBJECT, arguments)
+        # run the algorithm.
+        ALGORITHM_ENGINE_OBJECT.start(algorithm_name)
+
+
     # Print all the algorithm information to command line.
-    print(f"Algorithm: {sys.argv[sys.argv.index('-t') + 1]}")
+    print(f"Algorithm: {algorithm_name}")
     print(f"Array Length: {ALGORITHM_ENGINE_OBJECT._array_length}")
+    print(f"Distribution: {ALGORITHM_ENGINE_OBJECT._distribution}")
     print(f"Repeats: {ALGORITHM_ENGINE_OBJECT._repeats}")
     print(f"Delay: {ALGORITHM_ENGINE_OBJECT._algorithm_delay}")
+    print(f"Steps Per Frame: {ALGORITHM_ENGINE_OBJECT._steps_per_frame}")
+    print(f"Instrumented: {ALGORITHM_ENGINE_OBJECT._instrument}")
+    print(f"History: {ALGORITHM_ENGINE_OBJECT._record_operations}")
     print("\n")
-    
-    # Wait until the random array has been generated.
-    while ALGORITHM_ENGINE_OBJECT._sorting_array == []:
-        pass
-    
-    # Initiate pygame clock/tick system.
-    clock = pygame.time.Clock()
-    time_since_action = 0
-    
+
+    import pygame # (Already imported by the window, so this only gives it a name here.)
+    last_version = -1 # The version of the last snapshot drawn, -1 as none have been drawn yet.
+
     # While true (until the user closes the window)...
     while True:
-        delta_time = clock.tick() # Get the time since the last tick.
-        time_since_action += delta_time # Add the time since the last tick to the time since the last action.
-        
-        if time_since_action >= 15: # If the time since the last action is greater than 15 milliseconds...
+        # Sleep until the engine publishes a new snapshot (This also waits for the first array to be generated without using any CPU).
+        # The timeout keeps the window responsive to events once the algorithm has finished and no more snapshots arrive.
+        snapshot, dirty_bars = ALGORITHM_ENGINE_OBJECT._snapshot_channel.wait(last_version, timeout=0.05)
+
+        if snapshot is not None: # If there is a new snapshot...
             # Update the display.
-            display_window.update_window(ALGORITHM_ENGINE_OBJECT._sorting_array, ALGORITHM_ENGINE_OBJECT._display_name, ALGORITHM_ENGINE_OBJECT.getCurrentTime(), ALGORITHM_ENGINE_OBJECT._running)
-            time_since_action = 0 # Reset the time since the last action.
-        
-        # Check if the user has pressed the exit button.
+            display_window.update_window(snapshot, dirty_bars)
+            last_version = snapshot.version # Remember which snapshot has been drawn.
+            ALGORITHM_ENGINE_OBJECT.advance_frame() # Let the algorithm run its steps for the next frame.
+
+        # Check if the user has pressed the exit button or a key.
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                ALGORITHM_ENGINE_OBJECT.cancel() # Stop the algorithm at its next step, rather than leaving it running (or waiting for frames).
+                if hasattr(ALGORITHM_ENGINE_OBJECT, "thread"): ALGORITHM_ENGINE_OBJECT.thread.join() # Wait for it to stop.
                 pygame.quit()
-                quit()
\ No newline at end of file
+                quit()
+            elif event.type == pygame.KEYDOWN:
+                position, recorded = ALGORITHM_ENGINE_OBJECT.get_position()
+                seek_distance = max(1, (recorded or 0) // 100) # Each arrow press seeks 1% of the recording.
+                if event.key == pygame.K_SPACE: # Pause or resume.
+                    if ALGORITHM_ENGINE_OBJECT.is_paused():
+                        ALGORITHM_ENGINE_OBJECT.resume()
+                    else:
+                        ALGORITHM_ENGINE_OBJECT.pause()
+                elif event.key == pygame.K_PERIOD: # Run one step.
+                    ALGORITHM_ENGINE_OBJECT.step()
+                elif event.key == pygame.K_LEFT and recorded is not None: # Seek back.
+                    ALGORITHM_ENGINE_OBJECT.seek(position - seek_distance)
+                elif event.key == pygame.K_RIGHT and recorded is not None: # Seek forward.
+                    ALGORITHM_ENGINE_OBJECT.seek(position + seek_distance)
+                elif event.key == pygame.K_HOME and recorded is not None: # Seek to the start.
+                    ALGORITHM_ENGINE_OBJECT.seek(0)
+                elif event.key == pygame.K_END: # Back to the live array.
+                    ALGORITHM_ENGINE_OBJECT.resume()
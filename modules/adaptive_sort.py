@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+This file contains the adaptive sort, which looks at the array before sorting it and picks the registered algorithm best suited to it.
+
+This is a library file and cannot be run directly.
+
+No one algorithm is the fastest on every array: insertion sort is the fastest on tiny or nearly sorted arrays but hopeless on
+anything else, timsort uses long runs that are already in order, radix sort never compares anything and so wins on whole numbers
+in a small range, and introsort is the safe choice for everything else.
+One cheap pass over the array (the probe) measures what it looks like:
+
+    - runs: the number of ascending (or descending) runs, 1 for a sorted (or reversed) array.
+    - inversions: an estimate of the number of pairs that are out of order, from a random sample of pairs.
+    - inversion bound: when the estimate says the array is nearly sorted, a bound the inversions can never be above (see _inversion_bound()).
+      A sample of a few hundred pairs can miss a lot of local disorder (e.g. every block of 1000 elements shuffled), and insertion sort
+      costs one step per inversion, so it is only chosen when the bound (not the estimate) is small enough.
+    - key range: the difference between the largest and smallest value.
+    - duplicates: the fraction of values that are repeats of another value.
+
+Every decision is logged (with the probe's measurements) to the "modules.adaptive_sort" logger, which the engine keeps with each run,
+so the choices can be checked against the benchmark results of the algorithms it chose between.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import bisect
+import collections
+import itertools
+import logging
+import operator
+import random
+
+from modules.sorting_algorithms import algorithm_wrapper, PASS, insertion, introsort, quick_sort, radix, timsort
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+TINY_LENGTH = 32 # Arrays this short are insertion sorted, nothing else has less overhead.
+INVERSION_SAMPLES = 256 # The number of random pairs compared to estimate the inversions.
+NEARLY_SORTED_INVERSIONS = 4 # Arrays with at most this many inversions per element are insertion sorted (It costs one step per inversion).
+MIN_AVERAGE_RUN = 64 # Arrays whose runs are at least this long on average are sorted by timsort, which merges the runs as they are.
+DENSE_RANGE_FACTOR = 4 # Whole numbers whose range is at most this many times the length are radix sorted...
+SMALL_RANGE = 1 << 16 # ...as are whole numbers whose range fits in two radix passes.
+DUPLICATE_HEAVY = 0.9 # Arrays with at least this fraction of duplicates are sorted by quick sort, which groups values equal to the pivot.
+
+# The measurements of the probe (see probe()).
+InputProfile = collections.namedtuple("InputProfile", ["length", "runs", "inversions", "inversion_bound", "key_range", "duplicates", "integers"])
+
+logger = logging.getLogger(__name__) # Every decision is logged here.
+logger.setLevel(logging.INFO) # Decisions are logged at the INFO level, so they are kept even when nothing else has set up logging.
+
+
+def _inversion_bound(values, limit):
+    """Find a number the inversions of the values can never be above, giving up once it passes a limit.
+
+    Every element before the first element larger than values[i] is no larger than values[i], so at most (i - that index) earlier elements
+    are out of order with values[i]. The running maximum never goes down, so that index is found with a binary search of it.
+    Only the elements smaller than the maximum before them are out of place at all, the rest add nothing.
+
+    Args:
+        values (list): The values of the array.
+        limit (int): The bound to stop at, once the bound is past this the exact number is not needed.
+
+    Returns:
+        int: The bound (The inversions are at most this), or None if it is more than the limit.
+    """
+    maximums = list(itertools.accumulate(values, max)) # The largest value up to and including each index.
+    bound = 0
+    for index in itertools.compress(range(1, len(values)), map(operator.lt, values[1:], maximums)): # Each element smaller than an earlier one.
+        bound += index - bisect.bisect_right(maximums, values[index], 0, index)
+        if bound > limit: return None
+    return bound
+
+
+def probe(sorting_array):
+    """Measure what an array looks like, in one pass over it.
+
+    Args:
+        sorting_array (array): The array to be sorted (A list or a NumPy array).
+
+    Returns:
+        InputProfile: The measurements of the array.
+    """
+    values = sorting_array.tolist() if hasattr(sorting_array, "tolist") else list(sorting_array) # One read of every value.
+    length = len(values)
+    if length < 2: return InputProfile(length, 1, 0, 0, 0, 0.0, True)
+
+    # The number of neighbouring pairs that go down, and go up (map() compares every pair without a Python loop, True counts as 1).
+    descents, ascents = sum(map(operator.lt, values[1:], values)), sum(map(operator.gt, values[1:], values))
+
+    # Compare random pairs, the fraction that are out of order estimates the fraction of every pair that is (The same sample for the same length).
+    # There are never more samples than elements, so the probe stays one pass over the array.
+    samples, out_of_order = min(INVERSION_SAMPLES, length), 0
+    indexes = random.Random(length).choices(range(length), k=2 * samples)
+    for first, second in zip(indexes[::2], indexes[1::2]):
+        if (values[second] < values[first]) if first < second else (values[first] < values[second]): out_of_order += 1
+    # Pairs of the same index are never out of order, so the estimate is a little low, which only matters when the array is tiny.
+    # There is at least one inversion for every descent, which catches the few a sample is too small to find.
+    inversions = max(round(out_of_order / samples * length * (length - 1) / 2), descents)
+    # Only when the estimate says the array is nearly sorted is the bound worked out, to check the sample has not missed anything.
+    limit = NEARLY_SORTED_INVERSIONS * length
+    inversion_bound = _inversion_bound(values, limit) if inversions <= limit else None
+
+    integers = set(map(type, values)) == {int}
+    return InputProfile(
+        length=length,
+        runs=min(descents, ascents) + 1, # Timsort reverses descending runs, so a reversed array is one run too.
+        inversions=inversions,
+        inversion_bound=inversion_bound,
+        key_range=max(values) - min(values) if integers else None, # Only whole numbers have a range radix sort can use.
+        duplicates=1 - len(set(values)) / length,
+        integers=integers,
+    )
+
+
+def choose(profile):
+    """Choose the registered algorithm best suited to an array.
+
+    Args:
+        profile (InputProfile): The measurements of the array, see probe().
+
+    Returns:
+        tuple: (the name of the algorithm, the reason it was chosen).
+    """
+    if profile.length <= TINY_LENGTH:
+        return "insertion", f"tiny array ({profile.length} elements)"
+    if profile.inversion_bound is not None and profile.inversion_bound <= NEARLY_SORTED_INVERSIONS * profile.length:
+        return "insertion", f"nearly sorted (at most {profile.inversion_bound} inversions)"
+    if profile.runs * MIN_AVERAGE_RUN <= profile.length:
+        return "timsort", f"long runs (about {profile.length // profile.runs} elements each)"
+    if profile.duplicates >= DUPLICATE_HEAVY:
+        return "quick_sort", f"many duplicates ({profile.duplicates:.0%})"
+    if profile.integers and profile.key_range < max(DENSE_RANGE_FACTOR * profile.length, SMALL_RANGE):
+        return "radix", f"whole numbers in a small range ({profile.key_range})"
+    return "introsort", "no structure to use"
+
+
+@algorithm_wrapper
+def auto(sorting_array):
+    """ Adaptive sort (probes the array, then sorts it with the registered algorithm best suited to it). """
+    profile = probe(sorting_array)
+    name, reason = choose(profile)
+    logger.info("auto chose %s for %d elements: %s", name, profile.length, reason, extra={"decision": {"algorithm": name, "reason": reason, **profile._asdict()}})
+    yield (PASS,) # End of a pass, the probe read the whole array.
+    # Sort with the chosen algorithm. Each is called by name rather than looked up, so the benchmark's copy of auto (with every yield removed)
+    # is built with their copies ready, instead of building the chosen one while the sort is being timed.
+    if name == "insertion": yield from insertion(sorting_array)
+    elif name == "timsort": yield from timsort(sorting_array)
+    elif name == "quick_sort": yield from quick_sort(sorting_array)
+    elif name == "radix": yield from radix(sorting_array)
+    else: yield from introsort(sorting_array)
@@ -7,13 +7,20 @@ This is a library file and cannot be run directly.
 Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
 """
 
-import cProfile
-import random
-import sys
+import concurrent.futures
+import logging
 import threading
 import time
 
-from modules.sorting_algorithms import algorithm_wrapper
+import modules.dataset_store as dataset_store
+import modules.external_sort as external_sort
+import modules.instrumentation as instrumentation
+import modules.keyed_sort as keyed_sort
+import modules.numpy_algorithms as numpy_algorithms
+import modules.operation_log as operation_log
+import modules.step_scheduler as step_scheduler
+import modules.trace_file as trace_file
+from modules.tracked_array import TrackedArray
 
 
 __author__ = "Archer Hume"
@@ -25,40 +32,128 @@ __email__ = "archer@hume.email"
 __status__ = "Development"
 
 
-sys.setcheckinterval(1) # Set the interpreter check interval to 1 (Higher thread switching frequency increases delay accuracy).
+ARRAY_BACKENDS = ["list", "numpy"] # The types of array the algorithms can be given to sort.
+# The logger the algorithms log their decisions to (see adaptive_sort), found by name so the engine does not have to import the algorithms.
+DECISION_LOGGER = logging.getLogger("modules.adaptive_sort")
 
 
-class AlgorithmExistanceError(Exception):
-    """Algorithm does not exist.
+def generate_array(length, backend="list", distribution="uniform", seed=None):
+    """Get a new array to be sorted from the dataset store.
 
-    Custom exception to be called when an algorithm does not exist."""
-    pass
+    Args:
+        length (int): The length of the array to be created.
+        backend (str, optional): The type of array to create, "list" or "numpy". Defaults to "list".
+        distribution (str, optional): The shape of the array, see input_generators.__distributions__. Defaults to "uniform".
+        seed (int, optional): The random seed, the same seed always gives the same array. Defaults to None (A new random array).
+
+    Raises:
+        ImportError: When the numpy backend is asked for but NumPy is not installed.
+        DistributionExistanceError: When the distribution does not exist.
+
+    Returns:
+        list: The array to be sorted (A numpy.ndarray for the numpy backend).
+    """
+    if backend == "numpy" and numpy_algorithms.numpy is None: # If a NumPy array has been asked for without NumPy...
+        raise ImportError("The numpy array backend requires NumPy, install it with 'pip install numpy'.")
+    return dataset_store.get_store().get(distribution, length, seed, backend)
+
+
+class _DecisionHandler(logging.Handler):
+    """Logging handler that keeps the decisions the algorithms log while they run (e.g. which algorithm auto chose)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.decisions = [] # The decision of every record logged with one, in the order they were logged.
+
+    def emit(self, record):
+        if hasattr(record, "decision"): self.decisions.append(record.decision)
+
+
+def _measure_with_decisions(func, sorting_array, scheduler=None, operation_log=None, trace_memory=True):
+    """Run and measure an algorithm (see instrumentation.measure_run()), keeping the decisions it logs with the measurements.
+
+    Returns:
+        dict: The measurements of the run, with "decisions" added (A list of the decisions logged, empty when none were).
+    """
+    handler = _DecisionHandler()
+    DECISION_LOGGER.addHandler(handler)
+    try:
+        run_stats = instrumentation.measure_run(func, sorting_array, scheduler, operation_log, trace_memory)
+    finally:
+        DECISION_LOGGER.removeHandler(handler)
+    run_stats["decisions"] = handler.decisions
+    return run_stats
+
+
+def _timed_run(func, length, backend, distribution, seed, instrument, key=None, reverse=False):
+    """Run one repeat of an algorithm inside a worker process and measure it.
+
+    This has to be a top level function so that the process pool can send it to the worker processes.
+
+    Args:
+        func (function): The algorithm to be run.
+        length (int): The length of the array to be sorted.
+        backend (str): The type of array to be sorted, see ARRAY_BACKENDS.
+        distribution (str): The shape of the array to be sorted.
+        seed (int): The random seed of the array to be sorted, or None.
+        instrument (bool): Whether to count what the algorithm does as well as timing it (Lists only).
+        key (function, optional): The key to sort the elements by, see keyed_sort.keyed(). Defaults to None (The elements themselves).
+        reverse (bool, optional): Whether to sort largest first. Defaults to False.
+
+    Returns:
+        dict: The measurements of the run, see instrumentation.measure_run().
+    """
+    # The key is applied here rather than by the engine, a keyed algorithm is built at run time and cannot be sent to a worker process.
+    if key is not None or reverse: func = keyed_sort.keyed(func, key, reverse)
+    sorting_array = generate_array(length, backend, distribution, seed) # Each worker creates its own array to be sorted.
+    if instrument and isinstance(sorting_array, list): sorting_array = instrumentation.instrument_array(sorting_array)
+    return _measure_with_decisions(func, sorting_array) # Run the algorithm at full speed (No steps, nothing is watching).
 
 
 class Algorithm:
     """Algorithm class that handles all backend processing and sorting for the script."""
     
-    def __init__(self, length=5000, repeats=3, delay=0, debug=False) -> None:
+    def __init__(self, length=5000, repeats=3, delay=0, debug=False, workers=1, backend="list", distribution="uniform", seed=None, key=None, reverse=False) -> None:
         """Initialize the algorithm class.
 
         Args:
             length (int): The length of the array to be sorted.
-            algorithm (str): The algorithm to be run.
             repeats (int, optional): Amount of times algorithm will repeat. Defaults to 3.
-            delay (int, optional): The delay between algorithm steps. Defaults to 0.
-
-        Raises:
-            AlgorithmExistanceError: When the algorithm does not exist.
+            delay (float, optional): The delay between algorithm steps in seconds. Defaults to 0 (As fast as possible).
+            debug (bool, optional): Whether to profile each run and print its stats. Defaults to False.
+            workers (int, optional): Amount of worker processes the repeats are spread across. Defaults to 1 (No process pool).
+            backend (str, optional): The type of array to be sorted, see ARRAY_BACKENDS. Defaults to "list".
+            distribution (str, optional): The shape of the array to be sorted, see input_generators.__distributions__. Defaults to "uniform".
+            seed (int, optional): The random seed of the first repeat, each repeat after uses the next seed. Defaults to None (Random every time).
+            key (function, optional): The key to sort the elements by, worked out once per element (See keyed_sort). Defaults to None (The elements themselves).
+            reverse (bool, optional): Whether to sort largest first, elements with equal keys keep their order. Defaults to False.
         """
         self._display_name = "Algorithm" # The display name of the algorithm to be shown on the screen
         self._array_length = length # The length of the array to be sorted, stored so that on repeats the array can be recreated.
         self._finished_times, self._sorting_array = [], [] # The run times to be stored when an algorithm has finished running and the placeholder array to be sorted.
         self._running = True # Whether or not the algorithm is currently running.
-        self._start_time = time.time() # Placeholder start time, will be used to measure algorithms run times.
-        self._algorithm_delay = delay # The delay between each algorithm step.
+        self._cancelled = False # Whether the run has been cancelled (e.g. the window was closed), set again by every start().
+        self._start_time = time.perf_counter() # Placeholder start time, will be used to measure algorithms run times.
+        self._algorithm_delay = delay # The delay between each algorithm step in seconds.
+        self._steps_per_frame = None # The number of algorithm steps to run for each frame the window draws, None to use the delay instead.
+        self._scheduler = None # The step scheduler of the current run, None when the steps run as fast as possible.
+        self._record_operations = False # Whether to record every change made to the array, so the run can be scrubbed back and forth.
+        self._operation_log = None # The recording of the current repeat, None when not recording.
+        self._view_array, self._view_position = None, None # The rebuilt array being viewed after seeking, and how many changes into the run it is (None when live).
         self._debug = debug # Whether or not the algorithm should be run in debug mode.
         self._repeats = repeats # The amount of times the algorithm should be run.
         self._algorithm_types = {} # The algorithm types to be used.
+        self._array_backend = backend # The type of array to be sorted, a Python list or a contiguous NumPy array.
+        self._distribution, self._seed = distribution, seed # The shape of the array to be sorted and the seed it is generated from.
+        self._key, self._reverse = key, reverse # The key the elements are sorted by (None for the elements themselves) and whether largest first.
+        self._workers = workers # The amount of worker processes to run repeats on, 1 runs them one after another on the engine's thread.
+        self._track_writes = False # Whether to record which indexes the algorithm writes to, so a window can redraw only those.
+        self._instrument = False # Whether to count the comparisons, reads, writes, passes and peak memory of each run (Lists only).
+        self._run_stats = [] # The measurements of each finished run, see instrumentation.measure_run().
+        self._replay_trace = None # The trace file (trace_file.TraceReader) to replay instead of running the algorithm, None to run it.
+        self._external_sort = None # The settings of a file to sort out of memory (see external_sort.sort_file()) instead of arrays, None to sort arrays.
+        self._progress = None # The (phase, records done, records in total) of the external sort, None when not sorting a file.
+        self._snapshot_channel = None # The channel snapshots of the array are published to for a window to draw, None when there is no window.
 
     def getCurrentTime(self):
         """Get the current time of the algorithm.
@@ -66,8 +161,150 @@ class Algorithm:
         Returns:
             float: The current time in seconds.
         """
-        return time.time() - self._start_time
+        return time.perf_counter() - self._start_time
     
+    def get_run_stats(self):
+        """Get the measurements of every finished run.
+
+        Returns:
+            list: One dictionary per run, holding its "time_ns" and (when instrumented, otherwise None) its
+                "comparisons", "reads", "writes", "passes" and "peak_memory", and the "decisions" the algorithm logged (e.g. auto's choice).
+        """
+        return list(self._run_stats)
+
+    def get_counters(self):
+        """Get the counts of the run in progress, so they can be watched live.
+
+        Returns:
+            dict: The counts so far, keyed by name, or None when the array is not instrumented.
+        """
+        if isinstance(self._sorting_array, instrumentation.InstrumentedArray):
+            return self._sorting_array.counters.as_dict()
+        return None
+
+    def _create_scheduler(self):
+        """Create the step scheduler that paces the algorithm's steps.
+
+        Returns:
+            step_scheduler.StepScheduler: The scheduler, or None when the algorithm should run as fast as possible (Its fast path).
+        """
+        if self._steps_per_frame and self._snapshot_channel is not None: # Frames are only drawn when there is a window.
+            return step_scheduler.StepScheduler(steps_per_frame=self._steps_per_frame)
+        if self._algorithm_delay: # A delay between steps is a rate of 1/delay steps per second.
+            return step_scheduler.StepScheduler(steps_per_second=1 / self._algorithm_delay)
+        if self._snapshot_channel is not None or self._record_operations: # A window can pause, step and cancel the run, and recording needs the steps.
+            return step_scheduler.StepScheduler()
+        return None
+
+    def advance_frame(self):
+        """Let the algorithm run its steps for the next frame, called by the window after every frame it draws."""
+        if self._scheduler is not None:
+            self._scheduler.frame()
+
+    def pause(self):
+        """Pause the algorithm at its next step."""
+        if self._scheduler is not None:
+            self._scheduler.pause()
+
+    def resume(self):
+        """Return to the live array (if seeking) and carry on running the algorithm."""
+        self._leave_view()
+        if self._scheduler is not None:
+            self._scheduler.resume()
+
+    def is_paused(self):
+        """Check whether the algorithm is paused.
+
+        Returns:
+            bool: True if the algorithm is paused.
+        """
+        return self._scheduler is not None and self._scheduler.paused
+
+    def step(self):
+        """Move one change forward while paused, through the recording when seeking back, otherwise by running the algorithm one step."""
+        if self._view_position is not None:
+            self.seek(self._view_position + 1)
+        elif self._scheduler is not None:
+            self._scheduler.step()
+
+    def cancel(self):
+        """Stop the algorithm at its next step and run no more repeats (e.g. when the window is closed)."""
+        self._cancelled = True
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+
+    def get_position(self):
+        """Get how far into the recording of the current repeat is being shown.
+
+        Returns:
+            tuple: (the number of changes shown, the number of changes recorded), both None when the run is not being recorded.
+        """
+        log = self._operation_log
+        if log is None: return None, None
+        recorded = len(log)
+        return (recorded if self._view_position is None else self._view_position), recorded
+
+    def seek(self, position):
+        """Pause the algorithm and show the array as it was after a number of changes, rebuilt from the recording.
+
+        Args:
+            position (int): The number of changes into the current repeat to show, anything past the last change shows the live array.
+        """
+        log = self._operation_log
+        if log is None: return # Nothing has been recorded to seek through.
+        self.pause()
+        if position >= len(log): # Seeking to (or past) the end shows the live array again.
+            self._leave_view()
+            return
+        position = max(position, 0)
+        self._view_array, self._view_position = log.state_at(position), position
+
+    def _leave_view(self):
+        """Stop showing a rebuilt array and show the live array again."""
+        if self._view_position is None: return
+        self._view_array, self._view_position = None, None
+        if isinstance(self._sorting_array, TrackedArray): # The window drew the rebuilt array, so every bar of the live array must be redrawn.
+            self._sorting_array.mark_all_dirty()
+
+    def display_array(self):
+        """Get the array the window should draw.
+
+        Returns:
+            array: The rebuilt array when seeking back through the recording, otherwise the live array being sorted.
+        """
+        view_array = self._view_array
+        return self._sorting_array if view_array is None else view_array
+
+    def _install_array(self, sorting_array):
+        """Set the array to be sorted, telling the window's snapshot channel (if there is one) that it is a new array.
+
+        Args:
+            sorting_array (array): The array to be sorted.
+        """
+        self._sorting_array = sorting_array
+        if self._snapshot_channel is not None: self._snapshot_channel.new_array()
+
+    def _record_run(self, run_stats):
+        """Store the measurements of a finished run.
+
+        Args:
+            run_stats (dict): The measurements of the run, see instrumentation.measure_run().
+        """
+        self._run_stats.append(run_stats)
+        self._finished_times.append(run_stats["time_ns"] / 1e9) # Add the time taken in seconds to the finished times list.
+
+    def keyed(self, func):
+        """Get the algorithm that sorts by the engine's key (and largest first, if reversed).
+
+        Args:
+            func (function): The algorithm.
+
+        Returns:
+            function: The algorithm sorting by the key, see keyed_sort.keyed(), or the algorithm itself when there is no key and it is not reversed.
+        """
+        if self._key is None and not self._reverse: return func
+        return keyed_sort.keyed(func, self._key, self._reverse)
+
     def algorithm_add(self, func):
         """Adds an algorithm to the algorithm list.
         
@@ -84,35 +321,175 @@ class Algorithm:
         """
         def _wrapper():
             self._running = True # Sets the algorithm to running.
-            self._start_time = time.time() # Sets the start time of the algorithm.
+            self._start_time = time.perf_counter() # Sets the start time of the algorithm (perf_counter is a high resolution, monotonic clock).
             self._display_name = " ".join([word.capitalize() for word in func.__name__.split("_")]) # Sets the display name of the algorithm.
-            func(self._sorting_array, self._algorithm_delay) # Run the algorithm.
-            self._finished_times.append(time.time() - self._start_time) # Add the time taken to the finished times list.
+            # Run and measure the algorithm (The peak memory is only measured without a window, as it would count the window's memory too).
+            run_stats = _measure_with_decisions(func, self._sorting_array, self._scheduler, self._operation_log, self._snapshot_channel is None)
+            if self._replay_trace is not None: # A replay shows the time the sort took when it was recorded, not how long the replay took.
+                run_stats["time_ns"] = self._replay_trace.metadata["time_ns"]
+            if not self._cancelled: self._record_run(run_stats) # A cancelled run did not finish, so its time is not kept.
             self._running = False # Set the algorithm to not running.
         return _wrapper
 
-    def start(self, algorithm):
+    def _run_external_sort(self, func):
+        """Sort a file out of memory (See external_sort), sorting each run with the algorithm and reporting the progress for the window.
+
+        Args:
+            func (function): The algorithm to sort each run with.
+        """
+        def _sort_run(run):
+            """Sort one run with the algorithm, showing it in the window (if there is one) while it is sorted."""
+            self._install_array(run) # (The run is read straight into a tracked array when a window is drawing it, see sort_file's run_type.)
+            instrumentation.measure_run(func, run, self._scheduler)
+            return run
+
+        def _progress(phase, done, total):
+            self._progress = (phase, done, total)
+
+        self._running = True # Sets the algorithm to running.
+        self._start_time = time.perf_counter()
+        self._display_name = "External " + " ".join([word.capitalize() for word in func.__name__.split("_")])
+        try:
+            external_sort.sort_file(
+                self._external_sort["input_path"], self._external_sort["output_path"], _sort_run,
+                self._external_sort.get("memory_budget", external_sort.DEFAULT_MEMORY_BUDGET), self._external_sort.get("run_records"),
+                self._external_sort.get("record_width", 8), _progress, lambda: self._cancelled, TrackedArray if self._track_writes else None,
+            )
+            self._record_run({ # Only the time of the whole sort is measured.
+                "time_ns": round((time.perf_counter() - self._start_time) * 1e9),
+                "comparisons": None, "reads": None, "writes": None, "passes": None, "peak_memory": None, "decisions": [],
+            })
+        except external_sort.ExternalSortCancelled: # The window was closed, nothing more to do.
+            pass
+        finally: # Whether or not the sort failed, the algorithm is no longer running.
+            self._running = False # Set the algorithm to not running.
+
+    def repeat_seed(self, repeat):
+        """Get the random seed of the array sorted on a repeat.
+
+        Args:
+            repeat (int): The index of the repeat.
+
+        Returns:
+            int: The seed, or None if the arrays should be random every time.
+        """
+        return None if self._seed is None else self._seed + repeat
+
+    def submit(self, algorithm, executor):
+        """Submit every repeat of the algorithm to a process pool.
+
+        Each repeat runs in a worker process on its own array, pass the futures to collect() to wait for them and store their measurements.
+
+        Args:
+            algorithm (str): The name of the algorithm to be run.
+            executor (concurrent.futures.ProcessPoolExecutor): The process pool to run the repeats on.
+
+        Returns:
+            list: The futures of the submitted repeats, see collect().
+        """
+        func = self._algorithm_types[algorithm] # Get the algorithm to be run.
+        self._display_name = " ".join([word.capitalize() for word in self.keyed(func).__name__.split("_")]) # Sets the display name of the algorithm.
+        self._running = True # Sets the algorithm to running.
+        
+        futures = [
+            executor.submit(
+                _timed_run, func, self._array_length, self._array_backend, self._distribution, self.repeat_seed(repeat), self._instrument,
+                self._key, self._reverse,
+            )
+            for repeat in range(self._repeats)
+        ]
+        return futures
+
+    def collect(self, futures):
+        """Wait for the repeats submitted to a process pool (see submit()), then store their measurements on the calling thread.
+
+        Args:
+            futures (list): The futures returned by submit().
+
+        Raises:
+            Exception: The first error raised by a repeat, once every repeat has finished (The repeats that finished are still stored).
+        """
+        concurrent.futures.wait(futures) # Wait until every repeat has finished.
+        error = None # The first error raised by a repeat.
+        try:
+            for future in futures:
+                if future.exception() is None:
+                    self._record_run(future.result())
+                elif error is None:
+                    error = future.exception()
+        finally: # Whether or not a repeat failed, the engine is no longer running.
+            self._running = False
+            self._sorting_array = []
+        if error is not None: # A repeat that failed must not look like one that was never run.
+            raise error
+
+    def start(self, algorithm, threaded=True):
         """Start the algorithm.
 
         Args:
-            algorithm (function): The algorithm to be run.
-            repeats (int): Amount of times algorithm will repeat.
+            algorithm (function): The algorithm to be run (Ignored when a trace is being replayed, see _replay_trace).
+            threaded (bool, optional): Whether to run the algorithm on a separate thread. Defaults to True.
+                Headless runs (such as the benchmark) pass False so nothing competes with the sort for the GIL.
         """
         
+        self._scheduler = self._create_scheduler() # Pace the steps of the algorithm (Or run it at full speed).
+        self._cancelled = False # Whether the run has been cancelled.
+        
         def _loop():
             """Nested function used to enclose the algorithm start instructions."""
-            for _ in range(self._repeats): # Repeat the algorithm the amount of times specified.
-                self._sorting_array = random.sample(list(range(1, self._array_length + 1)), self._array_length) # Create a new array to be sorted.
+            if self._external_sort is not None: # If a file is being sorted, there are no arrays or repeats.
+                self._run_external_sort(self._algorithm_types[algorithm])
+                return
+            
+            if self._workers > 1: # If the repeats should be spread across worker processes...
+                with concurrent.futures.ProcessPoolExecutor(self._workers) as executor:
+                    self.collect(self.submit(algorithm, executor)) # Wait until every repeat has finished, and store their times.
+                return
+            
+            for repeat in range(self._repeats): # Repeat the algorithm the amount of times specified.
+                if self._cancelled: break # If the run has been cancelled, do not start another repeat.
+                if self._replay_trace is not None: # A replay starts from the array the trace was recorded from.
+                    new_array = self._replay_trace.initial_array()
+                else: # Get a new array to be sorted (A cached copy, if this seed has been used before).
+                    new_array = generate_array(self._array_length, self._array_backend, self._distribution, self.repeat_seed(repeat))
+                if isinstance(new_array, list) and self._instrument: # Count what the algorithm does (Tracking the writes too if a window needs them).
+                    new_array = instrumentation.instrument_array(new_array, self._track_writes)
+                elif isinstance(new_array, list) and self._track_writes: # When a window is drawing the array, wrap it so the window knows which bars to redraw (NumPy arrays are always redrawn).
+                    new_array = TrackedArray(new_array)
+                self._view_array, self._view_position = None, None # A new repeat starts a new recording, so stop viewing the old one.
+                # Record every change this repeat makes, so it can be scrubbed back and forth (Only when the steps are being run one by one).
+                self._operation_log = operation_log.OperationLog(new_array) if self._record_operations and self._scheduler is not None else None
+                self._install_array(new_array)
+                # Replay the trace instead of the algorithm itself, if one is given.
+                func = self.keyed(self._algorithm_types[algorithm]) if self._replay_trace is None else trace_file.replayer(self._replay_trace)
                 
                 if self._debug: # If the algorithm is in debug mode...
+                    import cProfile # The profiler is only imported when it is used, so it never slows down starting the script.
                     p = cProfile.Profile() # Create a new profile object to be used to measure the debug data of the algorithm.
-                    p.runcall(self.algorithm_wrapper(self._algorithm_types[algorithm])) # Run the algorithm with the profile object.
+                    p.runcall(self.algorithm_wrapper(func)) # Run the algorithm with the profile object.
                     p.print_stats() # Print the debug data of the algorithm.
                 else:
-                    self.algorithm_wrapper(self._algorithm_types[algorithm])()
+                    self.algorithm_wrapper(func)()
+        
+        finished = threading.Event() # Set once every repeat has finished, this stops the snapshot publisher.
+        
+        def _run():
+            """Nested function used to run the algorithm start instructions, then signal they have finished."""
+            try:
+                _loop()
+            finally: # Even if the algorithm fails, stop the snapshot publisher.
+                finished.set()
+        
+        if self._snapshot_channel is not None: # If a window is waiting for snapshots, publish them from a thread of their own.
+            self.publisher_thread = threading.Thread(target=self._snapshot_channel.run_publisher, args=(self, finished), daemon=True)
+            self.publisher_thread.start()
+        
+        if not threaded: # If there is no UI to keep responsive...
+            _run() # Run the algorithm start instructions on the calling thread and return once every repeat has finished.
+            return
         
         # Create a new thread to run the algorithm start instructions.
         # This is done to prevent the main thread that runs the UI from freezing while the algorithm 
         # is running and prevents general interference between UI and algorithms.
-        self.thread = threading.Thread(target=_loop)
+        self.thread = threading.Thread(target=_run)
         self.thread.start() # Start the thread.
\ No newline at end of file
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+This file contains the algorithm registry, which finds the registered algorithms without importing every module that holds them.
+
+This is a library file and cannot be run directly.
+
+Each algorithm registers itself (see sorting_algorithms.algorithm_wrapper) when the module holding it is imported, but some of those
+modules take a while to import (NumPy, worker processes...), and a script that only sorts with one algorithm, or only lists their names
+(e.g. to print the help), should not have to wait for all of them:
+
+    - PROVIDERS lists every module that holds algorithms, in the order their algorithms are listed.
+    - The first time the names are needed, every provider is imported and the name and module of each algorithm is saved to an index file
+      (in the system temp directory, one file for each copy of the project and each Python, so they never share an index).
+    - After that the names are read from the index, and load() only imports the module holding the algorithm asked for.
+    - The index is rebuilt whenever a provider changes (the file it is in, its size or the time it was modified) or a different Python is used,
+      and an algorithm missing from the index imports every provider before giving up (e.g. after NumPy has been installed).
+
+To add a new module of algorithms, add its name to PROVIDERS. Modules outside this project can be added without changing it,
+by listing them (comma separated) in the SORTING_ALGORITHM_PROVIDERS environment variable.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import zlib
+
+import modules.sorting_algorithms as sorting_algorithms
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+# The modules that hold algorithms, in the order their algorithms are listed.
+PROVIDERS = ["modules.sorting_algorithms", "modules.numpy_algorithms", "modules.parallel_algorithms", "modules.adaptive_sort"]
+PROVIDERS_VARIABLE = "SORTING_ALGORITHM_PROVIDERS" # The environment variable listing any more modules that hold algorithms.
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # The copy of the project this file is in.
+# Where the index is saved, named after the project directory and the Python running it, so other copies (or virtual environments) use their own.
+# (A CRC is enough to tell them apart, the fingerprint saved in the index still checks it is this copy's, and zlib is quicker to import than hashlib.)
+_INDEX_ID = format(zlib.crc32(f"{os.path.realpath(PROJECT_DIRECTORY)}\n{sys.executable}".encode()), "08x")
+DEFAULT_INDEX_PATH = os.path.join(tempfile.gettempdir(), f"sorting_algorithms_registry_{_INDEX_ID}.json")
+
+_index = None # The (name, module) of every algorithm, once it has been read or built.
+
+
+class AlgorithmExistanceError(Exception):
+    """Algorithm does not exist.
+
+    Custom exception to be called when an algorithm is not held by any of the providers."""
+    pass
+
+
+def providers():
+    """Get every module that holds algorithms, PROVIDERS followed by those named in the SORTING_ALGORITHM_PROVIDERS environment variable.
+
+    Returns:
+        list: The names of the modules, e.g. "modules.sorting_algorithms".
+    """
+    extra_providers = [name.strip() for name in os.environ.get(PROVIDERS_VARIABLE, "").split(",") if name.strip()]
+    return PROVIDERS + [name for name in extra_providers if name not in PROVIDERS]
+
+
+def _fingerprint():
+    """Get what the index depends on: the Python running the script, and the file, size and modified time of every provider.
+
+    The providers are found without being imported, so checking the fingerprint is quick.
+
+    Returns:
+        dict: The fingerprint, which is saved with the index and compared with the one it was built from.
+    """
+    files = []
+    for provider in providers():
+        try:
+            origin = importlib.util.find_spec(provider).origin
+            stat = os.stat(origin)
+            files.append([provider, os.path.realpath(origin), stat.st_size, stat.st_mtime_ns])
+        except (AttributeError, ImportError, OSError, TypeError): # The provider cannot be found, it is imported (and fails) in load_all().
+            files.append([provider, None, None, None])
+    return {"python": sys.executable, "version": sys.version, "providers": files}
+
+
+def load_all(index_path=DEFAULT_INDEX_PATH):
+    """Import every provider, so every algorithm is registered, and save the index of their names.
+
+    Args:
+        index_path (str, optional): The file to save the index to. Defaults to DEFAULT_INDEX_PATH.
+
+    Returns:
+        list: Every registered algorithm, in the order of the providers holding them.
+    """
+    global _index
+    provider_names = providers()
+    for provider in provider_names:
+        importlib.import_module(provider)
+
+    def _order(algorithm):
+        """The position of the provider holding an algorithm, algorithms registered anywhere else go last."""
+        return provider_names.index(algorithm.__module__) if algorithm.__module__ in provider_names else len(provider_names)
+
+    algorithms = sorted(sorting_algorithms.__algorithms__, key=_order) # (Sorting is stable, so each provider's algorithms keep their order.)
+    _index = [[algorithm.__name__, algorithm.__module__] for algorithm in algorithms]
+    try: # Write to a temporary file first and then rename it, so other processes never read a half written index.
+        temporary_file, temporary_path = tempfile.mkstemp(dir=os.path.dirname(index_path))
+        with os.fdopen(temporary_file, "w") as file:
+            json.dump({"fingerprint": _fingerprint(), "algorithms": _index}, file)
+        os.replace(temporary_path, index_path)
+    except OSError: # If the index cannot be saved (e.g. the directory is read only), it is simply built again next time.
+        pass
+    return algorithms
+
+
+def _read_index(index_path):
+    """Read the index, if it has been saved and is still up to date.
+
+    Args:
+        index_path (str): The file the index is saved to.
+
+    Returns:
+        list: The [name, module] of every algorithm, or None when the index is missing or out of date.
+    """
+    try:
+        with open(index_path) as file:
+            index = json.load(file)
+    except (OSError, ValueError): # The index has not been saved yet, or is not an index.
+        return None
+    if not isinstance(index, dict) or index.get("fingerprint") != _fingerprint(): # A provider has changed since the index was built.
+        return None
+    return index.get("algorithms")
+
+
+def index(index_path=DEFAULT_INDEX_PATH):
+    """Get the name and module of every algorithm, without importing the providers when the saved index is up to date.
+
+    Args:
+        index_path (str, optional): The file the index is saved to. Defaults to DEFAULT_INDEX_PATH.
+
+    Returns:
+        list: The [name, module] of every algorithm, in order.
+    """
+    global _index
+    if _index is None:
+        _index = _read_index(index_path)
+    if _index is None: # There is no up to date index, so build one.
+        load_all(index_path)
+    return _index
+
+
+def names(index_path=DEFAULT_INDEX_PATH):
+    """Get the names of every algorithm, without importing the providers when the saved index is up to date.
+
+    Args:
+        index_path (str, optional): The file the index is saved to. Defaults to DEFAULT_INDEX_PATH.
+
+    Returns:
+        list: The names of the algorithms, in order.
+    """
+    return [name for name, _ in index(index_path)]
+
+
+def _registered(name):
+    """Get the registered algorithm with a name, or None if no algorithm with that name has been registered yet."""
+    for algorithm in sorting_algorithms.__algorithms__:
+        if algorithm.__name__ == name:
+            return algorithm
+    return None
+
+
+def load(name, index_path=DEFAULT_INDEX_PATH):
+    """Get an algorithm by name, only importing the module that holds it.
+
+    Args:
+        name (str): The name of the algorithm.
+        index_path (str, optional): The file the index is saved to. Defaults to DEFAULT_INDEX_PATH.
+
+    Raises:
+        AlgorithmExistanceError: When none of the providers hold an algorithm with that name.
+
+    Returns:
+        function: The algorithm.
+    """
+    modules = dict(index(index_path))
+    if name in modules: # Import the module holding the algorithm, which registers it.
+        importlib.import_module(modules[name])
+    algorithm = _registered(name)
+    if algorithm is None: # The index may be out of date, so import every provider and look again.
+        load_all(index_path)
+        algorithm = _registered(name)
+    if algorithm is None:
+        raise AlgorithmExistanceError(f"The algorithm '{name}' does not exist.")
+    return algorithm
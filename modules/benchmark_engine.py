@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+This module contains the benchmark engine used to time the sorting algorithms without a window.
+
+This is a library file and cannot be run directly.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import concurrent.futures
+import csv
+import io
+import json
+import math
+import statistics
+
+import modules.algorithm_engine as algorithm_engine
+import modules.algorithm_registry as algorithm_registry
+import modules.parallel_algorithms as parallel_algorithms
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+# The columns written for every benchmark result, in order.
+RESULT_FIELDS = ["algorithm", "distribution", "length", "repeats", "min", "median", "p95"]
+# The counts of instrumented runs, written as the median over the repeats after the times (Left empty when not instrumented).
+COUNTER_FIELDS = ["comparisons", "reads", "writes", "passes", "peak_memory"]
+# The algorithms an adaptive algorithm (e.g. auto) chose over the repeats, written after the counts (Only when one was run).
+DECISION_FIELDS = ["strategy"]
+# The columns of a scaling benchmark, written after the others: the workers the parallel algorithms used, and the speedup over one worker.
+SCALING_FIELDS = ["workers", "speedup"]
+
+
+def percentile(times, fraction):
+    """Get a percentile of a list of times using the nearest-rank method.
+
+    Args:
+        times (list): The times to take the percentile of.
+        fraction (float): The percentile as a fraction, e.g. 0.95 for the 95th percentile.
+
+    Returns:
+        float: The time at the requested percentile.
+    """
+    ordered_times = sorted(times) # Sort a copy of the times so the nearest rank can be looked up.
+    # The nearest rank is the smallest rank that covers the requested fraction of the times (Ranks start at 1, indexes at 0).
+    return ordered_times[max(math.ceil(fraction * len(ordered_times)) - 1, 0)]
+
+
+def summarise(algorithm, distribution, length, run_stats, keep_times=False):
+    """Summarise the runs of one algorithm on one distribution at one array length.
+
+    Args:
+        algorithm (str): The name of the algorithm that was run.
+        distribution (str): The name of the distribution that was sorted.
+        length (int): The length of the array that was sorted.
+        run_stats (list): The measurements of each repeat, see instrumentation.measure_run().
+        keep_times (bool, optional): Whether to add the time of every repeat, as "times" (e.g. to test whether two results really differ). Defaults to False.
+
+    Raises:
+        ValueError: When there are no runs to summarise (e.g. the algorithm was run with 0 repeats).
+
+    Returns:
+        dict: The benchmark result, keyed by the names in RESULT_FIELDS and COUNTER_FIELDS (And DECISION_FIELDS, when the algorithm made decisions).
+    """
+    if not run_stats: # There is no minimum or median of no times at all.
+        raise ValueError(f"There are no runs of {algorithm} on {distribution} at length {length} to summarise, at least one repeat is needed.")
+    times = [run["time_ns"] / 1e9 for run in run_stats] # The run time of each repeat in seconds.
+    # Every algorithm chosen over the repeats, each named once in the order first chosen (e.g. "insertion/timsort").
+    strategies = "/".join(dict.fromkeys(decision["algorithm"] for run in run_stats for decision in run.get("decisions", ())))
+    return {
+        "algorithm": algorithm,
+        "distribution": distribution,
+        "length": length,
+        "repeats": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "p95": percentile(times, 0.95),
+        # The median of each count, None when the runs were not instrumented.
+        **{field: (statistics.median(run[field] for run in run_stats) if run_stats[0][field] is not None else None) for field in COUNTER_FIELDS},
+        **({"strategy": strategies} if strategies else {}),
+        **({"times": times} if keep_times else {}),
+    }
+
+
+def run_benchmark(algorithms, lengths, repeats=3, workers=1, backend="list", distributions=("uniform",), seed=0, instrument=False, keep_times=False):
+    """Time every algorithm on every distribution at every array length, without opening a window.
+
+    Args:
+        algorithms (list): The names of the algorithms to be run.
+        lengths (list): The array lengths to run each algorithm at.
+        repeats (int, optional): Amount of times each algorithm will repeat at each length. Defaults to 3.
+        workers (int, optional): Amount of worker processes to spread every repeat of every run across. Defaults to 1 (No process pool).
+        backend (str, optional): The type of array to be sorted, see algorithm_engine.ARRAY_BACKENDS. Defaults to "list".
+        distributions (list, optional): The shapes of array to run each algorithm on. Defaults to ("uniform",).
+        seed (int, optional): The random seed of the first repeat. Defaults to 0, so every algorithm sorts the same (cached) arrays.
+        instrument (bool, optional): Whether to count comparisons, reads, writes, passes and peak memory (Lists only, much slower). Defaults to False.
+        keep_times (bool, optional): Whether each result should keep the time of every repeat, see summarise(). Defaults to False.
+
+    Raises:
+        AlgorithmExistanceError: When one of the algorithms does not exist.
+
+    Returns:
+        list: One result dictionary per (algorithm, distribution, length), see summarise().
+    """
+    runs = [] # The (algorithm, distribution, length, engine) of every run to be timed.
+
+    for algorithm in algorithms: # For each algorithm to be run...
+        for distribution in distributions: # For each shape of array to be sorted...
+            for length in lengths: # For each array length to be run at...
+                # A fresh engine is declared for every run so the finished times of different runs are never mixed.
+                engine = algorithm_engine.Algorithm(length=length, repeats=repeats, backend=backend, distribution=distribution, seed=seed)
+                engine._instrument = instrument
+                # Add the algorithm, importing only the module holding it (This raises AlgorithmExistanceError if no module does).
+                engine.algorithm_add(algorithm_registry.load(algorithm))
+                runs.append((algorithm, distribution, length, engine))
+
+    if workers > 1: # If the runs should be spread across worker processes...
+        # Every repeat of every run is submitted to one shared pool, so the whole suite is spread across the cores at once.
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            submitted = [(engine, engine.submit(algorithm, executor)) for algorithm, _, _, engine in runs]
+            for engine, futures in submitted: # Wait until every repeat has finished, storing their times (A failed repeat raises its error).
+                engine.collect(futures)
+    else:
+        for algorithm, _, _, engine in runs:
+            # Run every repeat on this thread, there is no UI thread to compete with for the GIL.
+            engine.start(algorithm, threaded=False)
+
+    return [summarise(algorithm, distribution, length, engine.get_run_stats(), keep_times) for algorithm, distribution, length, engine in runs]
+
+
+def run_scaling(algorithms, lengths, worker_counts, repeats=3, backend="list", distributions=("uniform",), seed=0):
+    """Time the parallel algorithms with different numbers of worker processes, to see how their speed scales with the cores.
+
+    Args:
+        algorithms (list): The names of the algorithms to be run (Algorithms that are not parallel take the same time with any number of workers).
+        lengths (list): The array lengths to run each algorithm at.
+        worker_counts (list): The numbers of workers to run each algorithm with, the first is the one the speedup is measured against.
+        repeats (int, optional): Amount of times each algorithm will repeat at each length. Defaults to 3.
+        backend (str, optional): The type of array to be sorted, see algorithm_engine.ARRAY_BACKENDS. Defaults to "list".
+        distributions (list, optional): The shapes of array to run each algorithm on. Defaults to ("uniform",).
+        seed (int, optional): The random seed of the first repeat. Defaults to 0.
+
+    Raises:
+        AlgorithmExistanceError: When one of the algorithms does not exist.
+
+    Returns:
+        list: One result dictionary per (workers, algorithm, distribution, length), see summarise(), with the SCALING_FIELDS added.
+    """
+    results, baseline_medians = [], {}
+    original_workers = parallel_algorithms.get_workers()
+    try:
+        for workers in worker_counts:
+            parallel_algorithms.set_workers(workers)
+            # Every run is made one at a time on this process, so the only processes are the ones the algorithm starts.
+            for result in run_benchmark(algorithms, lengths, repeats, 1, backend, distributions, seed):
+                key = (result["algorithm"], result["distribution"], result["length"])
+                baseline_medians.setdefault(key, result["median"]) # The first worker count is the baseline.
+                result["workers"], result["speedup"] = workers, baseline_medians[key] / result["median"]
+                results.append(result)
+    finally:
+        parallel_algorithms.set_workers(original_workers)
+    return results
+
+
+def format_results(results, output_format="csv"):
+    """Format benchmark results as CSV or JSON text.
+
+    Args:
+        results (list): The results returned by run_benchmark().
+        output_format (str, optional): Either "csv" or "json". Defaults to "csv".
+
+    Raises:
+        ValueError: When the output format is not supported.
+
+    Returns:
+        str: The formatted results.
+    """
+    if output_format == "json":
+        return json.dumps(results, indent=4)
+    if output_format == "csv":
+        buffer = io.StringIO() # The csv module writes to files, so a file-like string buffer is used.
+        fieldnames = ( # The decision and scaling columns are only written when some result has them.
+            RESULT_FIELDS + COUNTER_FIELDS
+            + (DECISION_FIELDS if any("strategy" in result for result in results) else [])
+            + (SCALING_FIELDS if any("speedup" in result for result in results) else [])
+        )
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n", extrasaction="ignore") # (The times of every repeat are not a column.)
+        writer.writeheader()
+        writer.writerows(results)
+        return buffer.getvalue()
+    raise ValueError(f"The output format '{output_format}' is not supported, choose from: csv, json.")
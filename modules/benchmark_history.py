@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+"""
+This module contains the benchmark history, which keeps the results of every benchmark suite run so later runs can be checked for regressions.
+
+This is a library file and cannot be run directly.
+
+The suite times every algorithm on every distribution at lengths that double each time (n = 2^k), stopping an algorithm once it gets too slow.
+Each run of the suite is stored in a SQLite database, keyed by the git commit it was run on and the machine it was run on
+(times from different machines cannot be compared), along with the time of every repeat and how its arrays were generated
+(see dataset_store.dataset_version(), runs that sorted different arrays are never compared either).
+
+A new run is compared with a baseline run (by default the last run on the same machine) in two ways:
+
+    - Slowdowns: at each length, the repeats of the new run are compared with those of the baseline with a Mann-Whitney U test,
+      which asks how likely it is that the new times would be this much slower than the old ones by chance alone.
+      A result is only flagged when that is unlikely (p below SIGNIFICANCE) and the median is also meaningfully slower (MIN_SLOWDOWN).
+    - Complexity: the times are fitted to time = c * n^exponent, the exponent being the slope of the line through log(n) and log(time).
+      Roughly 1 is linear (or n log n, which fits a little above 1) and 2 is quadratic, so a quick sort that has started to go quadratic
+      shows up as its exponent jumping by about 1, even if it is still fast at the small lengths.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import json
+import math
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+
+import modules.benchmark_engine as benchmark_engine
+import modules.dataset_store as dataset_store
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+DEFAULT_DATABASE = "benchmark_history.db" # The database file the runs are stored in.
+DEFAULT_POWERS = range(6, 17) # The lengths of the suite, 2^6 (64) up to 2^16 (65,536).
+DEFAULT_REPEATS = 5 # The repeats at each length, five is the fewest that can show a significant difference (see mann_whitney_p()).
+DEFAULT_TIME_LIMIT = 1.0 # An algorithm is not run at longer lengths once its median time passes this many seconds.
+MIN_FIT_SECONDS = 1e-3 # Times shorter than this are mostly overhead and noise, so they are left out of the fit (Unless too few are left).
+SIGNIFICANCE = 0.01 # A slowdown is flagged when the chance of it happening by chance alone is below this.
+MIN_SLOWDOWN = 1.1 # A slowdown is only flagged when the median has also got at least this many times slower.
+EXPONENT_TOLERANCE = 0.25 # An exponent this much higher than the baseline's is flagged as the algorithm's complexity getting worse.
+
+
+def current_commit():
+    """Get the git commit the code is at.
+
+    Returns:
+        str: The commit hash, ending in "-dirty" when there are uncommitted changes, or "unknown" outside of a git repository.
+    """
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty", "--abbrev=40"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): # Git is not installed, or this is not a git repository.
+        return "unknown"
+
+
+def machine_id():
+    """Get a description of the machine, runs are only compared with runs on the same machine.
+
+    Returns:
+        str: The machine's name, processor, number of CPUs and Python version.
+    """
+    return f"{platform.node()} ({platform.machine()}, {os.cpu_count()} CPUs, Python {platform.python_version()})"
+
+
+class HistoryStore:
+    """History store class that keeps the results of every suite run in a SQLite database."""
+
+    def __init__(self, path=DEFAULT_DATABASE) -> None:
+        """Initialise the history store, creating the database if it does not exist.
+
+        Args:
+            path (str, optional): The database file. Defaults to DEFAULT_DATABASE.
+        """
+        self._connection = sqlite3.connect(path)
+        with self._connection: # (Commits the tables, if they were created.)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, commit_id TEXT, machine TEXT, created REAL, datasets TEXT)")
+            # Databases made before the datasets were stored are given the column, their runs (NULL) never match a new run's datasets.
+            if "datasets" not in [column[1] for column in self._connection.execute("PRAGMA table_info(runs)")]:
+                self._connection.execute("ALTER TABLE runs ADD COLUMN datasets TEXT")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (run_id INTEGER REFERENCES runs(id), algorithm TEXT, distribution TEXT, "
+                "length INTEGER, median REAL, times TEXT)" # The time of every repeat, as a JSON list.
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
+
+    def add_run(self, commit_id, machine, results, datasets=None):
+        """Store a suite run.
+
+        Args:
+            commit_id (str): The git commit the run was made on.
+            machine (str): The machine the run was made on.
+            results (list): The results of the run, see run_suite().
+            datasets (str, optional): How the arrays were generated, see dataset_store.dataset_version(). Defaults to None (As they are now).
+
+        Returns:
+            int: The id of the stored run.
+        """
+        with self._connection: # Everything is stored, or nothing is.
+            run_id = self._connection.execute(
+                "INSERT INTO runs (commit_id, machine, created, datasets) VALUES (?, ?, ?, ?)",
+                (commit_id, machine, time.time(), datasets or dataset_store.dataset_version()),
+            ).lastrowid
+            self._connection.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, result["algorithm"], result["distribution"], result["length"], result["median"], json.dumps(result["times"])) for result in results],
+            )
+        return run_id
+
+    def find_run(self, machine, commit_id=None, before=None, datasets=None):
+        """Find the latest stored run on a machine that sorted the same arrays.
+
+        Args:
+            machine (str): The machine the run was made on.
+            commit_id (str, optional): Only runs made on this commit (Or commits starting with it). Defaults to None (Any commit).
+            before (int, optional): Only runs stored before the run with this id. Defaults to None (Any run).
+            datasets (str, optional): Only runs whose arrays were generated this way, see dataset_store.dataset_version().
+                Defaults to None (As they are now).
+
+        Returns:
+            tuple: (id, commit) of the run, or None when there is no such run.
+        """
+        query = "SELECT id, commit_id FROM runs WHERE machine = ? AND datasets = ?"
+        parameters = [machine, datasets or dataset_store.dataset_version()]
+        if commit_id is not None:
+            query, parameters = query + " AND commit_id LIKE ?", parameters + [commit_id + "%"]
+        if before is not None:
+            query, parameters = query + " AND id < ?", parameters + [before]
+        return self._connection.execute(query + " ORDER BY id DESC LIMIT 1", parameters).fetchone()
+
+    def get_results(self, run_id):
+        """Get the results of a stored run.
+
+        Args:
+            run_id (int): The id of the run.
+
+        Returns:
+            list: The results, in the same form as run_suite() returns them.
+        """
+        rows = self._connection.execute(
+            "SELECT algorithm, distribution, length, median, times FROM results WHERE run_id = ? ORDER BY rowid", (run_id,),
+        )
+        return [
+            {"algorithm": algorithm, "distribution": distribution, "length": length, "median": median, "times": json.loads(times)}
+            for algorithm, distribution, length, median, times in rows
+        ]
+
+
+def run_suite(algorithms, distributions, powers=DEFAULT_POWERS, repeats=DEFAULT_REPEATS, time_limit=DEFAULT_TIME_LIMIT, seed=0, backend="list", progress=None):
+    """Time every algorithm on every distribution at lengths of 2^k, until it passes the time limit.
+
+    Args:
+        algorithms (list): The names of the algorithms to be run.
+        distributions (list): The shapes of array to run each algorithm on.
+        powers (iterable, optional): The powers of two to use as lengths, smallest first. Defaults to DEFAULT_POWERS.
+        repeats (int, optional): Amount of times each algorithm will repeat at each length. Defaults to DEFAULT_REPEATS.
+        time_limit (float, optional): Once an algorithm's median time passes this many seconds, it is not run at any longer length. Defaults to DEFAULT_TIME_LIMIT.
+        seed (int, optional): The random seed of the first repeat, every run of the suite sorts the same arrays. Defaults to 0.
+        backend (str, optional): The type of array to be sorted, see algorithm_engine.ARRAY_BACKENDS. Defaults to "list".
+        progress (function, optional): Called with each result as it is finished. Defaults to None.
+
+    Raises:
+        AlgorithmExistanceError: When one of the algorithms does not exist.
+
+    Returns:
+        list: One result dictionary per (algorithm, distribution, length) that was run, see benchmark_engine.summarise() (With "times" kept).
+    """
+    results = []
+    for algorithm in algorithms:
+        for distribution in distributions:
+            for power in powers:
+                result, = benchmark_engine.run_benchmark([algorithm], [2**power], repeats, 1, backend, [distribution], seed, keep_times=True)
+                results.append(result)
+                if progress is not None: progress(result)
+                if result["median"] > time_limit: break # The next length would take at least twice as long.
+    return results
+
+
+def fit_exponent(results):
+    """Fit the times of one algorithm on one distribution to time = c * n^exponent.
+
+    Args:
+        results (list): The results at each length.
+
+    Returns:
+        float: The exponent (the slope of the least squares line through log(n) and log(median time)), or None with fewer than 2 lengths.
+    """
+    points = sorted((result["length"], result["median"]) for result in results if result["median"] > 0)
+    fitted_points = [point for point in points if point[1] >= MIN_FIT_SECONDS]
+    if len(fitted_points) < 3: fitted_points = points[-3:] # Too few long enough times, so use the longest there are.
+    if len(fitted_points) < 2: return None
+    xs, ys = [math.log(length) for length, _ in fitted_points], [math.log(seconds) for _, seconds in fitted_points]
+    x_mean, y_mean = statistics.fmean(xs), statistics.fmean(ys)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
+
+
+def mann_whitney_p(new_times, old_times):
+    """Test whether new times are slower than old times (One-sided Mann-Whitney U test, with the exact distribution of U).
+
+    U counts the pairs (one new time, one old time) where the new time is slower, ties counting a half.
+    If nothing had changed, every ordering of the times together would be equally likely, the p value is the fraction of those orderings
+    with a U at least as big as the one measured. With 5 repeats each, the smallest possible p value is 1 in 252.
+
+    Args:
+        new_times (list): The times of the new run.
+        old_times (list): The times of the baseline.
+
+    Returns:
+        float: The p value, the chance of the new times being at least this much slower by chance alone.
+    """
+    new_count, old_count = len(new_times), len(old_times)
+    u = sum(1.0 if new > old else 0.5 if new == old else 0.0 for new in new_times for old in old_times)
+
+    # counts[m][n][u] would be the number of orderings of m new and n old times with a U of u, built up one time at a time:
+    # the slowest of the m + n times is either new (beating all n old times, adding n to U) or old (adding nothing).
+    counts = [[[1]] * (old_count + 1)] # No new times, so U is always 0.
+    for m in range(1, new_count + 1):
+        row = [[1]] # No old times, so U is always 0.
+        for n in range(1, old_count + 1):
+            slowest_new, slowest_old = counts[m - 1][n], row[n - 1]
+            combined = [0] * (m * n + 1)
+            for value, count in enumerate(slowest_new): combined[value + n] += count
+            for value, count in enumerate(slowest_old): combined[value] += count
+            row.append(combined)
+        counts.append(row)
+
+    distribution = counts[new_count][old_count]
+    # (Rounding U down counts a few more orderings as at least as slow, so a tie never makes a result look more significant.)
+    return sum(distribution[math.floor(u):]) / sum(distribution)
+
+
+def min_repeats(significance=SIGNIFICANCE):
+    """Get the fewest repeats a run needs for a slowdown to ever be significant.
+
+    The smallest p value is when every new time is slower than every old time, so with too few repeats even that is not below
+    the significance, and no slowdown could ever be flagged (e.g. 2 repeats each give at best 1 in 6).
+
+    Args:
+        significance (float, optional): The p value a slowdown must be below to be flagged. Defaults to SIGNIFICANCE.
+
+    Returns:
+        int: The fewest repeats (on each side) that can give a p value below the significance.
+    """
+    repeats = 1
+    while mann_whitney_p(range(repeats, 2 * repeats), range(repeats)) >= significance: # Every new time slower than every old time.
+        repeats += 1
+    return repeats
+
+
+def compare(results, baseline_results):
+    """Compare a run with a baseline run, finding significant slowdowns and worse complexity.
+
+    Args:
+        results (list): The results of the new run, see run_suite().
+        baseline_results (list): The results of the baseline run.
+
+    Returns:
+        tuple: (a list of one summary dictionary per algorithm and distribution, with its "exponent" and "baseline_exponent",
+            a list of the regressions found, each a dictionary with the "algorithm", "distribution", "kind" and a "detail" to be shown).
+    """
+    def _grouped(run_results):
+        groups = {}
+        for result in run_results: groups.setdefault((result["algorithm"], result["distribution"]), {})[result["length"]] = result
+        return groups
+
+    groups, baseline_groups = _grouped(results), _grouped(baseline_results)
+    summaries, regressions = [], []
+    for (algorithm, distribution), by_length in groups.items():
+        baseline = baseline_groups.get((algorithm, distribution), {})
+        exponent = fit_exponent(by_length.values())
+        # The baseline is fitted on the same lengths, so the exponents are comparable even if one run stopped earlier.
+        baseline_exponent = fit_exponent([baseline[length] for length in by_length if length in baseline]) if baseline else None
+        summaries.append({"algorithm": algorithm, "distribution": distribution, "exponent": exponent, "baseline_exponent": baseline_exponent})
+
+        if exponent is not None and baseline_exponent is not None and exponent - baseline_exponent > EXPONENT_TOLERANCE:
+            regressions.append({
+                "algorithm": algorithm, "distribution": distribution, "kind": "complexity",
+                "detail": f"time grows as n^{exponent:.2f}, was n^{baseline_exponent:.2f}",
+            })
+        for length, result in sorted(by_length.items()):
+            if length not in baseline: continue
+            slowdown = result["median"] / baseline[length]["median"]
+            p_value = mann_whitney_p(result["times"], baseline[length]["times"])
+            if slowdown >= MIN_SLOWDOWN and p_value < SIGNIFICANCE:
+                regressions.append({
+                    "algorithm": algorithm, "distribution": distribution, "kind": "slowdown",
+                    "detail": f"{slowdown:.2f}x slower at n = {length:,} ({baseline[length]['median']:.6f}s to {result['median']:.6f}s, p = {p_value:.4f})",
+                })
+    return summaries, regressions
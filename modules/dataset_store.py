@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""
+This module contains the dataset store, which caches generated arrays so they never have to be generated twice.
+
+This is a library file and cannot be run directly.
+
+Datasets are keyed by (distribution, length, seed, generator), the generator being "numpy" or "python" (The same seed gives different
+arrays from each). They are kept in memory, least recently used first out,
+and written to disk as raw 64-bit integers which are memory-mapped back in, so other runs and other processes reuse them too.
+Datasets without a seed are random every time, so they are never cached.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import array
+import collections
+import mmap
+import os
+import random
+import tempfile
+import threading
+
+import modules.input_generators as input_generators
+import modules.numpy_algorithms as numpy_algorithms
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+DEFAULT_MEMORY_LIMIT = 512 * 1024**2 # The default amount of memory the cached datasets can use (512MB).
+DEFAULT_DISK_LIMIT = 4 * 1024**3 # The default amount of disk space the cached datasets can use (4GB).
+DEFAULT_CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), "sorting_algorithms_datasets") # Where datasets are written to disk.
+CACHE_FILE_EXTENSION = ".bin"
+# Added to the name of every file written to disk, so files generated differently by older versions are never read.
+# This must go up by one whenever the array generated for a key changes (e.g. a distribution or NUMPY_GENERATION_LENGTH is changed).
+CACHE_FORMAT_VERSION = 2
+# Datasets at least this long are generated with NumPy (when it is installed), shorter ones take less time to generate in Python than NumPy takes to import.
+# This only depends on the length, so the same seed always gives the same array whichever type of array is asked for.
+NUMPY_GENERATION_LENGTH = 1 << 16
+
+_default_store = None # The store shared by everything in this process, created the first time it is needed.
+
+
+class DistributionExistanceError(Exception):
+    """Distribution does not exist.
+
+    Custom exception to be called when a distribution does not exist."""
+    pass
+
+
+def dataset_version():
+    """Get a description of how the datasets are generated here, the same seed only gives the same arrays where this is the same.
+
+    Returns:
+        str: The cache format version, and whether the NumPy versions of the distributions are used from NUMPY_GENERATION_LENGTH.
+    """
+    generator = f"numpy from n = {NUMPY_GENERATION_LENGTH}" if input_generators.__numpy_distributions__ else "python"
+    return f"v{CACHE_FORMAT_VERSION} ({generator})"
+
+
+def get_store():
+    """Get the dataset store shared by everything in this process.
+
+    Returns:
+        DatasetStore: The shared dataset store.
+    """
+    global _default_store
+    if _default_store is None: # Create the store the first time it is asked for.
+        _default_store = DatasetStore()
+    return _default_store
+
+
+class DatasetStore:
+    """Dataset store class that generates, caches and hands out the arrays to be sorted."""
+
+    def __init__(self, memory_limit=DEFAULT_MEMORY_LIMIT, cache_directory=DEFAULT_CACHE_DIRECTORY, disk_limit=DEFAULT_DISK_LIMIT) -> None:
+        """Initialize the dataset store.
+
+        Args:
+            memory_limit (int, optional): Bytes of datasets to keep in memory. Defaults to DEFAULT_MEMORY_LIMIT.
+            cache_directory (str, optional): Directory to write datasets to, None keeps them in memory only. Defaults to DEFAULT_CACHE_DIRECTORY.
+            disk_limit (int, optional): Bytes of datasets to keep on disk. Defaults to DEFAULT_DISK_LIMIT.
+        """
+        self._memory_limit, self._disk_limit = memory_limit, disk_limit # How much of each the datasets can use.
+        self._cache_directory = cache_directory # Where datasets are written to disk.
+        self._datasets = collections.OrderedDict() # The datasets in memory, from least to most recently used.
+        self._memory_used = 0 # The bytes used by the datasets in memory.
+        self._lock = threading.Lock() # Stops the UI and algorithm threads changing the cache at the same time.
+
+    def get(self, distribution, length, seed=None, backend="list"):
+        """Get a fresh copy of a dataset to be sorted.
+
+        Args:
+            distribution (str): The name of the distribution, see input_generators.__distributions__.
+            length (int): The length of the array.
+            seed (int, optional): The random seed, None for a new random array that is not cached. Defaults to None.
+            backend (str, optional): The type of array to return, "list" or "numpy". Defaults to "list".
+
+        Raises:
+            DistributionExistanceError: When the distribution does not exist.
+
+        Returns:
+            list: The array to be sorted (A numpy.ndarray for the numpy backend), safe to sort in place.
+        """
+        if distribution not in input_generators.__distributions__:
+            raise DistributionExistanceError(f"The distribution '{distribution}' does not exist.")
+
+        if seed is None: # Without a seed the array is random every time, so there is nothing to cache.
+            dataset = self._generate(distribution, length, random.randrange(2**32))
+        else:
+            dataset = self._cached(distribution, length, seed)
+
+        if backend == "numpy": # Copy the dataset into an array of the smallest integer type that holds it.
+            values = numpy_algorithms.numpy.frombuffer(dataset, dtype=numpy_algorithms.numpy.int64)
+            return values.astype(numpy_algorithms.array_dtype(int(values.max()) if length else 0))
+        return dataset.tolist() # Copy the dataset into a list.
+
+    def _cached(self, distribution, length, seed):
+        """Get a dataset from memory, then disk, then by generating it, caching it along the way.
+
+        Args:
+            distribution (str): The name of the distribution.
+            length (int): The length of the array.
+            seed (int): The random seed.
+
+        Returns:
+            array.array: The dataset as 64-bit integers (Or a memoryview of them), which must not be changed.
+        """
+        key = (distribution, length, seed, self._generator(distribution, length))
+        with self._lock:
+            if key in self._datasets: # If the dataset is in memory, mark it as the most recently used and return it.
+                self._datasets.move_to_end(key)
+                return self._datasets[key]
+
+        dataset = self._load(key) # Try to load the dataset from disk.
+        if dataset is None: # If it is not on disk either, generate it and write it to disk for next time.
+            dataset = self._generate(distribution, length, seed)
+            self._save(key, dataset)
+
+        with self._lock:
+            self._datasets[key] = dataset
+            self._memory_used += len(dataset) * dataset.itemsize
+            # Forget the least recently used datasets until the memory limit is met (Always keeping the newest one).
+            while self._memory_used > self._memory_limit and len(self._datasets) > 1:
+                _, evicted_dataset = self._datasets.popitem(last=False)
+                self._memory_used -= len(evicted_dataset) * evicted_dataset.itemsize
+        return dataset
+
+    def _generator(self, distribution, length):
+        """Get which version of a distribution generates a dataset, the NumPy one when there is one (and the dataset is long enough to be worth it).
+
+        Args:
+            distribution (str): The name of the distribution.
+            length (int): The length of the array.
+
+        Returns:
+            str: "numpy" or "python".
+        """
+        if distribution in input_generators.__numpy_distributions__ and length >= NUMPY_GENERATION_LENGTH:
+            return "numpy"
+        return "python"
+
+    def _generate(self, distribution, length, seed):
+        """Generate a dataset, using the NumPy version of the distribution when there is one (and the dataset is long enough to be worth it).
+
+        Args:
+            distribution (str): The name of the distribution.
+            length (int): The length of the array.
+            seed (int): The random seed.
+
+        Returns:
+            array.array: The dataset as 64-bit integers.
+        """
+        dataset = array.array("q") # 64-bit integers, 8 bytes per element rather than ~36 for a list of Python ints.
+        if self._generator(distribution, length) == "numpy":
+            numpy = numpy_algorithms.numpy
+            values = input_generators.__numpy_distributions__[distribution](length, numpy.random.default_rng(seed))
+            dataset.frombytes(values.astype(numpy.int64).tobytes())
+        else:
+            dataset.extend(input_generators.__distributions__[distribution](length, random.Random(seed)))
+        return dataset
+
+    def _path(self, key):
+        """Get the path of the file a dataset is written to.
+
+        Args:
+            key (tuple): The (distribution, length, seed, generator) of the dataset.
+
+        Returns:
+            str: The path of the file.
+        """
+        name = "-".join(str(part) for part in (f"v{CACHE_FORMAT_VERSION}",) + key)
+        return os.path.join(self._cache_directory, name + CACHE_FILE_EXTENSION)
+
+    def _load(self, key):
+        """Memory-map a dataset from disk, if it has been written there.
+
+        Args:
+            key (tuple): The (distribution, length, seed, generator) of the dataset.
+
+        Returns:
+            memoryview: The dataset as 64-bit integers, or None when it is not on disk.
+        """
+        if self._cache_directory is None or not os.path.exists(self._path(key)):
+            return None
+        if key[1] == 0: # Empty files cannot be memory-mapped, and there is nothing to load anyway.
+            return array.array("q")
+        with open(self._path(key), "rb") as file:
+            # The mapping stays open after the file is closed, the operating system pages it in as it is read.
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        os.utime(self._path(key)) # Mark the file as recently used, so it is the last to be deleted.
+        return memoryview(mapping).cast("q")
+
+    def _save(self, key, dataset):
+        """Write a dataset to disk, then delete the least recently used files until the disk limit is met.
+
+        Args:
+            key (tuple): The (distribution, length, seed, generator) of the dataset.
+            dataset (array.array): The dataset as 64-bit integers.
+        """
+        if self._cache_directory is None: return
+        os.makedirs(self._cache_directory, exist_ok=True)
+
+        # Write to a temporary file first and then rename it, so other processes never read a half written file.
+        temporary_file, temporary_path = tempfile.mkstemp(dir=self._cache_directory)
+        with os.fdopen(temporary_file, "wb") as file:
+            dataset.tofile(file)
+        os.replace(temporary_path, self._path(key))
+
+        # Find every cached file, from least to most recently used.
+        cached_files = sorted(
+            (os.path.join(self._cache_directory, name) for name in os.listdir(self._cache_directory) if name.endswith(CACHE_FILE_EXTENSION)),
+            key=os.path.getmtime,
+        )
+        disk_used = sum(os.path.getsize(path) for path in cached_files)
+        while disk_used > self._disk_limit and len(cached_files) > 1: # Delete the oldest files, always keeping the newest one.
+            disk_used -= os.path.getsize(cached_files[0])
+            os.remove(cached_files.pop(0))
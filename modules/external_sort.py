@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""
+This module contains the external merge sort, which sorts files of integers far larger than memory.
+
+This is a library file and cannot be run directly.
+
+The file holds fixed-width records, each one a little-endian signed integer of 4 or 8 bytes, one after another.
+The sort happens in two phases:
+    - Runs: the file is read one run at a time (as many records as fit in the memory budget), each run is sorted in memory
+      with any of the registered algorithms and written to a temporary file of its own.
+    - Merge: the sorted runs are merged into the output file by always taking the smallest of the next record of every run (a k-way merge),
+      with a heap keeping the next records in order. Every run is read, and the output written, in large blocks rather than record by record.
+      When there are more runs than can be merged at once, groups of them are merged into longer runs first, in passes.
+
+Only the run being sorted and one block of each run being merged are ever in memory.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import array
+import heapq
+import itertools
+import os
+import tempfile
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+RECORD_TYPES = {4: "i", 8: "q"} # The array type code of each supported record width in bytes.
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024 # The default memory to sort with, 256 MiB.
+BYTES_PER_SORTED_RECORD = 40 # The memory each record of a run takes while sorted as a list (An 8 byte pointer to a 28-32 byte int object).
+MAX_FAN_IN = 64 # The most runs merged at once, more than this are merged in passes (This also limits the number of files open at once).
+MIN_BLOCK_RECORDS = 4096 # The fewest records read or written at once, however tight the memory budget.
+
+
+class ExternalSortCancelled(Exception):
+    """External sort was cancelled.
+
+    Custom exception to be called when an external sort is stopped before it has finished, no output is written."""
+    pass
+
+
+def write_records(path, values, record_width=8):
+    """Write integers to a file of fixed-width records, e.g. to create a file to sort.
+
+    Args:
+        path (str): The file to write.
+        values (iterable): The integers to write.
+        record_width (int, optional): The number of bytes per record, 4 or 8. Defaults to 8.
+    """
+    with open(path, "wb") as file:
+        values = iter(values)
+        while True: # Write the values a block at a time, so they never all have to be in memory.
+            block = array.array(RECORD_TYPES[record_width], itertools.islice(values, MIN_BLOCK_RECORDS * 16))
+            if not block: break
+            block.tofile(file)
+
+
+def read_records(path, record_width=8, block_records=MIN_BLOCK_RECORDS):
+    """Read the integers of a file of fixed-width records, a block at a time.
+
+    Args:
+        path (str): The file to read.
+        record_width (int, optional): The number of bytes per record, 4 or 8. Defaults to 8.
+        block_records (int, optional): The number of records to read from the file at once. Defaults to MIN_BLOCK_RECORDS.
+
+    Yields:
+        int: Each record, in the order they are in the file.
+    """
+    with open(path, "rb") as file:
+        while True:
+            block = array.array(RECORD_TYPES[record_width])
+            try:
+                block.fromfile(file, block_records)
+            except EOFError: # Fewer records than asked for were left, the ones there were have still been read.
+                pass
+            if not block: return
+            yield from block
+
+
+def sort_file(input_path, output_path, sort_run, memory_budget=DEFAULT_MEMORY_BUDGET, run_records=None, record_width=8, progress=None, cancelled=None,
+              run_type=None):
+    """Sort a file of fixed-width integer records into a new file, using at most about memory_budget bytes of memory.
+
+    Args:
+        input_path (str): The file to sort.
+        output_path (str): The file to write the sorted records to.
+        sort_run (function): Sorts one run, given it as a list and returning the sorted list (e.g. the fast path of a registered algorithm).
+        memory_budget (int, optional): The memory to sort with in bytes. Defaults to DEFAULT_MEMORY_BUDGET.
+        run_records (int, optional): The number of records in each run. Defaults to None (As many as fit in the memory budget).
+        record_width (int, optional): The number of bytes per record, 4 or 8. Defaults to 8.
+        progress (function, optional): Called as progress(phase, records done, records in total) as the sort goes on. Defaults to None.
+        cancelled (function, optional): Called between blocks, the sort stops when it returns True. Defaults to None.
+        run_type (type, optional): The type of list each run is read into for sort_run (e.g. tracked_array.TrackedArray),
+            so the run is never copied into a second list. Defaults to None (A plain list).
+
+    Raises:
+        ValueError: When the record width is not supported, or the file is not a whole number of records.
+        ExternalSortCancelled: When cancelled() returned True, nothing is written to the output file.
+
+    Returns:
+        int: The number of runs the file was split into.
+    """
+    if record_width not in RECORD_TYPES:
+        raise ValueError(f"The record width {record_width} is not supported, choose from: {', '.join(map(str, RECORD_TYPES))}.")
+    if os.path.getsize(input_path) % record_width:
+        raise ValueError(f"The file '{input_path}' is not a whole number of {record_width} byte records.")
+    total_records = os.path.getsize(input_path) // record_width
+    run_records = run_records or max(memory_budget // (BYTES_PER_SORTED_RECORD + record_width), 1)
+    progress = progress or (lambda phase, done, total: None)
+    cancelled = cancelled or (lambda: False)
+
+    with tempfile.TemporaryDirectory() as run_directory: # The runs are deleted once the sort has finished (or failed).
+        # Split the file into sorted runs.
+        run_paths = []
+        progress("Sorting runs", 0, total_records)
+        with open(input_path, "rb") as input_file:
+            while True:
+                run = array.array(RECORD_TYPES[record_width])
+                try:
+                    run.fromfile(input_file, run_records) # Read the whole run in one call.
+                except EOFError: # The last run is shorter.
+                    pass
+                if not run: break
+                if cancelled(): raise ExternalSortCancelled("The external sort was cancelled.")
+
+                sorted_run = sort_run(run.tolist() if run_type is None else run_type(run)) # Sort the run in memory.
+                run_paths.append(os.path.join(run_directory, f"run_{len(run_paths)}"))
+                with open(run_paths[-1], "wb") as run_file:
+                    array.array(RECORD_TYPES[record_width], sorted_run).tofile(run_file)
+                del run, sorted_run # Free the run before reading the next one.
+                progress("Sorting runs", min(len(run_paths) * run_records, total_records), total_records)
+
+        # Merge the runs in passes until they fit in a single merge, then merge them into the output file.
+        run_count, merge_pass = len(run_paths), 1
+        while len(run_paths) > MAX_FAN_IN:
+            merged_paths = []
+            for group_start in range(0, len(run_paths), MAX_FAN_IN):
+                merged_paths.append(os.path.join(run_directory, f"pass_{merge_pass}_{len(merged_paths)}"))
+                _merge(run_paths[group_start:group_start + MAX_FAN_IN], merged_paths[-1], memory_budget, record_width,
+                       lambda done, _: progress(f"Merging (pass {merge_pass})", group_start * run_records + done, total_records), cancelled)
+            for path in run_paths: os.remove(path)
+            run_paths, run_records = merged_paths, run_records * MAX_FAN_IN # Each new run holds a whole group of the old ones.
+            merge_pass += 1
+
+        _merge(run_paths, output_path, memory_budget, record_width, lambda done, total: progress("Merging", done, total), cancelled)
+    progress("Finished", total_records, total_records)
+    return run_count
+
+
+def _merge(run_paths, output_path, memory_budget, record_width, progress, cancelled):
+    """Merge sorted runs into one sorted file.
+
+    Args:
+        run_paths (list): The files of the sorted runs.
+        output_path (str): The file to write the merged records to.
+        memory_budget (int): The memory to merge with in bytes, shared between the block buffer of every run and of the output.
+        record_width (int): The number of bytes per record.
+        progress (function): Called as progress(records written, records in total) after every block written.
+        cancelled (function): Called between blocks, the merge stops when it returns True.
+
+    Raises:
+        ExternalSortCancelled: When cancelled() returned True, the output file is deleted.
+    """
+    block_records = max(memory_budget // ((len(run_paths) + 1) * record_width), MIN_BLOCK_RECORDS)
+    total_records = sum(os.path.getsize(path) for path in run_paths) // record_width
+    # heapq.merge keeps the next record of every run in a heap, so each record written costs log2(runs) comparisons.
+    merged = heapq.merge(*(read_records(path, record_width, block_records) for path in run_paths))
+
+    written = 0
+    try:
+        with open(output_path, "wb") as output_file:
+            while True:
+                block = array.array(RECORD_TYPES[record_width], itertools.islice(merged, block_records)) # Take a whole block of the merge at once.
+                if not block: break
+                if cancelled(): raise ExternalSortCancelled("The external sort was cancelled.")
+                block.tofile(output_file)
+                written += len(block)
+                progress(written, total_records)
+    except ExternalSortCancelled:
+        os.remove(output_path) # Do not leave a half merged file behind.
+        raise
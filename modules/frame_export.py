@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+"""
+This module contains the frame exporter, which turns a run (live or a recorded trace) into an animated GIF or a sequence of PNG images.
+
+This is a library file and cannot be run directly.
+
+No window is opened. The run is stepped through as fast as possible, and every few steps a downsampled copy of the array
+(one value per column of bars) is taken as a frame. Drawing and encoding a frame costs far more than taking it,
+so the frames are sent in batches to a pool of worker processes, which draw them with NumPy and encode them in parallel.
+The finished frames are written in order as they come back, so only a few batches are ever held in memory.
+
+The images are encoded without any extra libraries: PNG with zlib, and GIF with a small LZW encoder.
+Each bar image only has two colours, so every pixel is stored as an index into a two colour palette.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import collections
+import concurrent.futures
+import math
+import os
+import struct
+import zlib
+
+from modules.numpy_algorithms import numpy # NumPy is optional, but is needed to draw the frames.
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+DEFAULT_FPS = 60 # The default number of frames per second of the exported clip.
+DEFAULT_DURATION = 10 # The default length of the exported clip in seconds, when the steps per frame are not given.
+FRAMES_PER_TASK = 16 # The number of frames sent to a worker process at once (Fewer, larger batches spend less time sending them).
+PALETTE = [(22, 22, 22), (250, 185, 45)] # The background and bar colours, the same as the window's.
+GIF_MINIMUM_DELAY = 2 # GIF frame delays are in hundredths of a second, and most viewers treat anything under 2 as 10.
+
+
+def capture_frames(steps, sorting_array, steps_per_frame, width):
+    """Step through a run, taking a downsampled copy of the array every few steps.
+
+    Args:
+        steps (generator): The running algorithm (Or a trace replay), making its changes to sorting_array.
+        sorting_array (array): The array being sorted (A list or a NumPy array).
+        steps_per_frame (float): The number of steps between each frame, fractions repeat a frame (e.g. 0.5 shows every step twice).
+        width (int): The width of the frames in pixels (No bar is thinner than 1px, so at most this many values are taken).
+
+    Yields:
+        list: The value of every bar, first before the run, then every steps_per_frame steps, then once the run has finished.
+    """
+    step = math.ceil(len(sorting_array) / width) # Every step-th element is drawn as a bar.
+
+    def _frame():
+        values = sorting_array[::step]
+        return values if isinstance(values, list) else values.tolist() # A NumPy slice is a view of the array, so it is copied out.
+
+    yield _frame() # The array before the run.
+    taken, next_frame = 0, steps_per_frame # The number of steps taken, and the number after which the next frame is due.
+    for _ in steps:
+        taken += 1
+        while taken >= next_frame: # (A loop, so a fraction of a step per frame repeats the frame.)
+            yield _frame()
+            next_frame += steps_per_frame
+    if taken + steps_per_frame > next_frame: yield _frame() # The finished array, unless it was the last frame taken.
+
+
+def render_frame(values, maximum, width, height):
+    """Draw one frame of bars as palette indexes, laid out like the window (bars rise from the bottom, between 10% and 90% of the height).
+
+    Args:
+        values (list): The value of every bar.
+        maximum (float): The largest value of the array.
+        width (int): The width of the frame in pixels.
+        height (int): The height of the frame in pixels.
+
+    Returns:
+        numpy.ndarray: The frame, one byte per pixel (0 for the background, 1 for a bar), height rows of width pixels.
+    """
+    item_width = max(round(width / len(values)), 1)
+    bar_heights = numpy.asarray(values, dtype=numpy.float64) / maximum * (height * 0.8) + height * 0.1
+    column_tops = numpy.full(width, height, dtype=numpy.float64) # Columns past the last bar are empty.
+    column_heights = numpy.repeat(bar_heights, item_width)[:width]
+    column_tops[:len(column_heights)] = height - column_heights
+    # A pixel is part of a bar when it is lower down than the top of the bar in its column.
+    return (numpy.arange(height, dtype=numpy.float64)[:, numpy.newaxis] >= column_tops[numpy.newaxis, :]).astype(numpy.uint8)
+
+
+def encode_png(pixels):
+    """Encode a frame as a PNG image.
+
+    Args:
+        pixels (numpy.ndarray): The frame as palette indexes, see render_frame().
+
+    Returns:
+        bytes: The PNG file.
+    """
+    def _chunk(chunk_type, data): # Every PNG chunk is its length, type, data and a checksum of the type and data.
+        return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+    height, width = pixels.shape
+    rows = numpy.zeros((height, width + 1), dtype=numpy.uint8) # Each row starts with a 0, meaning it is stored as is (unfiltered).
+    rows[:, 1:] = pixels
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)) # 8 bits per pixel, colour type 3 (palette indexes).
+        + _chunk(b"PLTE", bytes(channel for colour in PALETTE for channel in colour))
+        + _chunk(b"IDAT", zlib.compress(rows.tobytes(), 6))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def _lzw_compress(data, minimum_code_size):
+    """Compress palette indexes with the variable code size LZW that GIF uses.
+
+    Args:
+        data (bytes): The palette index of every pixel.
+        minimum_code_size (int): The number of bits per palette index (At least 2 for GIF).
+
+    Returns:
+        bytes: The compressed codes, packed least significant bit first.
+    """
+    clear_code = 1 << minimum_code_size
+    end_code = clear_code + 1
+    output = bytearray()
+
+    # Each code in the table stands for a run of indexes, keyed by (the code for the run minus its last index) << 8 | its last index.
+    table, next_code, code_size = {}, end_code + 1, minimum_code_size + 1
+    bits, bit_count = clear_code, code_size # Start with a clear code.
+
+    code = data[0]
+    for index in data[1:]:
+        key = code << 8 | index
+        longer_code = table.get(key)
+        if longer_code is not None: # The run extended by this index is already in the table, keep extending it.
+            code = longer_code
+            continue
+
+        bits |= code << bit_count # Write the code for the longest run found.
+        bit_count += code_size
+        while bit_count >= 8:
+            output.append(bits & 0xFF)
+            bits >>= 8
+            bit_count -= 8
+
+        if next_code < 4096: # Add the run extended by this index to the table.
+            table[key] = next_code
+            next_code += 1
+            if next_code > 1 << code_size and code_size < 12: code_size += 1 # Grow the codes once the table outgrows them.
+        else: # The table is full (GIF codes are at most 12 bits), so start again with an empty one.
+            bits |= clear_code << bit_count
+            bit_count += code_size
+            table, next_code, code_size = {}, end_code + 1, minimum_code_size + 1
+        code = index
+
+    for final_code in (code, end_code): # Write the last run, then the end code.
+        bits |= final_code << bit_count
+        bit_count += code_size
+        while bit_count >= 8:
+            output.append(bits & 0xFF)
+            bits >>= 8
+            bit_count -= 8
+    if bit_count: output.append(bits & 0xFF)
+    return bytes(output)
+
+
+def encode_gif_frame(pixels, delay):
+    """Encode one frame of an animated GIF.
+
+    Args:
+        pixels (numpy.ndarray): The frame as palette indexes, see render_frame().
+        delay (int): How long to show the frame for, in hundredths of a second.
+
+    Returns:
+        bytes: The frame's graphic control extension, image descriptor and compressed image data.
+    """
+    height, width = pixels.shape
+    compressed = _lzw_compress(pixels.tobytes(), 2) # GIF codes are at least 2 bits, even for a two colour palette.
+    blocks = b"".join(bytes([len(compressed[start:start + 255])]) + compressed[start:start + 255] for start in range(0, len(compressed), 255))
+    return (
+        b"\x21\xF9\x04\x00" + struct.pack("<H", delay) + b"\x00\x00" # Graphic control extension: the frame delay.
+        + b"\x2C" + struct.pack("<HHHH", 0, 0, width, height) + b"\x00" # Image descriptor: the whole image, using the global palette.
+        + b"\x02" + blocks + b"\x00" # The minimum code size, then the compressed data in blocks of at most 255 bytes.
+    )
+
+
+def _gif_header(width, height):
+    """Get the start of an animated GIF, which loops forever.
+
+    Args:
+        width (int): The width of the frames in pixels.
+        height (int): The height of the frames in pixels.
+
+    Returns:
+        bytes: The header, logical screen descriptor, palette and looping extension.
+    """
+    palette = PALETTE + [PALETTE[0]] * (4 - len(PALETTE)) # The palette is padded to 4 colours, the smallest size with 2 bit codes.
+    return (
+        b"GIF89a" + struct.pack("<HH", width, height) + b"\x81\x00\x00" # A global palette of 2^(1+1) colours follows.
+        + bytes(channel for colour in palette for channel in colour)
+        + b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00" # Loop forever.
+    )
+
+
+def _render_batch(frames, maximum, width, height, output, first_index, delay):
+    """Draw and encode a batch of frames. Runs in a worker process, so it must be at the top level of the module to be pickled.
+
+    Args:
+        frames (list): The values of every bar, for each frame.
+        maximum (float): The largest value of the array.
+        width (int): The width of the frames in pixels.
+        height (int): The height of the frames in pixels.
+        output (str): The GIF file (only used to choose the format) or the directory to write PNG images into.
+        first_index (int): The number of the first frame in the batch, used to name PNG images.
+        delay (int): How long to show each GIF frame for, in hundredths of a second.
+
+    Returns:
+        list: The encoded GIF frames, to be written in order by the main process (Empty for PNG, the images are written here).
+    """
+    if output.lower().endswith(".gif"):
+        return [encode_gif_frame(render_frame(values, maximum, width, height), delay) for values in frames]
+    for frame_index, values in enumerate(frames, first_index):
+        with open(os.path.join(output, f"frame_{frame_index:06d}.png"), "wb") as file:
+            file.write(encode_png(render_frame(values, maximum, width, height)))
+    return []
+
+
+def export_frames(steps, sorting_array, output, steps_per_frame, fps=DEFAULT_FPS, width=800, height=450, workers=None):
+    """Export a run as an animated GIF, or as a numbered sequence of PNG images (e.g. to be joined into a video with ffmpeg).
+
+    Args:
+        steps (generator): The running algorithm (Or a trace replay), making its changes to sorting_array.
+        sorting_array (array): The array being sorted, as it is before the run (A list or a NumPy array).
+        output (str): The GIF file to write (A path ending in .gif), or the directory to write PNG images into.
+        steps_per_frame (float): The number of steps between each frame.
+        fps (int, optional): The frames per second of the clip. Defaults to DEFAULT_FPS.
+            GIF delays are in hundredths of a second and at least GIF_MINIMUM_DELAY, so GIFs play at 50 fps at most.
+        width (int, optional): The width of the frames in pixels. Defaults to 800.
+        height (int, optional): The height of the frames in pixels. Defaults to 450.
+        workers (int, optional): The number of worker processes to draw frames on, 1 draws them on this process. Defaults to None (One per CPU).
+
+    Raises:
+        ImportError: When NumPy is not installed.
+
+    Returns:
+        int: The number of frames exported.
+    """
+    if numpy is None: # If NumPy is not installed, the frames cannot be drawn.
+        raise ImportError("Exporting frames requires NumPy, install it with 'pip install numpy'.")
+    workers = workers or os.cpu_count() or 1
+    is_gif = output.lower().endswith(".gif")
+    if not is_gif: os.makedirs(output, exist_ok=True)
+    maximum = max(sorting_array) or 1 # Sorting only moves values around, so the maximum of the array before the run is the maximum throughout.
+    delay = max(round(100 / fps), GIF_MINIMUM_DELAY)
+
+    frame_count = 0
+    gif_file = open(output, "wb") if is_gif else None
+    if is_gif: gif_file.write(_gif_header(width, height))
+    executor = concurrent.futures.ProcessPoolExecutor(workers) if workers > 1 else None
+    pending = collections.deque() # The batches being drawn, oldest first.
+
+    def _write_oldest():
+        encoded = pending.popleft()
+        for frame in (encoded.result() if executor is not None else encoded):
+            gif_file.write(frame)
+
+    try:
+        batch = []
+        for values in capture_frames(steps, sorting_array, steps_per_frame, width):
+            batch.append(values)
+            if len(batch) < FRAMES_PER_TASK: continue
+            arguments = (batch, maximum, width, height, output, frame_count, delay)
+            pending.append(executor.submit(_render_batch, *arguments) if executor is not None else _render_batch(*arguments))
+            frame_count += len(batch)
+            batch = []
+            while len(pending) > workers * 2: _write_oldest() # Keep the workers busy without holding every frame in memory.
+        if batch: # The last, partly filled batch.
+            arguments = (batch, maximum, width, height, output, frame_count, delay)
+            pending.append(executor.submit(_render_batch, *arguments) if executor is not None else _render_batch(*arguments))
+            frame_count += len(batch)
+        while pending: _write_oldest()
+        if is_gif: gif_file.write(b"\x3B") # The GIF trailer.
+    finally:
+        if executor is not None: executor.shutdown(cancel_futures=True)
+        if gif_file is not None: gif_file.close()
+    return frame_count
+
+
+def count_steps(func, sorting_array):
+    """Count the steps of a run, by running it on a copy of the array.
+
+    Args:
+        func (function): The algorithm (Or a trace replay, see trace_file.replayer()).
+        sorting_array (array): The array to be sorted, it is not changed.
+
+    Returns:
+        int: The number of operation records the run yields.
+    """
+    return sum(1 for _ in func(sorting_array.copy()))
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""
+This module contains the incremental sorter, which keeps values that arrive in batches sorted as they arrive.
+
+This is a library file and cannot be run directly.
+
+Re-sorting everything each time a batch arrives costs O(n log n) per batch. Instead, each batch is sorted on its own (with any of
+the registered algorithms) and kept as a sorted run, on a stack of runs like timsort's. Neighbouring runs are merged whenever the
+run lengths stop shrinking fast enough going up the stack, so there are only ever about log2(n) runs and each value is merged
+about log2(n) times, roughly O(b log n) per batch of b values.
+The smallest or largest k values are found by merging just the ends of the runs, without sorting anything else.
+The whole sorted order is only built (by merging every run) when it is asked for.
+
+TopK keeps only the k largest values in a heap, for when nothing else is ever needed (O(b log k) per batch, O(k) memory).
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import heapq
+import itertools
+
+from modules.sorting_algorithms import COMPARE, SWAP, WRITE, WRITE_RANGE, PASS, _merge, timsort
+import modules.step_scheduler as step_scheduler
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+class IncrementalSorter:
+    """Incremental sorter class that sorts batches of values as they are pushed, keeping them as a stack of sorted runs."""
+
+    def __init__(self, algorithm=timsort, storage=None) -> None:
+        """Initialise the incremental sorter.
+
+        Args:
+            algorithm (function, optional): The registered algorithm each batch is sorted with. Defaults to timsort.
+            storage (array, optional): The array to keep the values in, from index 0, it grows when it is too short. Defaults to None (A new list).
+                The engine passes the array it is drawing, so the window shows the runs as they are sorted and merged.
+        """
+        self._algorithm = algorithm
+        self._array = [] if storage is None else storage
+        self._length = 0 # The number of values pushed, they are at the start of the array.
+        self._runs = [] # The stack of (start, length) of each sorted run, the first run starts at 0 and each run follows the one before.
+
+    def __len__(self):
+        """Get the number of values pushed."""
+        return self._length
+
+    def __getitem__(self, index):
+        """Get the value (or values, for a slice) at a position in the sorted order.
+
+        Args:
+            index (int or slice): The position in the sorted order.
+        """
+        self._merge_all()
+        return self._array[:self._length][index]
+
+    def __iter__(self):
+        """Iterate over every value pushed, in sorted order."""
+        self._merge_all()
+        return itertools.islice(self._array, self._length)
+
+    def push(self, batch):
+        """Add a batch of values, sorting it and merging it into the runs at full speed.
+
+        Args:
+            batch (iterable): The values to add.
+        """
+        start, end = self._store(batch)
+        run = self._array[start:end]
+        if not isinstance(run, list): run = run.tolist() # (A NumPy slice is a view, the run is sorted as a copy.)
+        step_scheduler.fast_path(self._algorithm)(run)
+        self._array[start:end] = run
+        self._runs.append((start, end - start))
+
+        merge = step_scheduler.fast_path(_merge)
+        for bounds in self._pending_merges():
+            merge(self._array, *bounds)
+
+    def push_steps(self, batch):
+        """Add a batch of values one step at a time, so the engine can pace and draw the sort of the batch and every merge.
+
+        Args:
+            batch (iterable): The values to add.
+
+        Yields:
+            tuple: The operation record of every step, with indexes in the sorter's array.
+        """
+        start, end = self._store(batch)
+        yield WRITE_RANGE, start, end
+        array = self._array
+        run = array[start:end]
+        if not isinstance(run, list): run = run.tolist()
+
+        # The algorithm sorts a copy of the batch, every change it makes is copied into the array at the same place.
+        for record in self._algorithm(run):
+            code = record[0]
+            if code == COMPARE:
+                yield COMPARE, start + record[1], start + record[2]
+            elif code == SWAP:
+                first, second = start + record[1], start + record[2]
+                array[first], array[second] = array[second], array[first]
+                yield SWAP, first, second
+            elif code == WRITE:
+                array[start + record[1]] = record[2]
+                yield WRITE, start + record[1], record[2]
+            elif code == WRITE_RANGE:
+                array[start + record[1]:start + record[2]] = run[record[1]:record[2]]
+                yield WRITE_RANGE, start + record[1], start + record[2]
+            else:
+                yield record
+        self._runs.append((start, end - start))
+
+        for bounds in self._pending_merges():
+            yield from _merge(array, *bounds)
+            yield (PASS,) # End of a pass, one per merge.
+
+    def _store(self, batch):
+        """Write a batch of values after the values already pushed.
+
+        Args:
+            batch (iterable): The values to add.
+
+        Returns:
+            tuple: The (start, end) of the batch in the array, end is exclusive.
+        """
+        batch = list(batch)
+        start, end = self._length, self._length + len(batch)
+        self._array[start:end] = batch # (A list shorter than end grows to fit the batch.)
+        self._length = end
+        return start, end
+
+    def _pending_merges(self):
+        """Find the merges needed so the run lengths shrink fast enough going up the stack (The same rule as timsort).
+
+        Yields:
+            tuple: The (start, middle, end) of each merge, the stack is updated once the merge has been made (when the next is asked for).
+        """
+        runs = self._runs
+        while len(runs) > 1:
+            top = len(runs) - 2
+            if top > 0 and runs[top - 1][1] <= runs[top][1] + runs[top + 1][1]:
+                stack_index = top - 1 if runs[top - 1][1] < runs[top + 1][1] else top
+            elif runs[top][1] <= runs[top + 1][1]:
+                stack_index = top
+            else:
+                return
+            (start, length), (_, next_length) = runs[stack_index], runs[stack_index + 1]
+            yield start, start + length, start + length + next_length
+            runs[stack_index] = (start, length + next_length)
+            del runs[stack_index + 1]
+
+    def _remaining_merges(self):
+        """Find the merges needed to merge every run into one, from the top of the stack down (The smallest runs first).
+
+        Yields:
+            tuple: The (start, middle, end) of each merge, the stack is updated once the merge has been made (when the next is asked for).
+        """
+        while len(self._runs) > 1:
+            (start, length), (_, next_length) = self._runs[-2], self._runs[-1]
+            yield start, start + length, start + length + next_length
+            self._runs[-2:] = [(start, length + next_length)]
+
+    def _merge_all(self):
+        """Merge every run into one at full speed, so the values pushed are in sorted order at the start of the array."""
+        merge = step_scheduler.fast_path(_merge)
+        for bounds in self._remaining_merges():
+            merge(self._array, *bounds)
+
+    def merge_all_steps(self):
+        """Merge every run into one, one step at a time, so the engine can pace and draw the merges.
+
+        Yields:
+            tuple: The operation record of every step.
+        """
+        for bounds in self._remaining_merges():
+            yield from _merge(self._array, *bounds)
+            yield (PASS,) # End of a pass, one per merge.
+
+    def sorted(self):
+        """Get every value pushed, in sorted order.
+
+        Returns:
+            list: A new list of the values.
+        """
+        self._merge_all()
+        values = self._array[:self._length]
+        return values if isinstance(values, list) else values.tolist()
+
+    def smallest(self, k):
+        """Get the k smallest values pushed, without sorting the rest (Only the first k values of each run are merged).
+
+        Args:
+            k (int): The number of values.
+
+        Returns:
+            list: The k smallest values, smallest first (All of them when fewer than k have been pushed).
+        """
+        heads = [self._array[start:start + min(length, k)] for start, length in self._runs]
+        return list(itertools.islice(heapq.merge(*heads), k))
+
+    def largest(self, k):
+        """Get the k largest values pushed, without sorting the rest (Only the last k values of each run are merged).
+
+        Args:
+            k (int): The number of values.
+
+        Returns:
+            list: The k largest values, largest first (All of them when fewer than k have been pushed).
+        """
+        tails = [self._array[max(start, start + length - k):start + length][::-1] for start, length in self._runs]
+        return list(itertools.islice(heapq.merge(*tails, reverse=True), k))
+
+
+class TopK:
+    """Top k class that keeps only the k largest values pushed, in a min heap (The smallest of the k is always first, ready to be replaced)."""
+
+    def __init__(self, k) -> None:
+        """Initialise the top k.
+
+        Args:
+            k (int): The number of values to keep.
+        """
+        self._k = k
+        self._heap = []
+
+    def __len__(self):
+        """Get the number of values kept."""
+        return len(self._heap)
+
+    def push(self, batch):
+        """Add a batch of values, keeping only the k largest seen so far.
+
+        Args:
+            batch (iterable): The values to add.
+        """
+        heap, k = self._heap, self._k
+        for value in batch:
+            if len(heap) < k:
+                heapq.heappush(heap, value)
+            elif heap and value > heap[0]: # Only values larger than the smallest kept value are kept, replacing it (A top 0 keeps nothing).
+                heapq.heapreplace(heap, value)
+
+    def largest(self):
+        """Get the values kept.
+
+        Returns:
+            list: The k largest values pushed, largest first.
+        """
+        return sorted(self._heap, reverse=True)
+
+
+def streamed(func, batch_size):
+    """Get an algorithm that sorts the array as if its values arrived in batches, pushing each batch into an incremental sorter.
+
+    The window shows the sorted runs growing from the left of the array, while the values still to arrive wait on the right.
+
+    Args:
+        func (function): The registered algorithm each batch is sorted with.
+        batch_size (int): The number of values in each batch.
+
+    Returns:
+        function: A generator function taking (sorting_array), named after the algorithm with "_streamed" added.
+    """
+    def _streamed(sorting_array):
+        sorter = IncrementalSorter(func, sorting_array) # The sorter keeps its runs at the start of the array being drawn.
+        for batch_start in range(0, len(sorting_array), batch_size):
+            yield from sorter.push_steps(sorting_array[batch_start:batch_start + batch_size])
+        yield from sorter.merge_all_steps() # Every value has arrived, so merge the runs into the sorted array.
+    _streamed.__name__ = f"{func.__name__}_streamed"
+    return _streamed
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+This file contains the input distributions, the shapes of array the algorithms can be given to sort.
+
+This is a library file and cannot be run directly.
+
+To add a new distribution, simply add a new function with the @distribution_wrapper decorator taking length and rng (a random.Random) as parameters.
+If it can be generated faster with NumPy, also add a function named after it ending in _numpy with the @numpy_distribution_wrapper decorator taking length and rng (a numpy.random.Generator).
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+
+import itertools
+
+from modules.numpy_algorithms import numpy
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+__distributions__ = {} # This is a dictionary that will contain all of the distributions, by name.
+__numpy_distributions__ = {} # This is a dictionary that will contain the NumPy versions of the distributions that have one, by name.
+
+NEARLY_SORTED_SWAPS = 0.01 # The fraction of elements swapped out of place in a nearly sorted array.
+FEW_UNIQUE_VALUES = 10 # The number of different values in a few unique array.
+SAWTOOTH_TEETH = 8 # The number of ascending runs in a sawtooth array.
+ZIPF_EXPONENT = 1.1 # How quickly the popularity of values falls off in a Zipf array (Higher means more duplicates of the smallest values).
+
+
+def distribution_wrapper(func):
+    """Decorator that will add the distribution to the dictionary of distributions.
+
+    Args:
+        func (function): The distribution to be added.
+    """
+    __distributions__[func.__name__] = func # Add the distribution to the dictionary of distributions.
+    return func
+
+
+def numpy_distribution_wrapper(func):
+    """Decorator that will add the NumPy version of a distribution to the dictionary of NumPy distributions.
+
+    Args:
+        func (function): The NumPy version of the distribution to be added.
+    """
+    # Add the distribution to the dictionary of NumPy distributions, under the name of the distribution it is a version of (Without "_numpy").
+    __numpy_distributions__[func.__name__[:-len("_numpy")]] = func
+    return func
+
+
+@distribution_wrapper
+def uniform(length, rng):
+    """ A random shuffle of the numbers 1 to length. """
+    return rng.sample(range(1, length + 1), length)
+
+
+@distribution_wrapper
+def nearly_sorted(length, rng):
+    """ The numbers 1 to length in order, with a few random pairs swapped. """
+    array = list(range(1, length + 1))
+    for _ in range(int(length * NEARLY_SORTED_SWAPS)): # Swap a small fraction of random pairs.
+        first, second = rng.randrange(length), rng.randrange(length)
+        array[first], array[second] = array[second], array[first]
+    return array
+
+
+@distribution_wrapper
+def reverse_sorted(length, rng):
+    """ The numbers 1 to length in reverse order. """
+    return list(range(length, 0, -1))
+
+
+@distribution_wrapper
+def few_unique(length, rng):
+    """ Random numbers with only a few different values, so most elements are duplicates. """
+    step = max(length // FEW_UNIQUE_VALUES, 1) # The values are spread evenly between 1 and length.
+    return [rng.randrange(FEW_UNIQUE_VALUES) * step + 1 for _ in range(length)]
+
+
+@distribution_wrapper
+def sawtooth(length, rng):
+    """ Several ascending runs one after another, like the teeth of a saw. """
+    tooth_length = max(-(-length // SAWTOOTH_TEETH), 1) # The length of each run (Division rounded up).
+    return [(index % tooth_length) * SAWTOOTH_TEETH + index // tooth_length + 1 for index in range(length)]
+
+
+@distribution_wrapper
+def zipf(length, rng):
+    """ Random numbers where small values are far more common than large ones (Zipf's law), many duplicates. """
+    if not length: return [] # (There are no values to choose from.)
+    # The weight of value k is 1/k^exponent, accumulated so each draw is a binary search.
+    cumulative_weights = list(itertools.accumulate(1 / value ** ZIPF_EXPONENT for value in range(1, length + 1)))
+    return rng.choices(range(1, length + 1), cum_weights=cumulative_weights, k=length)
+
+
+if numpy is not None: # The NumPy versions are only registered when NumPy is installed.
+
+    @numpy_distribution_wrapper
+    def uniform_numpy(length, rng):
+        """ A random shuffle of the numbers 1 to length, generated in one vectorized call. """
+        return rng.permutation(length) + 1
+
+    @numpy_distribution_wrapper
+    def nearly_sorted_numpy(length, rng):
+        """ The numbers 1 to length in order, with a few random pairs swapped. """
+        array = numpy.arange(1, length + 1)
+        swaps = int(length * NEARLY_SORTED_SWAPS)
+        first, second = rng.integers(0, length, swaps), rng.integers(0, length, swaps)
+        for first_index, second_index in zip(first.tolist(), second.tolist()): # Swapped one by one, pairs may overlap.
+            array[first_index], array[second_index] = array[second_index], array[first_index]
+        return array
+
+    @numpy_distribution_wrapper
+    def reverse_sorted_numpy(length, rng):
+        """ The numbers 1 to length in reverse order. """
+        return numpy.arange(length, 0, -1)
+
+    @numpy_distribution_wrapper
+    def few_unique_numpy(length, rng):
+        """ Random numbers with only a few different values, so most elements are duplicates. """
+        return rng.integers(0, FEW_UNIQUE_VALUES, length) * max(length // FEW_UNIQUE_VALUES, 1) + 1
+
+    @numpy_distribution_wrapper
+    def sawtooth_numpy(length, rng):
+        """ Several ascending runs one after another, like the teeth of a saw. """
+        tooth_length = max(-(-length // SAWTOOTH_TEETH), 1)
+        index = numpy.arange(length)
+        return (index % tooth_length) * SAWTOOTH_TEETH + index // tooth_length + 1
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+This module contains the instrumentation used to count what an algorithm does, not just how long it takes.
+
+This is a library file and cannot be run directly.
+
+An instrumented array counts every comparison made between its elements, every read and every write,
+and the number of steps (passes) the algorithm takes. Runs on an instrumented array also record their peak extra memory.
+Only runs given an instrumented array pay for any of this, a plain list is timed and nothing else.
+Counting (and tracing memory) makes a run many times slower, so compare the counts of instrumented runs, not their times.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import time
+import tracemalloc
+
+from modules.sorting_algorithms import PASS
+import modules.step_scheduler as step_scheduler
+from modules.tracked_array import TrackedArray
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+class Counters:
+    """Counters class holding the counts of one run of an algorithm."""
+    __slots__ = ("comparisons", "reads", "writes", "passes") # Fixed attributes make every increment a little faster.
+
+    def __init__(self) -> None:
+        """Initialise every count to zero."""
+        self.comparisons, self.reads, self.writes, self.passes = 0, 0, 0, 0
+
+    def as_dict(self):
+        """Get the counts as a dictionary.
+
+        Returns:
+            dict: The counts, keyed by name.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _CountedValue:
+    """An element read from an instrumented array, it counts every comparison it is part of."""
+    __slots__ = ("value", "counters")
+
+    def __init__(self, value, counters) -> None:
+        self.value, self.counters = value, counters
+
+    # Every comparison counts once, then compares the real values (Unwrapping the other side if it is counted too).
+    def __lt__(self, other):
+        self.counters.comparisons += 1
+        return self.value < (other.value if type(other) is _CountedValue else other)
+
+    def __le__(self, other):
+        self.counters.comparisons += 1
+        return self.value <= (other.value if type(other) is _CountedValue else other)
+
+    def __gt__(self, other):
+        self.counters.comparisons += 1
+        return self.value > (other.value if type(other) is _CountedValue else other)
+
+    def __ge__(self, other):
+        self.counters.comparisons += 1
+        return self.value >= (other.value if type(other) is _CountedValue else other)
+
+    def __eq__(self, other):
+        self.counters.comparisons += 1
+        return self.value == (other.value if type(other) is _CountedValue else other)
+
+    def __ne__(self, other):
+        self.counters.comparisons += 1
+        return self.value != (other.value if type(other) is _CountedValue else other)
+
+    __hash__ = None # Counted values are only ever compared, never used as dictionary keys.
+
+    def __index__(self):
+        return self.value.__index__() # Lets a counted integer be stored in a compact array (e.g. the operation log), uncounted.
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+def _count_passes(steps, counters):
+    """Pass on every operation record of a running algorithm, counting the passes.
+
+    Every algorithm yields a PASS record at the end of each pass, so counting those counts the passes.
+
+    Args:
+        steps (generator): The running algorithm.
+        counters (Counters): The counts of the run.
+    """
+    for record in steps:
+        if record[0] == PASS: counters.passes += 1 # Count the pass.
+        yield record
+
+
+class InstrumentedArray(list):
+    """A list that counts the reads, writes and comparisons made on it.
+
+    Reading an element hands out a counted wrapper of it, writing unwraps it again, so the list itself only ever holds the real values.
+    Slices and iteration hand out the real values (Iteration still counts one read per element), they are used to copy
+    the array or do arithmetic on its elements rather than to compare them.
+    """
+
+    def __init__(self, *args) -> None:
+        """Initialise the instrumented array, taking the same arguments as list()."""
+        super().__init__(*args)
+        self.counters = Counters() # The counts of the current run.
+
+    def __getitem__(self, index, _list_getitem=list.__getitem__):
+        """Read from the array, counting the read.
+
+        Args:
+            index (int or slice): The index (or slice) to read.
+        """
+        # (list.__getitem__ is stored as a default argument, it is looked up once rather than on every read.)
+        if type(index) is slice: return _list_getitem(self, index) # Slices are plain copies.
+        counters = self.counters
+        counters.reads += 1
+        return _CountedValue(_list_getitem(self, index), counters)
+
+    def __iter__(self):
+        """Iterate over the array, counting one read for every element."""
+        self.counters.reads += len(self)
+        return super().__iter__()
+
+    def __setitem__(self, index, value):
+        """Write to the array, counting the write.
+
+        Args:
+            index (int or slice): The index (or slice) to write to.
+            value: The value (or values) to write.
+        """
+        if isinstance(index, slice): # A slice write counts one write for every element written.
+            value = [item.value if type(item) is _CountedValue else item for item in value]
+            self.counters.writes += len(value)
+        else:
+            value = value.value if type(value) is _CountedValue else value
+            self.counters.writes += 1
+        super().__setitem__(index, value)
+
+
+class TrackedInstrumentedArray(InstrumentedArray, TrackedArray):
+    """An instrumented array that also records where it was written to, for when a window is drawing it."""
+    pass
+
+
+def instrument_array(array, track_writes=False):
+    """Wrap an array so the engine can count (and optionally track) what an algorithm does to it.
+
+    Args:
+        array (list): The array to be wrapped.
+        track_writes (bool, optional): Whether to also record which indexes are written to. Defaults to False.
+
+    Returns:
+        InstrumentedArray: A copy of the array that counts its reads, writes and comparisons.
+    """
+    return TrackedInstrumentedArray(array) if track_writes else InstrumentedArray(array)
+
+
+def measure_run(func, sorting_array, scheduler=None, operation_log=None, trace_memory=True):
+    """Run an algorithm once, timing it and, for an instrumented array, counting what it did.
+
+    Args:
+        func (function): The algorithm to be run.
+        sorting_array (array): The array to be sorted.
+        scheduler (step_scheduler.StepScheduler, optional): Runs the steps of the algorithm at its rate.
+            Defaults to None (Run the algorithm's fast path, with no steps).
+        operation_log (operation_log.OperationLog, optional): Records every change the algorithm makes, needs a scheduler. Defaults to None.
+        trace_memory (bool, optional): Whether to measure the peak memory of an instrumented run. Defaults to True.
+            tracemalloc traces every thread of the process, so this should be False while a window is open, or the memory the window
+            (and the thread publishing its snapshots) allocates during the run would be counted as the algorithm's.
+
+    Returns:
+        dict: "time_ns" (the run time in nanoseconds), then "comparisons", "reads", "writes", "passes" and
+            "peak_memory" (peak bytes allocated by the run) which are all None when the array is not instrumented
+            (peak_memory is also None when trace_memory is False).
+    """
+    if not isinstance(sorting_array, InstrumentedArray): # Uninstrumented, only the run time is measured.
+        run = step_scheduler.fast_path(func) if scheduler is None else lambda array: scheduler.run(func(array), operation_log)
+        start_time = time.perf_counter_ns()
+        run(sorting_array)
+        return {"time_ns": time.perf_counter_ns() - start_time, "comparisons": None, "reads": None, "writes": None, "passes": None, "peak_memory": None}
+
+    sorting_array.counters = counters = Counters() # Start counting from zero.
+    started_tracing = trace_memory and not tracemalloc.is_tracing() # Memory is traced from here, unless something else is already tracing it.
+    if started_tracing: tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0] # The memory in use before the run, so only the extra memory is recorded.
+
+    start_time = time.perf_counter_ns()
+    (scheduler or step_scheduler.StepScheduler()).run(_count_passes(func(sorting_array), counters), operation_log) # Every step is run to be counted.
+    time_ns = time.perf_counter_ns() - start_time
+
+    peak_memory = tracemalloc.get_traced_memory()[1] - memory_before if trace_memory else None
+    if started_tracing: tracemalloc.stop()
+    return {"time_ns": time_ns, **counters.as_dict(), "peak_memory": peak_memory}
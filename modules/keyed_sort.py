@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+"""
+This file contains key sorting, which lets every registered algorithm sort records (tuples, dictionaries, strings...) by a key, or largest first.
+
+This is a library file and cannot be run directly.
+
+The algorithms only ever compare elements with < and >, so to sort by a key each element is decorated with its key,
+the decorated elements are sorted, then the decorations are removed again (decorate-sort-undecorate):
+
+    - The key of every element is worked out once, before the sort, not again on every comparison.
+    - Each decoration holds the element's key and its index, never the element itself, so the algorithm only moves small values
+      and the records are moved once at the end (by reference, with no copies of the records themselves).
+    - Every decoration is one whole number, rank * length + index, so the decorated array is a plain array of whole numbers
+      below 2^63 that every algorithm can sort (radix, NumPy and parallel algorithms included).
+    - The rank of a whole number key is how far it is above the smallest key, when the packed numbers fit in 64 bits.
+      Any other key (e.g. strings, tuples of several fields, or whole numbers too far apart) is ranked by sorting the keys once first,
+      equal keys sharing a rank, so the ranks go from 0 up to the number of different keys.
+    - Equal keys are ordered by their index, so the order of equal elements is always kept (every algorithm becomes stable).
+    - Largest first (reverse) turns the ranks around (largest rank - rank), the indexes still go up,
+      so equal elements keep their order just like Python's own sorted(reverse=True).
+
+Columns (several arrays of the same length, one value of each record per array) are sorted by finding the order of the records
+(the permutation of the indexes) and then moving each column into that order, without building any records at all.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+from modules.sorting_algorithms import SWAP, WRITE, WRITE_RANGE, timsort
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+def last_digit(value):
+    """ Key: the last digit of a whole number. """
+    return value % 10
+
+
+def digit_sum(value):
+    """ Key: the sum of the digits of a whole number. """
+    return sum(map(int, str(abs(value))))
+
+
+KEYS = {"last_digit": last_digit, "digit_sum": digit_sum} # The keys that can be chosen from the command line, by name.
+DECORATION_LIMIT = 2**63 # Every decoration is below this, so it fits in a 64-bit integer (NumPy arrays, parallel workers...).
+
+
+class _Descending:
+    """Descending class that wraps a key so it compares the other way around, used to sort a key largest first inside a tuple."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key) -> None:
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __gt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return other.key <= self.key
+
+    def __ge__(self, other):
+        return self.key <= other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key) # Equal keys have equal hashes, so a wrapped key can be counted in a set (e.g. by adaptive_sort.probe()).
+
+    def __repr__(self):
+        return f"_Descending({self.key!r})"
+
+
+def _ranks(keys):
+    """Rank every key, the smallest key ranked 0 and each larger key one more than the key before it (Equal keys share a rank).
+
+    Args:
+        keys (list): The keys to be ranked, anything that can be compared with <.
+
+    Returns:
+        list: The rank of every key, in the order of the keys.
+    """
+    ranks = [0] * len(keys)
+    order = sorted(range(len(keys)), key=keys.__getitem__) # The keys are sorted once, only to find their ranks.
+    for previous, index in zip(order, order[1:]):
+        ranks[index] = ranks[previous] + (keys[previous] < keys[index]) # (True counts as 1, so only a larger key moves up a rank.)
+    return ranks
+
+
+def decorate(keys, reverse=False):
+    """Decorate each key with its index, so the decorations sort into the order of the keys.
+
+    Args:
+        keys (list): The key of every element, in the order of the elements.
+        reverse (bool, optional): Whether the largest key should come first. Defaults to False.
+
+    Returns:
+        list: The decorations, whole numbers from 0 up to (but not including) DECORATION_LIMIT.
+    """
+    length = len(keys)
+    if not length: return []
+    if set(map(type, keys)) == {int} and (max(keys) - min(keys) + 1) * length <= DECORATION_LIMIT:
+        ranks = keys # Whole numbers close enough together are ranked by themselves, without sorting them first.
+    else:
+        ranks = _ranks(keys)
+    if reverse:
+        largest = max(ranks)
+        return [(largest - rank) * length + index for index, rank in enumerate(ranks)]
+    smallest = min(ranks)
+    return [(rank - smallest) * length + index for index, rank in enumerate(ranks)]
+
+
+def undecorate(decorations, length):
+    """Get the index of the element each decoration belongs to.
+
+    Args:
+        decorations (iterable): The decorations, see decorate().
+        length (int): The number of elements.
+
+    Returns:
+        list: The index of each decoration's element.
+    """
+    return [decoration % length for decoration in decorations]
+
+
+def argsort(keys, algorithm=timsort, reverse=False):
+    """Find the order that sorts a list of keys, without moving anything.
+
+    Args:
+        keys (iterable): The keys to be sorted.
+        algorithm (function, optional): The registered algorithm to sort with. Defaults to timsort.
+        reverse (bool, optional): Whether the largest key should come first. Defaults to False.
+
+    Returns:
+        list: The indexes of the keys in sorted order (Equal keys keep their order).
+    """
+    import modules.step_scheduler as step_scheduler # (Imported when a sort runs, the script's help only needs the names of the keys.)
+    decorations = decorate(list(keys), reverse)
+    step_scheduler.fast_path(algorithm)(decorations)
+    return undecorate(decorations, len(decorations))
+
+
+def _reorder(array, order):
+    """Move the elements of an array into an order, in place.
+
+    Args:
+        array (array): A list, array.array or NumPy array.
+        order (list): The index of the element that goes in each position.
+    """
+    if hasattr(array, "tolist") and not hasattr(array, "typecode"): # A NumPy array moves every element at once.
+        array[:] = array[order]
+    elif hasattr(array, "typecode"): # An array.array needs an array of the same type.
+        array[:] = type(array)(array.typecode, [array[index] for index in order])
+    else:
+        array[:] = [array[index] for index in order]
+
+
+def sort(records, algorithm=timsort, key=None, reverse=False):
+    """Sort records in place by a key, like list.sort() but with any registered algorithm.
+
+    Args:
+        records (array): The records to be sorted (A list, array.array or NumPy array).
+        algorithm (function, optional): The registered algorithm to sort with. Defaults to timsort.
+        key (function, optional): Gets the key of a record, called once per record. Defaults to None (The records themselves).
+        reverse (bool, optional): Whether the largest key should come first. Defaults to False.
+    """
+    values = records.tolist() if hasattr(records, "tolist") else list(records)
+    _reorder(records, argsort(values if key is None else map(key, values), algorithm, reverse))
+
+
+def sort_columns(columns, by, algorithm=timsort, descending=()):
+    """Sort columns of records (one array per field, all the same length) by some of the columns, in place.
+
+    Args:
+        columns (dict): The columns, keyed by name.
+        by (list): The names of the columns to sort by, most important first.
+        algorithm (function, optional): The registered algorithm to sort with. Defaults to timsort.
+        descending (iterable, optional): The names of the columns in by to sort largest first. Defaults to () (All smallest first).
+
+    Returns:
+        list: The order the records were moved into (The index each record was at before the sort).
+    """
+    descending = set(descending)
+    key_columns = [columns[name].tolist() if hasattr(columns[name], "tolist") else list(columns[name]) for name in by]
+    if len(by) == 1: # One column is its own key.
+        order = argsort(key_columns[0], algorithm, by[0] in descending)
+    else: # Several columns are compared as a tuple of each record's values, flipping the descending ones.
+        key_columns = [[_Descending(value) for value in column] if name in descending else column for name, column in zip(by, key_columns)]
+        order = argsort(zip(*key_columns), algorithm)
+    for column in columns.values():
+        _reorder(column, order)
+    return order
+
+
+def keyed(func, key=None, reverse=False):
+    """Get an algorithm that sorts the array by a key (or largest first), for the engine to run like any other algorithm.
+
+    The algorithm sorts the decorations, and every change it makes is made to the array too (with the element the decoration belongs to),
+    so the window shows the array itself being sorted.
+
+    Args:
+        func (function): The registered algorithm to sort with.
+        key (function, optional): Gets the key of an element, called once per element. Defaults to None (The elements themselves).
+        reverse (bool, optional): Whether the largest key should come first. Defaults to False.
+
+    Returns:
+        function: A generator function taking (sorting_array), named after the algorithm with the key and "_reversed" added.
+    """
+    import modules.instrumentation as instrumentation # (Imported when a sort runs, the script's help only needs the names of the keys.)
+
+    def _elements(sorting_array):
+        """Copy the elements of the array (list's own slice, so an instrumented array does not count the copy)."""
+        return list.__getitem__(sorting_array, slice(None)) if isinstance(sorting_array, list) else sorting_array.tolist()
+
+    def _keyed(sorting_array):
+        elements = _elements(sorting_array)
+        length = len(elements)
+        decorations = decorate(elements if key is None else list(map(key, elements)), reverse)
+        write = sorting_array.__setitem__
+        if isinstance(sorting_array, instrumentation.InstrumentedArray):
+            # Count the comparisons made on the decorations, and copy the changes into the array without counting them a second time.
+            decorations = instrumentation.instrument_array(decorations)
+            decorations.counters = sorting_array.counters
+            write = super(instrumentation.InstrumentedArray, sorting_array).__setitem__
+
+        def _element(decoration):
+            return elements[decoration % length]
+
+        for record in func(decorations):
+            code = record[0]
+            if code == SWAP:
+                first, second = record[1], record[2]
+                moved_first, moved_second = _element(list.__getitem__(decorations, first)), _element(list.__getitem__(decorations, second))
+                write(first, moved_first)
+                write(second, moved_second)
+            elif code == WRITE: # The record is passed on with the element written, rather than its decoration.
+                record = WRITE, record[1], _element(list.__getitem__(decorations, record[1])) # (The decoration written, read without counting it.)
+                write(record[1], record[2])
+            elif code == WRITE_RANGE:
+                write(slice(record[1], record[2]), [_element(decoration) for decoration in list.__getitem__(decorations, slice(record[1], record[2]))])
+            yield record # (Comparisons and passes are passed on as they are.)
+
+    def _fast(sorting_array):
+        """The fast path: sort the decorations in one go, then move the elements into their order once."""
+        elements = _elements(sorting_array)
+        sorting_array[:] = [elements[index] for index in argsort(elements if key is None else map(key, elements), func, reverse)]
+
+    _keyed.__name__ = func.__name__ + (f"_by_{key.__name__}" if key is not None else "") + ("_reversed" if reverse else "")
+    _keyed.__fast_path__ = _fast # The fast path cannot be compiled from _keyed (It is built at run time), so it is given its own.
+    return _keyed
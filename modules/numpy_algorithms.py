@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""
+This file contains the NumPy versions of the sorting algorithms.
+
+This is a library file and cannot be run directly.
+
+NumPy is optional, if it is not installed none of these algorithms are registered and the rest of the script works as normal.
+Every algorithm here works on both NumPy arrays (sorted in place) and plain lists (copied into an array and copied back).
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+
+import functools
+import importlib
+import importlib.util
+
+from modules.sorting_algorithms import algorithm_wrapper, COMPARE, PASS, WRITE_RANGE
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+class _LazyModule:
+    """LazyModule class that stands in for a module, only importing it the first time one of its attributes is used.
+
+    Importing NumPy takes longer than starting the rest of the script, so scripts that never use it (e.g. printing the help, or sorting a list)
+    should not wait for it.
+    """
+
+    def __init__(self, name) -> None:
+        self._name = name # The name of the module to import.
+
+    def __getattr__(self, attribute): # Only called for attributes that have not been copied onto this object yet.
+        value = getattr(importlib.import_module(self._name), attribute)
+        setattr(self, attribute, value) # Copy the attribute onto this object, so every later use is a plain attribute lookup.
+        return value
+
+
+# NumPy is an optional dependency, so check whether it is installed (without importing it), and if it is not, remember that rather than crashing.
+numpy = _LazyModule("numpy") if importlib.util.find_spec("numpy") is not None else None
+
+
+QUICK_SORT_CUTOFF = 16 # Partitions this small are sorted directly, the overhead of vectorizing them costs more than it saves.
+
+
+def array_dtype(largest_value):
+    """Get the smallest integer type that can hold every value of an array.
+
+    Args:
+        largest_value (int): The largest value in the array (For the arrays the engine creates, the length of the array).
+
+    Returns:
+        numpy.dtype: int32 when the values fit in 32 bits, int64 otherwise.
+    """
+    return numpy.int32 if largest_value < 2**31 else numpy.int64
+
+
+def _numpy_algorithm(func):
+    """Decorator that lets a NumPy algorithm be given a plain list as well as an array.
+
+    Args:
+        func (function): The algorithm, which sorts a NumPy array in place.
+
+    Returns:
+        function: The algorithm taking (sorting_array) and yielding its steps like every other algorithm.
+    """
+    @functools.wraps(func) # Keep the name of the algorithm, it is used as the algorithm type and display name.
+    def _wrapper(sorting_array):
+        if isinstance(sorting_array, numpy.ndarray): # If the array is already a NumPy array, sort it in place.
+            yield from func(sorting_array)
+            return
+        array = numpy.array(sorting_array) # Copy the list into a contiguous array.
+        for record in func(array): # Pass on the comparisons and passes, the changes are made to the copy, not the list.
+            if record[0] in (COMPARE, PASS): yield record
+        sorting_array[:] = array.tolist() # Copy the sorted values back into the list.
+        yield WRITE_RANGE, 0, len(sorting_array)
+    _wrapper.__requires__ = ("numpy",) # NumPy is only imported when it is first used, so have it imported before the algorithm is timed (see step_scheduler.fast_path()).
+    return _wrapper
+
+
+def _largest_value(dtype):
+    """Get the largest value an array type can hold (Infinity for floating point types), used to pad an array.
+
+    Args:
+        dtype (numpy.dtype): The type of the array.
+
+    Returns:
+        The largest value.
+    """
+    return numpy.inf if numpy.issubdtype(dtype, numpy.floating) else numpy.iinfo(dtype).max
+
+
+def _compare_exchange(rows, first_row):
+    """Compare every other pair of neighbouring rows (first_row with the row below it, then two rows down...), swapping each column
+    where the upper value is larger, every pair at once.
+
+    Args:
+        rows (numpy.ndarray): The array laid out as rows, changed in place.
+        first_row (int): The upper row of the first pair, 0 or 1.
+
+    Returns:
+        bool: Whether any values were swapped.
+    """
+    upper, lower = rows[first_row:-1:2], rows[first_row + 1::2] # Views of the upper and lower row of every pair (Not copies).
+    if not (upper > lower).any(): return False # Every pair is already in order.
+    upper_values = upper.copy() # The upper values are overwritten with the smaller values first, so they are kept for the larger ones.
+    numpy.minimum(upper, lower, out=upper)
+    numpy.maximum(upper_values, lower, out=lower)
+    return True
+
+
+def _gap_pass(array, gap, until_sorted):
+    """Compare and swap every pair of elements gap apart, all at once.
+
+    The array is laid out as rows of width gap, so the elements gap apart (index i, i+gap, i+2*gap, ...) are the columns,
+    and each element is compared with the one below it. The pairs cannot all be compared at once (most elements are in two pairs),
+    so the pairs starting on even rows are compared together, then those starting on odd rows.
+
+    Args:
+        array (numpy.ndarray): The array to be sorted in place.
+        gap (int): The distance between the elements compared.
+        until_sorted (bool): Whether to repeat the pass until nothing is swapped, which leaves every column (chain) sorted.
+            Otherwise each pair is compared once.
+    """
+    length = len(array)
+    rows = -(-length // gap) # The number of rows needed to fit the array (Division rounded up).
+    # Pad the last row with the largest possible value, so padding always stays at the bottom of its column (outside the array).
+    padded = numpy.full(rows * gap, _largest_value(array.dtype), dtype=array.dtype)
+    padded[:length] = array
+    table = padded.reshape(rows, gap) # A view of the padded array as rows (Not a copy).
+    while True:
+        swapped = _compare_exchange(table, 0)
+        swapped = _compare_exchange(table, 1) or swapped # (Both halves are always compared.)
+        if not (until_sorted and swapped): break
+    array[:] = padded[:length] # Copy the result back without the padding.
+
+
+if numpy is not None: # The algorithms are only registered when NumPy is installed.
+
+    @algorithm_wrapper
+    @_numpy_algorithm
+    def shell_vectorized(sorting_array):
+        """ Shell sort algorithm, with each gap pass vectorized. """
+        gap = len(sorting_array) // 2
+        while gap > 0:
+            _gap_pass(sorting_array, gap, True) # Sort every chain of elements gap apart.
+            yield WRITE_RANGE, 0, len(sorting_array)
+            yield (PASS,) # End of a pass.
+            gap //= 2
+
+    @algorithm_wrapper
+    @_numpy_algorithm
+    def comb_vectorized(sorting_array):
+        """ Comb sort algorithm, with each gap pass vectorized. """
+        gap = len(sorting_array)
+        shrink = 1.3
+        while gap > 1:
+            gap = int(gap / shrink)
+            _gap_pass(sorting_array, gap, gap == 1) # Compare each pair gap apart once, the last pass (gap 1) repeats until sorted.
+            yield WRITE_RANGE, 0, len(sorting_array)
+            yield (PASS,) # End of a pass.
+
+    @algorithm_wrapper
+    @_numpy_algorithm
+    def quick_sort_vectorized(sorting_array):
+        """ Quick sort algorithm, with each partition vectorized. """
+        partitions = [(0, len(sorting_array))] # The (start, end) of each partition left to sort, end is exclusive.
+
+        while partitions: # While there are partitions left to sort...
+            start, end = partitions.pop()
+            section = sorting_array[start:end] # A view of the partition (Not a copy, writing to it writes to the array).
+
+            if end - start <= QUICK_SORT_CUTOFF: # If the partition is small, sort it directly.
+                section.sort()
+                yield WRITE_RANGE, start, end
+                continue
+
+            # Use the median of the first, middle and last elements as the pivot, this avoids the worst case on sorted input.
+            pivot = numpy.sort(section[[0, len(section) // 2, -1]])[1]
+
+            # Split the partition into the elements less than, equal to and greater than the pivot, all at once.
+            lower, higher = section[section < pivot], section[section > pivot]
+            lower_end, higher_start = start + len(lower), end - len(higher)
+            sorting_array[start:lower_end] = lower
+            sorting_array[lower_end:higher_start] = pivot # Everything equal to the pivot is already in its final place.
+            sorting_array[higher_start:end] = higher
+
+            yield WRITE_RANGE, start, end
+            yield (PASS,) # End of a pass, one per partition.
+
+            # Push the larger side first so the smaller side is sorted first, this keeps the stack no deeper than log2(n).
+            sides = sorted([(start, lower_end), (higher_start, end)], key=lambda side: side[0] - side[1])
+            partitions.extend(sides)
+
+    # NumPy's own sorts, registered as baselines to compare the other algorithms against.
+
+    @algorithm_wrapper
+    @_numpy_algorithm
+    def numpy_quicksort(sorting_array):
+        """ NumPy's quick sort (introsort). """
+        sorting_array.sort(kind="quicksort")
+        yield WRITE_RANGE, 0, len(sorting_array)
+        yield (PASS,) # The whole sort is one pass.
+
+    @algorithm_wrapper
+    @_numpy_algorithm
+    def numpy_mergesort(sorting_array):
+        """ NumPy's merge sort. """
+        sorting_array.sort(kind="mergesort")
+        yield WRITE_RANGE, 0, len(sorting_array)
+        yield (PASS,) # The whole sort is one pass.
+
+    @algorithm_wrapper
+    @_numpy_algorithm
+    def numpy_heapsort(sorting_array):
+        """ NumPy's heap sort. """
+        sorting_array.sort(kind="heapsort")
+        yield WRITE_RANGE, 0, len(sorting_array)
+        yield (PASS,) # The whole sort is one pass.
+
+    @algorithm_wrapper
+    @_numpy_algorithm
+    def numpy_stable(sorting_array):
+        """ NumPy's stable sort (radix sort or timsort depending on the type). """
+        sorting_array.sort(kind="stable")
+        yield WRITE_RANGE, 0, len(sorting_array)
+        yield (PASS,) # The whole sort is one pass.
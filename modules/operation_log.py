@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+This module contains the operation log, a recording of every change an algorithm makes to the array.
+
+This is a library file and cannot be run directly.
+
+Only the records that change the array (SWAP, WRITE and WRITE_RANGE) are kept, packed into compact arrays rather than a list of tuples.
+Every so often a copy of the whole array (a checkpoint) is kept too, so the array at any point of the run can be rebuilt
+by copying the nearest checkpoint before it and replaying at most one checkpoint interval of changes, instead of re-running the sort.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import array
+import bisect
+
+from modules.sorting_algorithms import SWAP, WRITE, WRITE_RANGE
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+CHECKPOINT_INTERVAL = 65536 # The number of changes between each checkpoint (At least the length of the array, see OperationLog).
+
+
+class OperationLog:
+    """Operation log class that records the changes made to one array during one run."""
+
+    def __init__(self, sorting_array, checkpoint_interval=CHECKPOINT_INTERVAL) -> None:
+        """Initialise the operation log, checkpointing the array as it is before the run.
+
+        Args:
+            sorting_array (array): The array being sorted (A list or a NumPy array).
+            checkpoint_interval (int, optional): The number of changes between each checkpoint. Defaults to CHECKPOINT_INTERVAL.
+        """
+        self._array = sorting_array
+        # A checkpoint copies the whole array, so they are never closer together than the array is long (All the checkpoints together are then no bigger than the log).
+        self._interval = max(checkpoint_interval, len(sorting_array))
+        index_type = "i" if len(sorting_array) < 2**31 else "q" # Indexes are stored in 4 bytes each when they fit.
+        self._codes = array.array("B") # The code of each change (1 byte each).
+        self._firsts, self._seconds = array.array(index_type), array.array(index_type) # The indexes of each change.
+        self._values = array.array("q") # The values written by WRITE and WRITE_RANGE changes, in order (A list if they are not integers).
+        self._checkpoint_positions = [0] # The number of changes made before each checkpoint was taken.
+        self._checkpoints = [(sorting_array.copy(), 0)] # The (array copy, number of values written) at each checkpoint.
+
+    def __len__(self):
+        """Get the number of changes recorded."""
+        return len(self._codes)
+
+    def append(self, record):
+        """Record an operation, called for every record an algorithm yields (Records that do not change the array are ignored).
+
+        Args:
+            record (tuple): The operation record, see the codes in sorting_algorithms.
+        """
+        code = record[0]
+        if code == SWAP:
+            first, second = record[1], record[2]
+        elif code == WRITE:
+            first, second = record[1], 0
+            self._add_values((record[2],))
+        elif code == WRITE_RANGE: # The values written are copied from the array (The algorithm is paused at the yield, so they are up to date).
+            first, second = record[1], record[2]
+            if isinstance(self._array, list): # (list's own slice, so an instrumented array does not count the log's reads.)
+                self._add_values(list.__getitem__(self._array, slice(first, second)))
+            else:
+                self._add_values(self._array[first:second].tolist())
+        else: # Comparisons and passes do not change the array.
+            return
+
+        # The code is added last, so a reader never sees a change before all of its parts have been recorded.
+        self._firsts.append(first)
+        self._seconds.append(second)
+        self._codes.append(code)
+
+        if len(self._codes) % self._interval == 0: # Take a checkpoint every interval of changes.
+            self._checkpoints.append((self._array.copy(), len(self._values)))
+            self._checkpoint_positions.append(len(self._codes))
+
+    def _add_values(self, values):
+        """Add written values to the log.
+
+        Args:
+            values (iterable): The values written, in order.
+        """
+        values_before = len(self._values)
+        try:
+            self._values.extend(values)
+        except (TypeError, OverflowError): # The values are not 64-bit integers, so from now on they are kept in a list.
+            del self._values[values_before:] # (Remove any of the values added before the one that failed.)
+            self._values = list(self._values)
+            self._values.extend(values)
+
+    def state_at(self, position):
+        """Rebuild the array as it was after a number of changes.
+
+        Args:
+            position (int): The number of changes made, 0 is the array before the run.
+
+        Returns:
+            array: A new copy of the array at that point (A list, or a NumPy array for a NumPy run).
+        """
+        position = min(max(position, 0), len(self._codes))
+        # Start from the last checkpoint taken at or before the position.
+        checkpoint_index = bisect.bisect_right(self._checkpoint_positions, position) - 1
+        checkpoint, value_index = self._checkpoints[checkpoint_index]
+        state = checkpoint.copy()
+        codes, firsts, seconds, values = self._codes, self._firsts, self._seconds, self._values
+
+        for change in range(self._checkpoint_positions[checkpoint_index], position): # Replay every change after the checkpoint.
+            code, first, second = codes[change], firsts[change], seconds[change]
+            if code == SWAP:
+                state[first], state[second] = state[second], state[first]
+            elif code == WRITE:
+                state[first] = values[value_index]
+                value_index += 1
+            else: # WRITE_RANGE
+                state[first:second] = values[value_index:value_index + second - first]
+                value_index += second - first
+        return state
@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+"""
+This file contains the parallel sorting algorithms, which spread the work of one sort across several processes (and so several CPU cores).
+
+This is a library file and cannot be run directly.
+
+Python threads cannot run Python code at the same time, so the work is done by worker processes instead.
+Sending the array to each worker would mean copying (pickling) it every time, so the values are kept in shared memory:
+one buffer of 64-bit integers that every process maps, each worker reading and writing only its own part of it.
+Each time a worker finishes its part, that part is copied back into the array being sorted, so the window shows the sort happening.
+
+    - parallel_merge: the array is split into chunks that are sorted at the same time, then neighbouring chunks are merged in rounds.
+      Every merge is split between the workers too, by finding where each worker's share of the output starts in both halves (merge path).
+    - sample_sort: a sample of the values picks splitters that divide the values into buckets of about the same size, every value is moved
+      into its bucket, then the buckets are sorted at the same time. Once sorted, the buckets are already in order, no merging is needed.
+
+With one worker, every task is run on this process instead, so comparing against one worker measures the speedup over a single core.
+Values must be whole numbers that fit in 64 bits.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import array
+import bisect
+import concurrent.futures
+import os
+import random
+from multiprocessing import shared_memory
+
+from modules.sorting_algorithms import algorithm_wrapper, PASS, WRITE_RANGE, _merge, introsort, merge
+import modules.step_scheduler as step_scheduler
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+TASKS_PER_WORKER = 4 # Each step is split into this many tasks per worker, so a worker that finishes early can take another.
+SAMPLES_PER_BUCKET = 32 # The number of values sampled for each bucket of the sample sort, more samples give more even buckets.
+
+_workers = os.cpu_count() or 1 # The number of worker processes the algorithms use.
+_executor = None # The process pool, kept between sorts so the workers are only started once.
+
+
+def set_workers(workers):
+    """Set the number of worker processes the parallel algorithms use.
+
+    Args:
+        workers (int): The number of workers, 1 runs every task on this process.
+    """
+    global _workers, _executor
+    if workers != _workers and _executor is not None: # The pool is the wrong size, so start a new one when it is next needed.
+        _executor.shutdown()
+        _executor = None
+    _workers = workers
+
+
+def get_workers():
+    """Get the number of worker processes the parallel algorithms use.
+
+    Returns:
+        int: The number of workers.
+    """
+    return _workers
+
+
+def _get_executor():
+    """Get the process pool, starting it if it has not been started.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The pool, or None when there is one worker (Tasks are run on this process).
+    """
+    global _executor
+    if _workers == 1: return None
+    if _executor is None:
+        _executor = concurrent.futures.ProcessPoolExecutor(_workers)
+    return _executor
+
+
+class _SharedBuffers:
+    """Shared buffers class that creates shared memory for the values of an array, deleting it once the sort is finished."""
+
+    def __init__(self, sorting_array, count) -> None:
+        """Initialise the shared buffers, copying the array into the first one.
+
+        Args:
+            sorting_array (array): The array to be sorted (A list or a NumPy array).
+            count (int): The number of buffers, each the size of the array (The rest are for merging into).
+        """
+        values = array.array("q", sorting_array if isinstance(sorting_array, list) else sorting_array.tolist())
+        self._buffers = [shared_memory.SharedMemory(create=True, size=len(values) * 8) for _ in range(count)]
+        self.names = [buffer.name for buffer in self._buffers] # The workers find the buffers by name.
+        self.views = [memoryview(buffer.buf).cast("q") for buffer in self._buffers] # The buffers as 64-bit integers.
+        self.views[0][:] = values
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        for view in self.views: view.release() # The views must be released before the memory can be closed.
+        for buffer in self._buffers:
+            buffer.close()
+            buffer.unlink() # Free the memory.
+
+
+def _attach(name):
+    """Map a shared buffer created by another process.
+
+    Args:
+        name (str): The name of the buffer.
+
+    Returns:
+        shared_memory.SharedMemory: The buffer.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False) # The process that created the buffer deletes it, not this one.
+    except TypeError: # Before Python 3.13 every attached buffer is tracked, the workers share this process's tracker so it is only tracked once.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _in_worker(task, names, *arguments):
+    """Run a task on a worker process, with the shared buffers mapped. Must be at the top level of the module to be pickled.
+
+    Args:
+        task (function): The task, taking (views, *arguments).
+        names (list): The names of the shared buffers.
+        *arguments: The arguments of the task.
+
+    Returns:
+        The result of the task.
+    """
+    buffers = [_attach(name) for name in names]
+    views = [memoryview(buffer.buf).cast("q") for buffer in buffers]
+    try:
+        return task(views, *arguments)
+    finally:
+        for view in views: view.release()
+        for buffer in buffers: buffer.close()
+
+
+def _run_tasks(task, shared, task_arguments):
+    """Run tasks on the worker processes, handing each back as it finishes.
+
+    Args:
+        task (function): The task, taking (views, *arguments), at the top level of the module.
+        shared (_SharedBuffers): The shared buffers the task works on.
+        task_arguments (list): The arguments of each task.
+
+    Yields:
+        tuple: (the arguments, the result) of each task, in the order they finish.
+    """
+    executor = _get_executor()
+    if executor is None: # One worker, run every task here.
+        for arguments in task_arguments:
+            yield arguments, task(shared.views, *arguments)
+        return
+    futures = {executor.submit(_in_worker, task, shared.names, *arguments): arguments for arguments in task_arguments}
+    for future in concurrent.futures.as_completed(futures):
+        yield futures[future], future.result()
+
+
+def _even_bounds(start, end, parts):
+    """Split a section into (at most) a number of parts of about the same size.
+
+    Args:
+        start (int): The first index of the section.
+        end (int): The index after the last element of the section.
+        parts (int): The number of parts.
+
+    Returns:
+        list: The (start, end) of each part, none of them empty.
+    """
+    bounds = [start + (end - start) * part // parts for part in range(parts + 1)]
+    return [(part_start, part_end) for part_start, part_end in zip(bounds, bounds[1:]) if part_end > part_start]
+
+
+def _sort_section(views, buffer, start, end, algorithm):
+    """Task: sort a section of a shared buffer with a registered algorithm.
+
+    Args:
+        views (list): The shared buffers as 64-bit integers.
+        buffer (int): The buffer holding the section.
+        start (int): The first index of the section.
+        end (int): The index after the last element of the section.
+        algorithm (function): The registered algorithm to sort with (Its fast path).
+    """
+    values = views[buffer][start:end].tolist()
+    step_scheduler.fast_path(algorithm)(values)
+    views[buffer][start:end] = array.array("q", values)
+
+
+def _co_rank(view, start, middle, end, rank):
+    """Find how many elements of each half come before a position in the merged output (The merge path).
+
+    Args:
+        view (memoryview): The buffer holding both halves.
+        start (int): The first index of the left half.
+        middle (int): The first index of the right half.
+        end (int): The index after the last element of the right half.
+        rank (int): The position in the merged output.
+
+    Returns:
+        tuple: (the number of elements taken from the left half, the number taken from the right half).
+    """
+    low, high = max(0, rank - (end - middle)), min(rank, middle - start)
+    while low < high: # Binary search for the number taken from the left half.
+        left_taken = (low + high) // 2
+        # If this left element is not larger than the last right element taken, it must have been taken too (Ties go left, keeping the sort stable).
+        if view[start + left_taken] <= view[middle + rank - left_taken - 1]:
+            low = left_taken + 1
+        else:
+            high = left_taken
+    return low, rank - low
+
+
+def _merge_part(views, source, destination, start, middle, end, output_start, output_end):
+    """Task: merge one part of two neighbouring sorted sections of a shared buffer into another buffer.
+
+    Args:
+        views (list): The shared buffers as 64-bit integers.
+        source (int): The buffer holding the sorted sections.
+        destination (int): The buffer to write the merged part to (At the same indexes).
+        start (int): The first index of the left section.
+        middle (int): The first index of the right section.
+        end (int): The index after the last element of the right section.
+        output_start (int): The first index of the part of the merged section to write.
+        output_end (int): The index after the last element of the part.
+    """
+    view = views[source]
+    left_start, right_start = _co_rank(view, start, middle, end, output_start - start)
+    left_end, right_end = _co_rank(view, start, middle, end, output_end - start)
+    left = view[start + left_start:start + left_end].tolist()
+    values = left + view[middle + right_start:middle + right_end].tolist()
+    step_scheduler.fast_path(_merge)(values, 0, len(left), len(values))
+    views[destination][output_start:output_end] = array.array("q", values)
+
+
+def _count_buckets(views, start, end, splitters):
+    """Task: count how many values of a section of the first buffer belong in each bucket.
+
+    Args:
+        views (list): The shared buffers as 64-bit integers.
+        start (int): The first index of the section.
+        end (int): The index after the last element of the section.
+        splitters (list): The sorted values that divide the buckets.
+
+    Returns:
+        list: The number of values in each bucket.
+    """
+    counts = [0] * (len(splitters) + 1)
+    for value in views[0][start:end].tolist():
+        counts[bisect.bisect_right(splitters, value)] += 1 # A value equal to a splitter goes in the bucket after it.
+    return counts
+
+
+def _scatter_buckets(views, start, end, splitters, offsets):
+    """Task: copy the values of a section of the first buffer into their buckets in the second buffer.
+
+    Args:
+        views (list): The shared buffers as 64-bit integers.
+        start (int): The first index of the section.
+        end (int): The index after the last element of the section.
+        splitters (list): The sorted values that divide the buckets.
+        offsets (list): The index in the second buffer where this section's values of each bucket go.
+    """
+    buckets = [array.array("q") for _ in range(len(splitters) + 1)]
+    for value in views[0][start:end].tolist():
+        buckets[bisect.bisect_right(splitters, value)].append(value)
+    for bucket, offset in zip(buckets, offsets):
+        views[1][offset:offset + len(bucket)] = bucket
+
+
+@algorithm_wrapper
+def parallel_merge(sorting_array):
+    """ Parallel merge sort (chunks sorted by worker processes at the same time, then merged in rounds). """
+    STORED_LENGTH = len(sorting_array)
+    if STORED_LENGTH < 2: return
+    TASKS = get_workers() * TASKS_PER_WORKER
+
+    with _SharedBuffers(sorting_array, 2) as shared: # Two buffers, each round merges from one into the other.
+        # Sort every chunk at the same time.
+        sections = _even_bounds(0, STORED_LENGTH, TASKS)
+        for (_, start, end, _), _ in _run_tasks(_sort_section, shared, [(0, start, end, merge) for start, end in sections]):
+            sorting_array[start:end] = shared.views[0][start:end].tolist() # Show the sorted chunk.
+            yield WRITE_RANGE, start, end
+        yield (PASS,) # End of a pass.
+
+        source = 0
+        while len(sections) > 1: # Merge neighbouring sections in pairs until there is one left.
+            merges = [] # The (start, middle, end) of each merge (A section left without a pair is merged with nothing, copying it).
+            for pair_index in range(0, len(sections), 2):
+                start, middle = sections[pair_index]
+                end = sections[pair_index + 1][1] if pair_index + 1 < len(sections) else middle
+                merges.append((start, middle, end))
+            # Split each merge into parts of about the same size as the first chunks, so every worker has a share of even the last merge.
+            tasks = [
+                (source, 1 - source, start, middle, end, output_start, output_end)
+                for start, middle, end in merges
+                for output_start, output_end in _even_bounds(start, end, max(round((end - start) * TASKS / STORED_LENGTH), 1))
+            ]
+            for arguments, _ in _run_tasks(_merge_part, shared, tasks):
+                output_start, output_end = arguments[-2:]
+                sorting_array[output_start:output_end] = shared.views[1 - source][output_start:output_end].tolist() # Show the merged part.
+                yield WRITE_RANGE, output_start, output_end
+            yield (PASS,) # End of a pass.
+            sections, source = [(start, end) for start, _, end in merges], 1 - source
+
+
+@algorithm_wrapper
+def sample_sort(sorting_array):
+    """ Sample sort (values split into buckets by sampled splitters, then the buckets sorted by worker processes at the same time). """
+    STORED_LENGTH = len(sorting_array)
+    if STORED_LENGTH < 2: return
+    TASKS = get_workers() * TASKS_PER_WORKER
+
+    # Sample the values (The same sample for the same array length, so runs are repeatable) and pick evenly spaced splitters from it.
+    sample_indexes = random.Random(STORED_LENGTH).sample(range(STORED_LENGTH), min(STORED_LENGTH, TASKS * SAMPLES_PER_BUCKET))
+    sample = sorted(sorting_array[index] for index in sample_indexes)
+    splitters = [sample[len(sample) * bucket // TASKS] for bucket in range(1, TASKS)]
+
+    with _SharedBuffers(sorting_array, 2) as shared: # The values are moved into their buckets in the second buffer.
+        sections = _even_bounds(0, STORED_LENGTH, TASKS)
+        counts = {}
+        for (start, _, _), section_counts in _run_tasks(_count_buckets, shared, [(start, end, splitters) for start, end in sections]):
+            counts[start] = section_counts
+
+        # Work out where each section's values of each bucket go: buckets one after another, and within a bucket, sections in order.
+        offsets, bucket_bounds, position = {start: [] for start, _ in sections}, [], 0
+        for bucket in range(len(splitters) + 1):
+            bucket_start = position
+            for start, _ in sections:
+                offsets[start].append(position)
+                position += counts[start][bucket]
+            bucket_bounds.append((bucket_start, position))
+
+        for _ in _run_tasks(_scatter_buckets, shared, [(start, end, splitters, offsets[start]) for start, end in sections]):
+            pass
+        sorting_array[:] = shared.views[1].tolist() # Show the values in their buckets.
+        yield WRITE_RANGE, 0, STORED_LENGTH
+        yield (PASS,) # End of a pass.
+
+        # Sort every bucket at the same time, once sorted every value is in its final place.
+        tasks = [(1, start, end, introsort) for start, end in bucket_bounds if end - start > 1]
+        for (_, start, end, _), _ in _run_tasks(_sort_section, shared, tasks):
+            sorting_array[start:end] = shared.views[1][start:end].tolist() # Show the sorted bucket.
+            yield WRITE_RANGE, start, end
+        yield (PASS,) # End of a pass.
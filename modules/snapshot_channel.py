@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+This module contains the snapshot channel, used to hand the state of the sort from the engine to the window.
+
+This is a library file and cannot be run directly.
+
+The engine publishes a small, downsampled copy of the array (one value per bar) at a fixed rate from its own thread.
+Each snapshot is built in full before it is published by swapping a single reference, and is never changed afterwards,
+so the window can draw it without a lock, without copying the full array and without ever seeing a half written state.
+The window waits on a condition for the next version instead of spinning.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import collections
+import math
+import threading
+
+from modules.tracked_array import TrackedArray
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+DEFAULT_INTERVAL = 0.015 # The default time between snapshots in seconds (About 66 per second).
+
+# Everything the window needs to draw one frame.
+Snapshot = collections.namedtuple("Snapshot", [
+    "version", # Counts up by one with every snapshot published.
+    "array_key", # The identity of the array the values came from, it changes when the engine installs a new array.
+    "values", # One value per bar (every step-th element of the array).
+    "maximum", # The largest value in the whole array.
+    "display_name", # The name of the algorithm being run.
+    "current_time", # The time the algorithm has been running for.
+    "running", # Whether the algorithm is running or not.
+    "finished_times", # The time taken by each finished repeat.
+    "run_stats", # The measurements of each finished repeat, see instrumentation.measure_run().
+    "counters", # The counts of the run in progress, None when the array is not instrumented.
+    "paused", # Whether the algorithm is paused.
+    "position", # The number of changes into the recording being shown, None when the run is not being recorded.
+    "recorded", # The number of changes recorded so far, None when the run is not being recorded.
+    "progress", # The (phase, records done, records in total) of an external sort, None when not sorting a file.
+])
+
+
+class SnapshotChannel:
+    """Snapshot channel class, the engine publishes snapshots into it and the window takes them out."""
+
+    def __init__(self, width, interval=DEFAULT_INTERVAL) -> None:
+        """Initialise the snapshot channel.
+
+        Args:
+            width (int): The most values a snapshot should hold (The width of the window, no bar is thinner than 1px).
+            interval (float, optional): The time between snapshots in seconds. Defaults to DEFAULT_INTERVAL.
+        """
+        self._width, self._interval = width, interval
+        self._front = None # The latest published snapshot, the only one the window ever sees.
+        self._version = 0 # The version of the next snapshot to be published.
+        self._pending_dirty, self._pending_all_dirty = set(), True # The bars changed since the window last took a snapshot.
+        self._maximum_key, self._maximum = None, 1 # The array the maximum was last found for, and that maximum.
+        self._array_number = 0 # Counts up every time the engine installs a new array to be sorted, see new_array().
+        self._condition = threading.Condition() # Wakes the window when a new snapshot is published.
+
+    def new_array(self):
+        """Tell the channel the engine has installed a new array to be sorted, so its maximum is searched for again.
+
+        A new array can be given the memory address (id) of an old one that has been freed, so the address alone cannot tell them apart.
+        """
+        self._array_number += 1
+
+    def publish(self, engine):
+        """Build a snapshot of the engine's current state and publish it. Called from the engine's publishing thread.
+
+        Args:
+            engine (algorithm_engine.Algorithm): The engine to take the snapshot of.
+        """
+        array_number = self._array_number # (Read before the array, so an array installed in between is searched again next time.)
+        array = engine.display_array() # The live array, or the array rebuilt from the recording when seeking back.
+        if len(array) == 0: return # Nothing has been generated yet.
+
+        step = math.ceil(len(array) / self._width) # Every step-th element is drawn as a bar.
+        array_key = (array_number, id(array), len(array)) # A new array has a new number (And the rebuilt arrays a new memory address).
+
+        if array_key != self._maximum_key: # Sorting only moves values around, so the maximum is only searched for on a new array.
+            # An instrumented array counts the reads of iterating over it, so a list is iterated with list's own iterator, which counts nothing.
+            values = list.__iter__(array) if isinstance(array, list) else array
+            self._maximum_key, self._maximum = array_key, max(values) or 1 # (or 1 stops a division by zero on an array of zeros.)
+
+        # Collect the changes before copying the values, so a write in between is redrawn again next frame rather than missed.
+        dirty_bars = None # None means every bar should be redrawn.
+        if isinstance(array, TrackedArray):
+            all_dirty, dirty_indexes, dirty_spans = array.collect_dirty()
+            if not all_dirty:
+                # Only the written indexes that are displayed (multiples of the step) change a bar.
+                dirty_bars = {index // step for index in dirty_indexes if index % step == 0}
+                for start, end in dirty_spans: # Every displayed index in each written range (Division rounded up to the next displayed index).
+                    dirty_bars.update(range(-(-start // step), -(-end // step)))
+
+        values = array[::step] # Copy every step-th element, at most width of them.
+        if not isinstance(values, list): values = values.tolist() # A NumPy slice is a view of the array, so it is copied out.
+
+        snapshot = Snapshot(
+            self._version, array_key, values, self._maximum,
+            engine._display_name, engine.getCurrentTime(), engine._running, tuple(engine._finished_times),
+            tuple(engine.get_run_stats()), engine.get_counters(),
+            engine.is_paused(), *engine.get_position(), engine._progress,
+        )
+
+        with self._condition:
+            if dirty_bars is None: # Add the changed bars to the ones the window has not seen yet.
+                self._pending_all_dirty = True
+            else:
+                self._pending_dirty.update(dirty_bars)
+            self._front = snapshot # Publish the finished snapshot by swapping the one reference the window reads.
+            self._version += 1
+            self._condition.notify_all() # Wake the window.
+
+    def take(self):
+        """Take the latest snapshot, along with every bar changed since the last one taken.
+
+        Returns:
+            tuple: (the latest Snapshot or None, the set of changed bar positions or None when every bar should be redrawn).
+        """
+        with self._condition:
+            dirty_bars = None if self._pending_all_dirty else self._pending_dirty
+            self._pending_dirty, self._pending_all_dirty = set(), False
+            return self._front, dirty_bars
+
+    def wait(self, last_version, timeout=None):
+        """Wait until a snapshot newer than the last one drawn is published, then take it.
+
+        Args:
+            last_version (int): The version of the last snapshot drawn, -1 if none have been drawn.
+            timeout (float, optional): The longest time to wait in seconds. Defaults to None (Wait forever).
+
+        Returns:
+            tuple: See take(), the snapshot is None if nothing new was published in time.
+        """
+        with self._condition:
+            # Sleep until woken by publish() (Using no CPU), or until the timeout runs out.
+            if not self._condition.wait_for(lambda: self._front is not None and self._front.version > last_version, timeout):
+                return None, None
+        return self.take()
+
+    def run_publisher(self, engine, finished):
+        """Publish snapshots of the engine at the channel's interval until it has finished. Run on its own thread.
+
+        Args:
+            engine (algorithm_engine.Algorithm): The engine to take snapshots of.
+            finished (threading.Event): Set by the engine once every repeat has finished.
+        """
+        while not finished.wait(self._interval): # Sleep for one interval, stopping early once the engine has finished.
+            self.publish(engine)
+        self.publish(engine) # Publish the final state.
@@ -4,15 +4,15 @@ This file contains the logic/methods for the sorting algorithms.
 
 This is a library file and cannot be run directly.
 
-To add a new sorting algorithm, simply add a new function with the @algorithm_wrapper decorator taking array and delay as a parameter.
+To add a new sorting algorithm, simply add a new function with the @algorithm_wrapper decorator taking array as a parameter.
+Each algorithm is a generator, it yields an operation record (a small tuple, see below) for everything it does to the array,
+and a PASS record at the end of every pass. The engine runs one record at a time, so it can pace, pause, step through and record the sort.
+Every change made to the array must be yielded (after it is made) as a SWAP, WRITE or WRITE_RANGE record, so a recording can be replayed.
 
 Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
 """
 
 
-import time
-
-
 __author__ = "Archer Hume"
 __copyright__ = "Copyright (C) 2022 Archer Hume"
 __license__ = "MIT"
@@ -23,6 +23,13 @@ __status__ = "Development"
 
 __algorithms__ = [] # This is a list that will contain all of the algorithms.
 
+# The operation records yielded by the algorithms, each is a tuple starting with one of these codes.
+COMPARE = 0 # (COMPARE, i, j): The elements at indexes i and j are about to be compared.
+SWAP = 1 # (SWAP, i, j): The elements at indexes i and j have been swapped.
+WRITE = 2 # (WRITE, i, value): The value has been written to index i.
+WRITE_RANGE = 3 # (WRITE_RANGE, start, end): Every index from start up to (not including) end has been written to, e.g. by a slice.
+PASS = 4 # (PASS,): A pass (step) of the algorithm has finished.
+
 
 def algorithm_wrapper(func): # This is a decorator that will add the algorithm to the list of algorithms.
     """Decorator that will add the algorithm to the list of algorithms.
@@ -31,166 +38,485 @@ def algorithm_wrapper(func): # This is a decorator that will add the algorithm t
         func (function): The algorithm to be added.
     """
     __algorithms__.append(func) # Add the algorithm to the list of algorithms.
+    # Return the algorithm so its name still refers to it, this lets worker processes look it up (pickle it) by name.
+    return func
 
 
 @algorithm_wrapper # @ symbol assigns the decorator to the function.
-def selection(sorting_array, delay):
+def selection(sorting_array):
     """ Selection sort algorithm. """
     STORED_LENGTH = len(sorting_array) # Length is stored to reduce the amount of times the length is calculated (Slows down algorithm to call len() often).
     
     for array_index in range(STORED_LENGTH): # For each element in the array...
         minimum_index = array_index # Set the minimum index to the current index.
         for search_index in range(array_index + 1, STORED_LENGTH): # For each element after the current array index...
+            yield COMPARE, search_index, minimum_index # Record the comparison about to be made.
             if sorting_array[search_index] < sorting_array[minimum_index]: # If the current element is less than the current minimum...
                 minimum_index = search_index # Set the minimum index to the current index.
         # Swap the minimum index with the current index.
         sorting_array[array_index], sorting_array[minimum_index] = sorting_array[minimum_index], sorting_array[array_index]
-        # Sleep for specified delay.
-        if delay: time.sleep(delay)
+        yield SWAP, array_index, minimum_index # Record the swap that has been made.
+        yield (PASS,) # End of a pass.
 
 
 @algorithm_wrapper
-def selection_recursive(sorting_array, delay):
+def selection_recursive(sorting_array):
     """ Recursive selection sort algorithm. 
     
-    DISCLAIMER: Due to the nature of the algorithm (recursion), it becomes unstable with large arrays.        
+    The recursion is run on an explicit stack (a list of the calls still to be made) rather than Python's call stack,
+    so it works on arrays of any length instead of hitting Python's recursion limit at around 1000 elements.
     """
     STORED_LENGTH = len(sorting_array) # Length is stored to reduce the amount of times the length is calculated (Slows down algorithm to call len() often).
     
     def _sort(item_index):
-        """Nested function used to sort the array, recursive.
+        """Nested function used to sort the array, one "recursive" call.
         Args:
             item_index (int): First index of unsorted section.
+        Returns:
+            list: The calls to be made next (The arguments to call _sort with), returned once its operations have been yielded.
         """
-        # If the item index is greater than the length of the array (Out of bounds), kill function.
-        if item_index >= STORED_LENGTH: return
+        # If the item index is greater than the length of the array (Out of bounds), there are no more calls to make.
+        if item_index >= STORED_LENGTH: return []
         
         minimum_index = item_index # Set the minimum index to the current index.
         for search_index in range(item_index + 1, STORED_LENGTH): # For each element after the current array index...
+            yield COMPARE, search_index, minimum_index
             if sorting_array[search_index] < sorting_array[minimum_index]: # If the current element is less than the current minimum...
                 minimum_index = search_index # Set the minimum index to the current index.
         
         # Swap the minimum index with the current index.
         sorting_array[item_index], sorting_array[minimum_index] = sorting_array[minimum_index], sorting_array[item_index]
-        # Sleep for specified delay.
-        if delay: time.sleep(delay)
+        yield SWAP, item_index, minimum_index
+        yield (PASS,) # End of a pass.
         
-        # Recursively call the sort function with the next index.
-        _sort(item_index+1)
+        # "Recursively" call the sort function with the next index.
+        return [item_index + 1]
     
-    # Start the recursive sort function.
-    _sort(0)
+    # Start the recursive sort function, each call pushes the calls it makes onto the stack instead of making them itself.
+    call_stack = [0]
+    while call_stack: # While there are calls left to make...
+        call_stack.extend((yield from _sort(call_stack.pop()))) # (yield from passes on the call's records, then gives back what it returned.)
 
 
 @algorithm_wrapper
-def bubble(sorting_array, delay):
+def bubble(sorting_array):
     """ Bubble sorting algorithm. """
     STORED_LENGTH = len(sorting_array) # Length is stored to reduce the amount of times the length is calculated (Slows down algorithm to call len() often).
     
     for _ in sorting_array: # For each element in the array (Index not used so it is assigned to underscore)...
         for search_index in range(STORED_LENGTH - 1): # For each element after the current item index...
+            yield COMPARE, search_index, search_index + 1
             if sorting_array[search_index] > sorting_array[search_index + 1]: # If the current element is greater than the next element...
                 # Swap the current element with the next element.
                 sorting_array[search_index], sorting_array[search_index + 1] = sorting_array[search_index + 1], sorting_array[search_index]
-        # Sleep for specified delay.
-        if delay: time.sleep(delay)
+                yield SWAP, search_index, search_index + 1
+        yield (PASS,) # End of a pass.
 
 
 @algorithm_wrapper
-def quick_sort(sorting_array, delay):
-    """ Quick sort algorithm. """
+def quick_sort(sorting_array):
+    """ Quick sort algorithm. 
+    
+    Uses an explicit stack instead of recursion, always sorting the smaller side first so the stack never grows past log2(n) sections.
+    The pivot is the median of three (or for large sections the median of three medians, "ninther"),
+    and elements equal to the pivot are grouped in the middle (three-way partition), so sorted, reversed and duplicate heavy arrays stay fast.
+    """
+    NINTHER_CUTOFF = 40 # Sections larger than this use the ninther as their pivot.
     
-    def _quickSort(array, start, end):
-        """Nested function used to sort the array, recursive.
+    def _median_of_three(array, first, second, third):
+        """ Nested function used to find the index of the median of three elements, yielding each comparison.
+        Args:
+            array (array): Array to be sorted.
+            first (int): Index of the first element.
+            second (int): Index of the second element.
+            third (int): Index of the third element.
+        Returns:
+            int: Index of the median element.
+        """
+        yield COMPARE, first, second
+        if array[first] < array[second]:
+            yield COMPARE, second, third
+            if array[second] < array[third]: return second
+            yield COMPARE, first, third
+            return third if array[first] < array[third] else first
+        yield COMPARE, first, third
+        if array[first] < array[third]: return first
+        yield COMPARE, second, third
+        return third if array[second] < array[third] else second
+    
+    def _choose_pivot(array, start, end):
+        """ Nested function used to choose a good pivot for a section, yielding each comparison.
         Args:
             array (array): Array to be sorted.
             start (int): First index of unsorted section.
             end (int): Last index of unsorted section.
+        Returns:
+            int: Index of the pivot.
         """
-        if start >= end: return # If the start index is greater than or equal to the end index, kill function.
-        
-        # Set the pivot to the first element in the array.
-        pivot = partition(array, start-1, end)
-        # Run the quick sort algorithm on the left side of the pivot.
-        _quickSort(array, start, pivot - 1)
-        # Run the quick sort algorithm on the right side of the pivot.
-        _quickSort(array, pivot + 1, end)
+        middle = (start + end) // 2
+        if end - start <= NINTHER_CUTOFF: # Small sections use the median of the first, middle and last elements.
+            return (yield from _median_of_three(array, start, middle, end))
+        # Large sections use the median of the medians of three evenly spaced groups of three.
+        step = (end - start) // 8
+        first_median = yield from _median_of_three(array, start, start + step, start + 2 * step)
+        middle_median = yield from _median_of_three(array, middle - step, middle, middle + step)
+        last_median = yield from _median_of_three(array, end - 2 * step, end - step, end)
+        return (yield from _median_of_three(array, first_median, middle_median, last_median))
     
     def partition(array, start, end):
-        """ Nested function used to partition & sort the array.
+        """ Nested function used to partition & sort the array into three parts (Dijkstra's "Dutch national flag").
         Args:
             array (array): Array to be sorted.
             start (int): First index of unsorted section.
             end (int): Last index of unsorted section.
         Returns:
-            int: Index of the pivot.
+            tuple: First and last index of the elements equal to the pivot.
         """
+        pivot_index = yield from _choose_pivot(array, start, end)
+        pivot = array[pivot_index] # Set the pivot.
         
-        pivot = array[end] # Set the pivot to the last element in the array.
-        
-        for search_index in range(start+1, end): # For each element in the array (between start and end)...
-            if array[search_index] <= pivot: # If the current element is less than or equal to the pivot...
-                start += 1 # Increment the start index.
-                array[start], array[search_index] = array[search_index], array[start] # Swap the current element with the index.
-            # Sleep for specified delay.
-            if delay: time.sleep(delay)
-        
-        # Swap the pivot with the index.
-        array[start+1], array[end] = array[end], array[start+1]
-        
-        # Sleep for specified delay.
-        if delay: time.sleep(delay)
+        # Everything before lower is less than the pivot, everything after upper is greater than it.
+        lower, search_index, upper = start, start, end
+        while search_index <= upper: # For each element not yet placed...
+            yield COMPARE, search_index, pivot_index # (The pivot may have been moved since, the records only need to show roughly where it is.)
+            if array[search_index] < pivot: # If the current element is less than the pivot, swap it into the lower part.
+                array[lower], array[search_index] = array[search_index], array[lower]
+                yield SWAP, lower, search_index
+                lower += 1
+                search_index += 1
+            elif array[search_index] > pivot: # If the current element is greater than the pivot, swap it into the upper part.
+                array[upper], array[search_index] = array[search_index], array[upper]
+                yield SWAP, upper, search_index
+                upper -= 1
+            else: # If the current element is equal to the pivot, leave it in the middle.
+                search_index += 1
+        yield (PASS,) # End of a pass, one per partition.
         
-        # Return the index of the pivot.
-        return start + 1
+        # Return the section of elements equal to the pivot, they are already in their final place.
+        return lower, upper
     
-    # Start the recursive sort function.
-    _quickSort(sorting_array, 0, len(sorting_array) - 1)
+    sections = [(0, len(sorting_array) - 1)] # The stack of (start, end) sections left to sort.
+    while sections: # While there are sections left to sort...
+        start, end = sections.pop()
+        while start < end: # While the section has more than one element...
+            lower, upper = yield from partition(sorting_array, start, end) # Partition the section, passing on its records.
+            # Push the larger side onto the stack for later and carry on sorting the smaller side.
+            if lower - start < end - upper:
+                sections.append((upper + 1, end))
+                end = lower - 1
+            else:
+                sections.append((start, lower - 1))
+                start = upper + 1
+
+
+def _gapped_insertion(sorting_array, start, end, gap):
+    """Insertion sort every chain of elements gap apart in a section of the array.
+
+    Args:
+        sorting_array (array): Array to be sorted.
+        start (int): First index of the section.
+        end (int): Index after the last element of the section.
+        gap (int): The distance between the elements of each chain (1 is a plain insertion sort).
+    """
+    for array_index in range(start + gap, end): # For each element after the first of its chain...
+        key = sorting_array[array_index]
+        temp_index = array_index - gap
+        while temp_index >= start: # Shift every larger element of the chain one place (gap) right.
+            yield COMPARE, temp_index, array_index # (The element being inserted was taken from array_index.)
+            shifted = sorting_array[temp_index]
+            if not shifted > key: break # Stop at the first element that is not larger.
+            sorting_array[temp_index + gap] = shifted
+            yield WRITE, temp_index + gap, shifted
+            temp_index -= gap
+        sorting_array[temp_index + gap] = key # Insert the element into the gap.
+        yield WRITE, temp_index + gap, key
+        yield (PASS,) # End of a pass, one per element inserted.
 
 
 @algorithm_wrapper
-def insertion(sorting_array, delay):
+def insertion(sorting_array):
     """ Insertion sort algorithm. """
-    STORED_LENGTH = len(sorting_array)
-    for array_index in range(1,STORED_LENGTH):
-        key = sorting_array[array_index]
-        temp_index = array_index - 1
-        while temp_index >= 0 and sorting_array[temp_index] > key:
-            sorting_array[temp_index + 1] = sorting_array[temp_index]
-            temp_index -= 1
-        sorting_array[temp_index + 1] = key
+    yield from _gapped_insertion(sorting_array, 0, len(sorting_array), 1)
 
 @algorithm_wrapper
-def shell(sorting_array, delay):
+def shell(sorting_array):
     """ Shell sort algorithm. """
     STORED_LENGTH = len(sorting_array)
     gap = STORED_LENGTH // 2
     while gap > 0:
-        for array_index in range(gap, STORED_LENGTH):
-            key = sorting_array[array_index]
-            temp_index = array_index - gap
-            while temp_index >= 0 and sorting_array[temp_index] > key:
-                sorting_array[temp_index + gap] = sorting_array[temp_index]
-                temp_index -= gap
-            sorting_array[temp_index + gap] = key
-            # Sleep for specified delay.
-            if delay: time.sleep(delay)
+        yield from _gapped_insertion(sorting_array, 0, STORED_LENGTH, gap)
         gap //= 2
 
 @algorithm_wrapper
-def comb(sorting_array, delay):
+def comb(sorting_array):
     """ Comb sort algorithm. """
     STORED_LENGTH = len(sorting_array)
     gap = STORED_LENGTH
     shrink = 1.3
     while gap > 1:
         gap = int(gap / shrink)
-        for array_index in range(gap, STORED_LENGTH):
-            key = sorting_array[array_index]
-            temp_index = array_index - gap
-            while temp_index >= 0 and sorting_array[temp_index] > key:
-                sorting_array[temp_index + gap] = sorting_array[temp_index]
-                temp_index -= gap
-            sorting_array[temp_index + gap] = key
-            # Sleep for specified delay.
-            if delay: time.sleep(delay)
\ No newline at end of file
+        yield from _gapped_insertion(sorting_array, 0, STORED_LENGTH, gap)
+
+def _insertion_range(sorting_array, start, end):
+    """Insertion sort a section of the array, used by the hybrid algorithms for small sections.
+
+    Args:
+        sorting_array (array): Array to be sorted.
+        start (int): First index of the section.
+        end (int): Index after the last element of the section.
+    """
+    yield from _gapped_insertion(sorting_array, start, end, 1)
+
+
+def _merge(sorting_array, start, middle, end):
+    """Merge two sorted, neighbouring sections of the array into one sorted section.
+
+    Args:
+        sorting_array (array): Array to be sorted.
+        start (int): First index of the left section.
+        middle (int): First index of the right section.
+        end (int): Index after the last element of the right section.
+    """
+    left = list(sorting_array[start:middle]) # Copy the left section, the merged result is written over it.
+    left_index, right_index, write_index = 0, middle, start
+    LEFT_LENGTH = len(left)
+    
+    while left_index < LEFT_LENGTH and right_index < end: # While both sections have elements left...
+        yield COMPARE, right_index, write_index # (The left element is held in the copy, so the index it will be written to is used.)
+        if sorting_array[right_index] < left[left_index]: # Take from the right only when strictly smaller, this keeps the sort stable.
+            value = sorting_array[right_index]
+            right_index += 1
+        else:
+            value = left[left_index]
+            left_index += 1
+        sorting_array[write_index] = value
+        yield WRITE, write_index, value
+        write_index += 1
+    
+    # Copy whatever is left of the left section (Anything left of the right section is already in place).
+    sorting_array[write_index:write_index + LEFT_LENGTH - left_index] = left[left_index:]
+    yield WRITE_RANGE, write_index, write_index + LEFT_LENGTH - left_index
+
+
+def _sift_down(sorting_array, offset, root, end):
+    """Move an element down a max heap until both of its children are smaller than it.
+
+    Args:
+        sorting_array (array): Array holding the heap.
+        offset (int): Index of the first element of the heap in the array.
+        root (int): Position in the heap of the element to be moved down.
+        end (int): Size of the heap.
+    """
+    while True:
+        child = 2 * root + 1 # The left child of the root.
+        if child >= end: return # If the root has no children, it is in place.
+        # Use the larger of the two children.
+        if child + 1 < end:
+            yield COMPARE, offset + child, offset + child + 1
+            if sorting_array[offset + child] < sorting_array[offset + child + 1]:
+                child += 1
+        yield COMPARE, offset + root, offset + child
+        if sorting_array[offset + root] >= sorting_array[offset + child]: return # If the root is larger than both children, it is in place.
+        # Swap the root with its larger child and carry on down the heap.
+        sorting_array[offset + root], sorting_array[offset + child] = sorting_array[offset + child], sorting_array[offset + root]
+        yield SWAP, offset + root, offset + child
+        root = child
+
+
+def _heap_range(sorting_array, start, end):
+    """Heap sort a section of the array.
+
+    Args:
+        sorting_array (array): Array to be sorted.
+        start (int): First index of the section.
+        end (int): Index after the last element of the section.
+    """
+    SECTION_LENGTH = end - start
+    
+    for root in range(SECTION_LENGTH // 2 - 1, -1, -1): # Turn the section into a max heap, from the last parent up to the top.
+        yield from _sift_down(sorting_array, start, root, SECTION_LENGTH)
+    
+    for heap_end in range(SECTION_LENGTH - 1, 0, -1): # For each element, from the back of the section...
+        # Swap the largest element (top of the heap) to the back, then shrink the heap and restore it.
+        sorting_array[start], sorting_array[start + heap_end] = sorting_array[start + heap_end], sorting_array[start]
+        yield SWAP, start, start + heap_end
+        yield from _sift_down(sorting_array, start, 0, heap_end)
+        yield (PASS,) # End of a pass.
+
+
+@algorithm_wrapper
+def merge(sorting_array):
+    """ Bottom-up merge sort algorithm. """
+    STORED_LENGTH = len(sorting_array)
+    width = 1 # The width of the sorted sections to be merged, starting with single elements.
+    
+    while width < STORED_LENGTH: # While the sorted sections do not cover the whole array...
+        for start in range(0, STORED_LENGTH - width, 2 * width): # For each pair of neighbouring sections...
+            yield from _merge(sorting_array, start, start + width, min(start + 2 * width, STORED_LENGTH))
+            yield (PASS,) # End of a pass.
+        width *= 2 # The merged sections are twice as wide.
+
+
+@algorithm_wrapper
+def heap(sorting_array):
+    """ Heap sort algorithm. """
+    yield from _heap_range(sorting_array, 0, len(sorting_array))
+
+
+@algorithm_wrapper
+def timsort(sorting_array):
+    """ Timsort algorithm (natural runs and a merge stack, without galloping). """
+    STORED_LENGTH = len(sorting_array)
+    
+    # Work out the minimum run length, between 32 and 64, so the number of runs is (close to) a power of two.
+    minimum_run, remaining_length, extra_bit = STORED_LENGTH, STORED_LENGTH, 0
+    while remaining_length >= 64:
+        extra_bit |= remaining_length & 1
+        remaining_length >>= 1
+    minimum_run = remaining_length + extra_bit
+    
+    runs = [] # The stack of (start, length) of each sorted run waiting to be merged.
+    
+    def _merge_at(stack_index):
+        """Merge the run at the stack index with the run after it."""
+        start, length = runs[stack_index]
+        _, next_length = runs[stack_index + 1]
+        yield from _merge(sorting_array, start, start + length, start + length + next_length)
+        runs[stack_index] = (start, length + next_length)
+        del runs[stack_index + 1]
+        yield (PASS,) # End of a pass.
+    
+    run_start = 0
+    while run_start < STORED_LENGTH: # While there are elements not yet in a run...
+        # Find the natural run starting here.
+        run_end = run_start + 1
+        if run_end < STORED_LENGTH:
+            yield COMPARE, run_end, run_start
+            descending = sorting_array[run_end] < sorting_array[run_start] # A strictly descending run is reversed, an ascending one is used as it is.
+            run_end += 1
+            while run_end < STORED_LENGTH: # Extend the run while the next element carries on in the same direction.
+                yield COMPARE, run_end, run_end - 1
+                if (sorting_array[run_end] < sorting_array[run_end - 1]) != descending: break
+                run_end += 1
+            if descending:
+                sorting_array[run_start:run_end] = sorting_array[run_start:run_end][::-1]
+                yield WRITE_RANGE, run_start, run_end
+        
+        # Short runs are extended to the minimum run length with insertion sort.
+        if run_end - run_start < minimum_run:
+            run_end = min(run_start + minimum_run, STORED_LENGTH)
+            yield from _insertion_range(sorting_array, run_start, run_end)
+        
+        runs.append((run_start, run_end - run_start))
+        run_start = run_end
+        
+        # Merge runs on the stack until the run lengths shrink fast enough going up the stack (Keeps merges balanced).
+        while len(runs) > 1:
+            top = len(runs) - 2
+            if top > 0 and runs[top - 1][1] <= runs[top][1] + runs[top + 1][1]:
+                yield from _merge_at(top - 1 if runs[top - 1][1] < runs[top + 1][1] else top)
+            elif runs[top][1] <= runs[top + 1][1]:
+                yield from _merge_at(top)
+            else:
+                break
+    
+    while len(runs) > 1: # Merge every run left on the stack, from the top down.
+        yield from _merge_at(len(runs) - 2)
+
+
+@algorithm_wrapper
+def introsort(sorting_array):
+    """ Introsort algorithm (quick sort, falling back to heap sort when the partitions become unbalanced). """
+    INSERTION_CUTOFF = 16 # Sections this small are insertion sorted, it is faster than partitioning them.
+    
+    def _order(first, second):
+        """Nested function used to swap two elements if they are out of order.
+        Args:
+            first (int): Index of the element that should be the smaller.
+            second (int): Index of the element that should be the larger.
+        """
+        yield COMPARE, second, first
+        if sorting_array[second] < sorting_array[first]:
+            sorting_array[first], sorting_array[second] = sorting_array[second], sorting_array[first]
+            yield SWAP, first, second
+    
+    def _introsort(start, end, depth_limit):
+        """Nested function used to sort a section of the array.
+        Args:
+            start (int): First index of the section.
+            end (int): Index after the last element of the section.
+            depth_limit (int): How many more partitions deep the sort can go before falling back to heap sort.
+        """
+        while end - start > INSERTION_CUTOFF: # While the section is too big for insertion sort...
+            if depth_limit == 0: # If partitioning has gone too deep (Bad pivots), heap sort the section instead.
+                yield from _heap_range(sorting_array, start, end)
+                return
+            depth_limit -= 1
+            
+            # Move the median of the first, middle and last elements to the end to be used as the pivot.
+            middle = (start + end) // 2
+            yield from _order(start, middle)
+            yield from _order(start, end - 1)
+            yield from _order(end - 1, middle)
+            pivot = sorting_array[end - 1]
+            
+            # Partition the section around the pivot.
+            store_index = start
+            for search_index in range(start, end - 1):
+                yield COMPARE, search_index, end - 1
+                if sorting_array[search_index] < pivot:
+                    sorting_array[store_index], sorting_array[search_index] = sorting_array[search_index], sorting_array[store_index]
+                    yield SWAP, store_index, search_index
+                    store_index += 1
+            sorting_array[store_index], sorting_array[end - 1] = sorting_array[end - 1], sorting_array[store_index]
+            yield SWAP, store_index, end - 1
+            yield (PASS,) # End of a pass, one per partition.
+            
+            # Sort the smaller side by recursion and the larger side by looping, this keeps the recursion shallow.
+            if store_index - start < end - store_index:
+                yield from _introsort(start, store_index, depth_limit)
+                start = store_index + 1
+            else:
+                yield from _introsort(store_index + 1, end, depth_limit)
+                end = store_index
+        
+        yield from _insertion_range(sorting_array, start, end) # Finish the small section with insertion sort.
+    
+    # The depth limit is twice the number of times the array can be halved.
+    yield from _introsort(0, len(sorting_array), 2 * max(len(sorting_array), 1).bit_length())
+
+
+@algorithm_wrapper
+def radix(sorting_array):
+    """ Least significant digit radix sort algorithm, for integers. """
+    STORED_LENGTH = len(sorting_array)
+    if STORED_LENGTH < 2: return # Nothing to sort.
+    
+    RADIX_BITS = 8 # Each pass sorts by one byte of the numbers.
+    RADIX = 1 << RADIX_BITS
+    minimum = min(sorting_array) # The numbers are sorted relative to the minimum, so negative numbers work too.
+    maximum_offset = max(sorting_array) - minimum
+    
+    shift = 0
+    while maximum_offset >> shift: # While there are digits left in the largest number...
+        # Count how many numbers have each digit.
+        counts = [0] * RADIX
+        for value in sorting_array:
+            counts[((value - minimum) >> shift) & (RADIX - 1)] += 1
+        
+        # Turn the counts into the starting position of each digit in the output.
+        total = 0
+        for digit in range(RADIX):
+            counts[digit], total = total, total + counts[digit]
+        
+        # Place every number at the next free position for its digit (In order, this keeps each pass stable).
+        output = [0] * STORED_LENGTH
+        for value in sorting_array:
+            digit = ((value - minimum) >> shift) & (RADIX - 1)
+            output[counts[digit]] = value
+            counts[digit] += 1
+        
+        sorting_array[:] = output # Copy the pass back into the array.
+        yield WRITE_RANGE, 0, STORED_LENGTH
+        yield (PASS,) # End of a pass.
+        shift += RADIX_BITS
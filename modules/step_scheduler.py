@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""
+This module contains the step scheduler, which decides when an algorithm is allowed to take its next step.
+
+This is a library file and cannot be run directly.
+
+Every algorithm is a generator that yields an operation record for each step, handing control back to whoever is running it.
+The scheduler runs those steps either a set number per rendered frame (which can be a fraction, e.g. 0.25 is one step every 4 frames),
+a set number per second, or as fast as possible, and can pause, single-step or cancel the run in between any two steps.
+
+Benchmarks do not want any steps at all, so fast_path() compiles an algorithm into a copy with every yield removed.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import ast
+import collections
+import functools
+import importlib
+import inspect
+import textwrap
+import threading
+import time
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+MAX_BURST_SECONDS = 0.05 # At a steps per second rate, at most this many seconds worth of steps can be saved up and run at once.
+
+_fast_paths = {} # The compiled fast path of every algorithm asked for so far, so each is only compiled once.
+
+
+class StepScheduler:
+    """Step scheduler class that runs the steps of an algorithm at a set rate, and lets them be paused, stepped through and cancelled."""
+
+    def __init__(self, steps_per_second=None, steps_per_frame=None) -> None:
+        """Initialise the step scheduler. With neither rate given, steps run as fast as possible.
+
+        Args:
+            steps_per_second (float, optional): The number of steps to run each second. Defaults to None.
+            steps_per_frame (float, optional): The number of steps to run for each frame, frame() must be called after every frame. Defaults to None.
+        """
+        self._steps_per_second, self._steps_per_frame = steps_per_second, steps_per_frame
+        self._paced = bool(steps_per_second or steps_per_frame) # Whether the steps are run at a set rate.
+        self._allowance = 0.0 # The number of steps that can be run before waiting (Fractions of a step build up until there is a whole one).
+        self._last_refill = time.perf_counter() # When the allowance was last topped up (At a steps per second rate).
+        self._paused, self._cancelled = False, False # Whether the algorithm is paused, or has been stopped for good.
+        self._single_steps = 0 # The number of steps to run while paused (Asked for by step()).
+        self._condition = threading.Condition() # Wakes the algorithm when a frame has been drawn, or it is resumed, stepped or cancelled.
+
+    @property
+    def cancelled(self):
+        """bool: Whether the run has been cancelled."""
+        return self._cancelled
+
+    @property
+    def paused(self):
+        """bool: Whether the run is paused."""
+        return self._paused
+
+    def run(self, steps, operation_log=None):
+        """Run every step of an algorithm, waiting between steps whenever the allowance runs out or the run is paused.
+
+        Each step is one operation record yielded by the algorithm.
+
+        Args:
+            steps (generator): The running algorithm.
+            operation_log (operation_log.OperationLog, optional): Records every change the algorithm makes. Defaults to None.
+        """
+        try:
+            for record in steps: # For each step the algorithm has taken...
+                if operation_log is not None: operation_log.append(record)
+                # Only take the condition's lock when there is something to wait for, checking the flags is far cheaper.
+                if self._paced or self._paused or self._cancelled:
+                    with self._condition:
+                        if not self._take_step(): break # If the run has been cancelled, stop it.
+        finally:
+            steps.close() # Stop the algorithm where it is (This does nothing if it has already finished).
+
+    def _take_step(self):
+        """Wait until the next step can be run. Called with the condition held.
+
+        Returns:
+            bool: True when the step can be run, False when the run has been cancelled.
+        """
+        while not self._cancelled:
+            if self._paused: # While paused, only the steps asked for by step() are run.
+                if self._single_steps:
+                    self._single_steps -= 1
+                    return True
+                self._condition.wait()
+            elif not self._paced:
+                return True
+            elif self._allowance >= 1: # Wait until there is a whole step in the allowance.
+                self._allowance -= 1
+                return True
+            else:
+                self._wait_for_allowance()
+        return False
+
+    def _wait_for_allowance(self):
+        """Top up the allowance, or wait until it can be topped up. Called with the condition held."""
+        if self._steps_per_frame: # Frame rate steps are added by frame(), so wait to be woken by it.
+            self._condition.wait()
+            return
+
+        now = time.perf_counter() # Add the steps for the time passed since the last top up.
+        self._allowance = min(
+            self._allowance + (now - self._last_refill) * self._steps_per_second,
+            max(1.0, self._steps_per_second * MAX_BURST_SECONDS), # Stops a pause (e.g. between repeats) saving up a burst of steps.
+        )
+        self._last_refill = now
+        if self._allowance < 1: # Sleep until the next whole step is due.
+            self._condition.wait((1 - self._allowance) / self._steps_per_second)
+
+    def frame(self):
+        """Add one frame's worth of steps to the allowance, called after every frame is drawn."""
+        if not self._steps_per_frame: return # Only a frame rate scheduler counts frames.
+        with self._condition:
+            # Add the steps for this frame, never saving up more than one frame's worth.
+            self._allowance = min(self._allowance + self._steps_per_frame, max(1.0, self._steps_per_frame))
+            self._condition.notify_all() # Wake the algorithm.
+
+    def pause(self):
+        """Pause the algorithm at its next step."""
+        with self._condition:
+            self._paused, self._single_steps = True, 0
+
+    def resume(self):
+        """Carry on running the algorithm at its rate."""
+        with self._condition:
+            self._paused = False
+            self._condition.notify_all()
+
+    def step(self, steps=1):
+        """Run a number of steps while paused.
+
+        Args:
+            steps (int, optional): The number of steps to run. Defaults to 1.
+        """
+        with self._condition:
+            self._single_steps += steps
+            self._condition.notify_all()
+
+    def cancel(self):
+        """Stop the algorithm at its next step, for good."""
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+
+
+class _YieldRemover(ast.NodeTransformer):
+    """Rewrites the syntax tree of an algorithm without its yields.
+
+    "yield" statements are removed, and "yield from helper(...)" becomes "helper(...)", so the helper must be swapped for its own fast path.
+    """
+
+    def __init__(self) -> None:
+        self.helper_names = set() # The names of the functions yielded from, their fast paths are swapped in.
+
+    def visit_Expr(self, node):
+        if isinstance(node.value, ast.Yield): return None # A step point, remove it.
+        return self.generic_visit(node)
+
+    def visit_YieldFrom(self, node):
+        if isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name):
+            self.helper_names.add(node.value.func.id)
+        return self.visit(node.value) # Call the helper directly, its fast path returns what the generator would have returned.
+
+    def generic_visit(self, node):
+        # The blocks of statements the node has (e.g. the "else" of a loop, or the "finally" of a try), blocks left empty are not touched.
+        blocks = [field for field in ("body", "orelse", "finalbody") if isinstance(getattr(node, field, None), list) and getattr(node, field)]
+        node = super().generic_visit(node)
+        for field in blocks:
+            if not getattr(node, field): # A block left empty by a removed yield is given a "pass".
+                setattr(node, field, [ast.Pass()])
+        return node
+
+
+def _drained(func):
+    """Get a function that runs every step of an algorithm straight away, for algorithms that cannot be compiled.
+
+    Args:
+        func (function): The algorithm.
+
+    Returns:
+        function: The algorithm run to completion without any steps being handed out.
+    """
+    @functools.wraps(func)
+    def _run(*args):
+        collections.deque(func(*args), maxlen=0)
+    return _run
+
+
+def _compile_fast_path(func):
+    """Compile a copy of an algorithm with every yield removed.
+
+    Args:
+        func (function): The algorithm, a generator function defined at the top level of its module.
+
+    Returns:
+        function: The copy, or None when the algorithm cannot be compiled (e.g. its source is not available).
+    """
+    # Wrapped (decorated) algorithms and those using variables of an enclosing function cannot be rebuilt from their source alone.
+    if hasattr(func, "__wrapped__") or func.__code__.co_freevars: return None
+    try:
+        source_lines, first_line = inspect.getsourcelines(func)
+    except (OSError, TypeError): # The source is not available (e.g. the algorithm was defined in an interactive session).
+        return None
+
+    try:
+        tree = ast.parse(textwrap.dedent("".join(source_lines)))
+    except SyntaxError: # The source found is not a whole function (e.g. a lambda, which is only part of a line).
+        return None
+    ast.increment_lineno(tree, first_line - 1) # Keep the line numbers of the original file, so errors point to the real line.
+    function_node = tree.body[0]
+    function_node.decorator_list = [] # The copy must not be registered as an algorithm again.
+
+    remover = _YieldRemover()
+    function_node = remover.visit(function_node)
+    if any(isinstance(node, (ast.Yield, ast.YieldFrom)) for node in ast.walk(function_node)): return None # Yields used as values cannot be removed.
+
+    # The helpers yielded from are swapped for their fast paths, by defining the copy inside a function taking them as arguments.
+    # The copy then sees the helpers' fast paths, and looks every other name up in the algorithm's own module, as it is when the copy runs.
+    # (The algorithm yielding from itself is already the copy, as its name is defined inside that function too.)
+    helpers = {name: func.__globals__[name] for name in sorted(remover.helper_names - {function_node.name})
+               if inspect.isgeneratorfunction(func.__globals__.get(name))}
+    factory = ast.parse(f"def _fast_path_factory({', '.join(helpers)}):\n    pass")
+    factory.body[0].body = [function_node, ast.Return(ast.Name(function_node.name, ast.Load()))]
+    namespace = {}
+    try:
+        code = compile(ast.fix_missing_locations(factory), inspect.getsourcefile(func) or "<fast path>", "exec")
+    except (SyntaxError, TypeError, ValueError): # Removing the yields left something Python will not compile.
+        return None
+    exec(code, func.__globals__, namespace) # Define the function that makes the copy (It is not added to the algorithm's module).
+    copy = namespace["_fast_path_factory"](*(fast_path(helper) for helper in helpers.values()))
+    return functools.update_wrapper(copy, func, updated=()) # Give the copy the name and docstring of the algorithm.
+
+
+def fast_path(func):
+    """Get the no-yield fast path of an algorithm, used to benchmark it.
+
+    An algorithm built at run time (whose source cannot be compiled) can carry a fast path of its own, as its __fast_path__ attribute.
+    An algorithm that imports a module the first time it is run (e.g. NumPy) can name it in its __requires__ attribute, so it is imported here,
+    before the algorithm is timed.
+
+    Args:
+        func (function): The algorithm, a generator function taking the array to be sorted.
+
+    Returns:
+        function: A plain function that sorts the array in one go.
+    """
+    for module in getattr(func, "__requires__", ()):
+        importlib.import_module(module)
+    if hasattr(func, "__fast_path__"): return func.__fast_path__
+    if func not in _fast_paths: # Compile each algorithm only once.
+        # If the algorithm cannot be compiled, run through its steps instead (Slower, but only by the cost of each yield).
+        _fast_paths[func] = _compile_fast_path(func) or _drained(func)
+    return _fast_paths[func]
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+"""
+This module contains the trace file, a compact binary recording of every step of one run of an algorithm.
+
+This is a library file and cannot be run directly.
+
+A run is recorded once, headless and at full speed, then the window can replay it at any speed without running the sort again.
+The file is laid out as:
+    - The magic bytes "SORTTRACE", the format version and the flags (bit 0 set means the operations are zlib compressed).
+    - The metadata: its length (4 bytes) then JSON, e.g. the algorithm name and the time the sort took without being recorded.
+    - The array before the run: its size in bytes (8 bytes) then the number of values and every value, each as a varint.
+    - The operations, until the end of the file (zlib compressed when the flag is set).
+
+Each operation is its code (1 byte, see the codes in sorting_algorithms) followed by its numbers as varints:
+    - COMPARE and SWAP: the first index, as the difference from the first index of the operation before, then the second index as the difference from the first.
+    - WRITE: the index (a difference, as above) then the value written.
+    - WRITE_RANGE: the start (a difference, as above), the number of values, then every value written.
+    - PASS: nothing.
+A varint stores a number 7 bits to a byte, the top bit of each byte says whether another byte follows, so small numbers take one byte.
+Neighbouring operations usually touch neighbouring indexes, so storing the differences keeps most indexes to a single byte.
+Differences and values can be negative, so they are zigzag encoded first (0, -1, 1, -2, 2... become 0, 1, 2, 3, 4...).
+
+Replaying memory-maps the file and decodes it a chunk at a time, so a trace far bigger than memory can be replayed.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+
+from modules.sorting_algorithms import COMPARE, SWAP, WRITE, WRITE_RANGE, PASS
+import modules.step_scheduler as step_scheduler
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+MAGIC = b"SORTTRACE" # The first bytes of every trace file.
+FORMAT_VERSION = 1 # Bumped whenever the layout of the file changes.
+COMPRESSED = 0x01 # The flag set when the operations are zlib compressed.
+CHUNK_SIZE = 1 << 20 # The operations are written, read and decompressed 1 MiB at a time.
+
+
+class TraceFormatError(Exception):
+    """Trace file is not valid.
+
+    Custom exception to be called when a file is not a trace file, or was written by an unsupported version."""
+    pass
+
+
+def _add_varint(buffer, number):
+    """Add a number to a buffer as a zigzag encoded varint.
+
+    Args:
+        buffer (bytearray): The buffer to add to.
+        number (int): The number, positive or negative.
+    """
+    number = number << 1 if number >= 0 else (-number << 1) - 1 # Zigzag, so small negative numbers are small too.
+    while number >= 0x80: # While more than 7 bits are left, write the lowest 7 with the top bit set (another byte follows).
+        buffer.append((number & 0x7F) | 0x80)
+        number >>= 7
+    buffer.append(number)
+
+
+class TraceWriter:
+    """Trace writer class that records the operations of one run into a trace file."""
+
+    def __init__(self, path, sorting_array, metadata, compress=False) -> None:
+        """Initialise the trace writer, writing the header and the array as it is before the run.
+
+        Args:
+            path (str): The file to write the trace to.
+            sorting_array (array): The array about to be sorted (A list or a NumPy array).
+            metadata (dict): Anything to store alongside the run (Must be JSON serialisable), e.g. the algorithm name.
+            compress (bool, optional): Whether to zlib compress the operations. Defaults to False.
+        """
+        self._array = sorting_array
+        self._file = open(path, "wb")
+        self._compressor = zlib.compressobj() if compress else None
+        self._buffer = bytearray() # The encoded operations not yet written to the file.
+        self._last_index = 0 # The first index of the last operation, the next index is stored as the difference from it.
+
+        metadata_bytes = json.dumps(metadata).encode("utf-8")
+        initial_array = bytearray()
+        _add_varint(initial_array, len(sorting_array))
+        for value in (sorting_array if isinstance(sorting_array, list) else sorting_array.tolist()):
+            _add_varint(initial_array, value)
+
+        self._file.write(MAGIC + bytes([FORMAT_VERSION, COMPRESSED if compress else 0]))
+        self._file.write(struct.pack("<I", len(metadata_bytes)) + metadata_bytes)
+        self._file.write(struct.pack("<Q", len(initial_array)) + initial_array)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def append(self, record):
+        """Record an operation, called for every record the algorithm yields.
+
+        Args:
+            record (tuple): The operation record, see the codes in sorting_algorithms.
+        """
+        buffer, code = self._buffer, record[0]
+        buffer.append(code)
+        if code == PASS: # A pass has no numbers.
+            pass
+        elif code == WRITE_RANGE: # The values written are copied from the array (The algorithm is paused at the yield, so they are up to date).
+            start, end = record[1], record[2]
+            _add_varint(buffer, start - self._last_index)
+            _add_varint(buffer, end - start)
+            values = self._array[start:end]
+            for value in (values if isinstance(values, list) else values.tolist()):
+                _add_varint(buffer, value)
+            self._last_index = start
+        else: # COMPARE and SWAP store a second index, WRITE stores the value written.
+            first = record[1]
+            _add_varint(buffer, first - self._last_index)
+            _add_varint(buffer, int(record[2]) if code == WRITE else record[2] - first)
+            self._last_index = first
+
+        if len(buffer) >= CHUNK_SIZE: self._flush()
+
+    def _flush(self):
+        """Write the buffered operations to the file."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._file.write(data if self._compressor is None else self._compressor.compress(data))
+
+    def close(self):
+        """Write the last of the operations and close the file."""
+        if self._file.closed: return
+        self._flush()
+        if self._compressor is not None: self._file.write(self._compressor.flush())
+        self._file.close()
+
+
+class _ByteStream:
+    """Reads varints from a series of chunks of bytes, fetching the next chunk whenever the current one runs out."""
+
+    def __init__(self, chunks) -> None:
+        """Initialise the byte stream.
+
+        Args:
+            chunks (iterator): The chunks of bytes, in order.
+        """
+        self._chunks = chunks
+        self._data, self._position = b"", 0
+
+    def _next_chunk(self):
+        """Move on to the next chunk.
+
+        Returns:
+            bool: False when there are no chunks left.
+        """
+        chunk = next(self._chunks, None)
+        if chunk is None: return False
+        self._data, self._position = chunk, 0
+        return True
+
+    def read_byte(self):
+        """Read one byte.
+
+        Returns:
+            int: The byte, or None at the end of the stream.
+        """
+        if self._position >= len(self._data) and not self._next_chunk(): return None
+        byte = self._data[self._position]
+        self._position += 1
+        return byte
+
+    def read_varint(self):
+        """Read one zigzag encoded varint.
+
+        Raises:
+            TraceFormatError: When the stream ends part of the way through the number.
+
+        Returns:
+            int: The number.
+        """
+        number, shift = 0, 0
+        while True:
+            if self._position >= len(self._data) and not self._next_chunk():
+                raise TraceFormatError("The trace file ends part of the way through an operation, it may not have finished being written.")
+            byte = self._data[self._position]
+            self._position += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80: break # The top bit is clear on the last byte of the number.
+            shift += 7
+        return (number >> 1) ^ -(number & 1) # Undo the zigzag.
+
+
+class TraceReader:
+    """Trace reader class that streams the operations of a trace file from a memory mapping."""
+
+    def __init__(self, path) -> None:
+        """Initialise the trace reader, reading the header of the file.
+
+        Args:
+            path (str): The trace file to read.
+
+        Raises:
+            TraceFormatError: When the file is not a trace file, was written by an unsupported version, or is cut short or damaged.
+        """
+        with open(path, "rb") as file:
+            if not os.fstat(file.fileno()).st_size: # An empty file cannot be memory mapped (and is not a trace file).
+                raise TraceFormatError(f"The file '{path}' is empty, it is not a trace file.")
+            # The mapping stays open after the file is closed, the operating system pages it in as it is read (Until close() is called).
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header(path)
+        except BaseException: # The reader is never returned, so nothing else can close the mapping.
+            self._mapping.close()
+            raise
+
+    def _read_header(self, path):
+        """Read the header, metadata and array length of the file, checking every section fits inside the file before reading it.
+
+        Args:
+            path (str): The trace file being read, used in the error messages.
+
+        Raises:
+            TraceFormatError: When the file is not a trace file, was written by an unsupported version, or is cut short or damaged.
+        """
+        file_length = len(self._mapping)
+        header_end = len(MAGIC) + 2
+        if self._mapping[:len(MAGIC)] != MAGIC:
+            raise TraceFormatError(f"The file '{path}' is not a trace file.")
+        if file_length < header_end + 4: # The version, flags and metadata length must all be there.
+            raise TraceFormatError(f"The trace file '{path}' is cut short in its header.")
+        version, flags = self._mapping[len(MAGIC)], self._mapping[len(MAGIC) + 1]
+        if version != FORMAT_VERSION:
+            raise TraceFormatError(f"The trace file '{path}' is version {version}, only version {FORMAT_VERSION} can be read.")
+        self.compressed = bool(flags & COMPRESSED)
+
+        metadata_length, = struct.unpack_from("<I", self._mapping, header_end)
+        metadata_start = header_end + 4
+        array_length_position = metadata_start + metadata_length
+        if file_length < array_length_position + 8: # The metadata and the length of the array must both be there.
+            raise TraceFormatError(f"The trace file '{path}' is cut short in its metadata.")
+        try:
+            self.metadata = json.loads(self._mapping[metadata_start:array_length_position].decode("utf-8"))
+        except ValueError as error: # Not UTF-8, or not JSON (Both errors are ValueErrors).
+            raise TraceFormatError(f"The metadata of the trace file '{path}' is damaged ({error}).") from error
+        if not isinstance(self.metadata, dict) or not {"algorithm", "length"} <= self.metadata.keys():
+            raise TraceFormatError(f"The metadata of the trace file '{path}' is missing the algorithm or the length.")
+
+        array_bytes, = struct.unpack_from("<Q", self._mapping, array_length_position)
+        self._array_start = array_length_position + 8
+        self._operations_start = self._array_start + array_bytes # The operations start straight after the array.
+        if file_length < self._operations_start:
+            raise TraceFormatError(f"The trace file '{path}' is cut short in its array.")
+
+    def initial_array(self):
+        """Read the array as it was before the run.
+
+        Returns:
+            list: A new copy of the array.
+        """
+        stream = _ByteStream(iter([self._mapping[self._array_start:self._operations_start]]))
+        return [stream.read_varint() for _ in range(stream.read_varint())]
+
+    def _chunks(self):
+        """Get the operations a chunk at a time, decompressing them if needed (At most a few chunks are in memory at once).
+
+        Yields:
+            bytes: The next chunk of encoded operations.
+        """
+        decompressor = zlib.decompressobj() if self.compressed else None
+        for offset in range(self._operations_start, len(self._mapping), CHUNK_SIZE):
+            data = self._mapping[offset:offset + CHUNK_SIZE]
+            if decompressor is None:
+                yield data
+                continue
+            while data: # Limit each decompressed chunk to the chunk size, highly repetitive operations can compress a lot.
+                chunk = decompressor.decompress(data, CHUNK_SIZE)
+                if chunk: yield chunk
+                data = decompressor.unconsumed_tail
+        if decompressor is not None:
+            chunk = decompressor.flush()
+            if chunk: yield chunk
+
+    def records(self):
+        """Read every operation recorded, in order. Can be called again to read them from the start.
+
+        Yields:
+            tuple: Each operation record. WRITE_RANGE records also carry the values written, as (WRITE_RANGE, start, end, values).
+        """
+        stream = _ByteStream(self._chunks())
+        read_varint, last_index = stream.read_varint, 0
+        while True:
+            code = stream.read_byte()
+            if code is None: return # The end of the trace.
+            if code == PASS:
+                yield (PASS,)
+            elif code == WRITE_RANGE:
+                start = last_index + read_varint()
+                end = start + read_varint()
+                yield WRITE_RANGE, start, end, [read_varint() for _ in range(end - start)]
+                last_index = start
+            elif code in (COMPARE, SWAP, WRITE):
+                first = last_index + read_varint()
+                second = read_varint()
+                yield code, first, (second if code == WRITE else first + second)
+                last_index = first
+            else:
+                raise TraceFormatError(f"The trace file holds an unknown operation code {code}.")
+
+    def close(self):
+        """Close the memory mapping, the reader cannot be read from after this."""
+        self._mapping.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def record_trace(func, sorting_array, path, compress=False, metadata=None):
+    """Run an algorithm once, headless and at full speed, recording every step of the run to a trace file.
+
+    The algorithm is first timed on a copy of the array using its fast path, so the time stored is never slowed down by the recording.
+
+    Args:
+        func (function): The algorithm to record.
+        sorting_array (array): The array to be sorted (A list or a NumPy array), it is sorted in place by the recorded run.
+        path (str): The file to write the trace to.
+        compress (bool, optional): Whether to zlib compress the operations. Defaults to False.
+        metadata (dict, optional): Anything else to store alongside the run, e.g. the distribution. Defaults to None.
+
+    Returns:
+        dict: The metadata stored in the trace, including "algorithm", "length" and "time_ns" (the untraced run time in nanoseconds).
+    """
+    timed_array = sorting_array.copy()
+    fast_path = step_scheduler.fast_path(func) # (Got before the timer starts, as it may need to be compiled first.)
+    start_time = time.perf_counter_ns()
+    fast_path(timed_array) # Time the sort without any steps being handed out.
+    time_ns = time.perf_counter_ns() - start_time
+
+    metadata = {**(metadata or {}), "algorithm": func.__name__, "length": len(sorting_array), "time_ns": time_ns}
+    with TraceWriter(path, sorting_array, metadata, compress) as writer:
+        for record in func(sorting_array): # Run every step, recording each one.
+            writer.append(record)
+    return metadata
+
+
+def replayer(reader):
+    """Get an algorithm that replays a trace, so the engine can run (and pace, pause and record) it like any other algorithm.
+
+    Args:
+        reader (TraceReader): The trace to replay.
+
+    Returns:
+        function: A generator function taking the array before the run (see TraceReader.initial_array()),
+            named after the recorded algorithm, that makes each recorded change to it and yields its record.
+    """
+    def _replay(sorting_array):
+        for record in reader.records():
+            code = record[0]
+            if code == SWAP:
+                sorting_array[record[1]], sorting_array[record[2]] = sorting_array[record[2]], sorting_array[record[1]]
+            elif code == WRITE:
+                sorting_array[record[1]] = record[2]
+            elif code == WRITE_RANGE:
+                sorting_array[record[1]:record[2]] = record[3]
+            yield record
+    _replay.__name__ = reader.metadata["algorithm"] # The engine shows the name of the algorithm that was recorded.
+    return _replay
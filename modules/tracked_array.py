@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+This module contains the tracked array, a list that remembers which of its indexes have been written to.
+
+This is a library file and cannot be run directly.
+
+The engine hands a tracked array to the algorithms when a window is open, so the window only has to redraw the bars that changed.
+Benchmarks use plain lists, so the tracking costs nothing when nothing is drawn.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import threading
+
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+DIRTY_INDEX_LIMIT = 4096 # Past this many written indexes (or slices) between frames, the whole array is treated as changed.
+
+
+class TrackedArray(list):
+    """A list that records the indexes written to since the changes were last collected."""
+
+    def __init__(self, *args) -> None:
+        """Initialise the tracked array, taking the same arguments as list()."""
+        super().__init__(*args)
+        self._dirty_indexes = set() # Single indexes written to since the last collection.
+        self._dirty_spans = [] # (start, end) ranges written to by slice assignment since the last collection.
+        self._all_dirty = True # Whether everything should be treated as changed (Nothing has been drawn yet).
+        self._lock = threading.Lock() # Stops the window collecting the changes half way through a write being recorded.
+
+    def __setitem__(self, index, value):
+        """Write to the array, recording where it was written.
+
+        Args:
+            index (int or slice): The index (or slice) to write to.
+            value: The value (or values) to write.
+        """
+        super().__setitem__(index, value) # Write to the array as normal.
+        with self._lock:
+            if self._all_dirty: return # If everything is already changed, there is nothing more to record.
+            if isinstance(index, slice): # A slice is recorded as the range of indexes it covers.
+                start, end, _ = index.indices(len(self))
+                self._dirty_spans.append((start, end))
+                if len(self._dirty_spans) > DIRTY_INDEX_LIMIT: # Too many changes to be worth tracking one by one.
+                    self._all_dirty, self._dirty_indexes, self._dirty_spans = True, set(), []
+            else:
+                self._dirty_indexes.add(index % len(self)) # (% turns negative indexes into their positive index.)
+                if len(self._dirty_indexes) > DIRTY_INDEX_LIMIT: # Too many changes to be worth tracking one by one.
+                    self._all_dirty, self._dirty_indexes, self._dirty_spans = True, set(), []
+
+    def sort(self, *args, **kwargs):
+        """Sort the array in place (Python's own sort), marking everything as changed."""
+        super().sort(*args, **kwargs)
+        self.mark_all_dirty()
+
+    def reverse(self):
+        """Reverse the array in place, marking everything as changed."""
+        super().reverse()
+        self.mark_all_dirty()
+
+    def mark_all_dirty(self):
+        """Treat every index as changed, so the next collection redraws everything."""
+        with self._lock:
+            self._all_dirty, self._dirty_indexes, self._dirty_spans = True, set(), []
+
+    def collect_dirty(self):
+        """Collect the changes since the last collection and start recording afresh.
+
+        Returns:
+            tuple: (whether everything changed, set of single indexes written to, list of (start, end) ranges written to).
+        """
+        with self._lock:
+            changes = (self._all_dirty, self._dirty_indexes, self._dirty_spans)
+            self._all_dirty, self._dirty_indexes, self._dirty_spans = False, set(), []
+        return changes
@@ -10,6 +10,8 @@ Please Note: These files are greatly overdocumented, this is because this is to
 import math
 import pygame
 
+from modules.numpy_algorithms import numpy # NumPy is optional, without it the bars are drawn one at a time.
+
 
 __author__ = "Archer Hume"
 __copyright__ = "Copyright (C) 2022 Archer Hume"
@@ -20,6 +22,9 @@ __email__ = "archer@hume.email"
 __status__ = "Development"
 
 
+TEXT_CACHE_SIZE = 64 # The most rendered lines of text to keep before the cache is emptied.
+
+
 class Window:
     """Window class to handle all UI related methods"""
     
@@ -45,56 +50,172 @@ class Window:
         self._screen.fill(background) # Fill the screen with the background colour.
         pygame.display.set_caption("Sorting Algorithm Visualiser") # Set the title of the window.
         pygame.display.update() # Update the display.
+        
+        self._text_cache = {} # The rendered surface of each line of text, by its text.
+        self._drawn_key = None # The array whose bars are on screen, changes to any other array mean redrawing everything.
+        self._text_area = pygame.Rect(15, 8, 0, 0) # The area the text covered last frame.
+        # The bars are drawn onto their own surface, so the changed areas can be copied to the screen without the text.
+        self._bars = pygame.Surface((self._SCREEN_WIDTH, self.height)).convert(self._screen)
+        
+        if numpy is not None: # Store what the vectorized drawing needs every frame, so it is only worked out once.
+            self._pixel_rows = numpy.arange(self.height, dtype=numpy.float64)[numpy.newaxis, :] # The y position of every row of pixels.
+            self._mapped_foreground = self._screen.map_rgb(foreground) # The colours as the screen stores them.
+            self._mapped_background = self._screen.map_rgb(background)
 
-    def update_window(self, current_array, display_name, current_time, is_running):
-        """ Update the window with the current array and the current times.
+    def _text_surface(self, display_string):
+        """ Get the rendered surface of a line of text, only rendering it if it has changed since it was last drawn.
 
         Args:
-            current_array (array): The current array to be displayed.
-            display_name (str): The name of the algorithm being run.
-            current_time (float): The current time of the algorithm.
-            is_running (bool): Whether the algorithm is running or not.
+            display_string (str): The text to be rendered.
+
+        Returns:
+            pygame.Surface: The rendered text.
         """
-        MAX_HEIGHT = self.height*0.8 # The maximum height of the array.
-        MIN_HEIGHT = self.height*0.1 # The minimum height of the array.
+        if display_string not in self._text_cache: # If the text has not been rendered before...
+            if len(self._text_cache) >= TEXT_CACHE_SIZE: self._text_cache.clear() # Stop the cache growing forever (e.g. the running time).
+            self._text_cache[display_string] = self._SYSTEM_FONT.render(display_string, True, self.text_colour)
+        return self._text_cache[display_string]
+
+    def _finished_string(self, finished_time, run_stats):
+        """ Get the line of text displayed for a finished run.
+
+        Args:
+            finished_time (float): The time taken by the run in seconds.
+            run_stats (dict): The measurements of the run, see instrumentation.measure_run().
+
+        Returns:
+            str: The time rounded to 2 decimal places, followed by the counts of the run when it was instrumented,
+                and the algorithm chosen when the run chose one (e.g. auto).
+        """
+        # The algorithms chosen during the run, and why.
+        choices = "".join(f" | {decision['algorithm']} ({decision['reason']})" for decision in run_stats.get("decisions", ()))
+        if run_stats["comparisons"] is None: return str(round(finished_time, 2)) + choices # Uninstrumented runs only have a time.
+        # The peak memory is not measured while the window is open (See instrumentation.measure_run()).
+        peak_memory = f" | {run_stats['peak_memory'] / 1024:,.1f} KB peak memory" if run_stats["peak_memory"] is not None else ""
+        return (
+            f"{round(finished_time, 2)} | {run_stats['comparisons']:,} comparisons | {run_stats['writes']:,} writes"
+            f" | {run_stats['passes']:,} passes{peak_memory}{choices}"
+        )
+
+    def _draw_bars_vectorized(self, current_array, maximum, min_height, max_height):
+        """ Draw every bar at once, by building the whole frame as an array of pixels with NumPy.
+
+        Args:
+            current_array (array): The (downsampled) array to be displayed.
+            maximum (float): The largest value of the array.
+            min_height (float): The height of the smallest bar.
+            max_height (float): The height added to the smallest bar for the largest value.
+        """
+        # The height of the bar in every column of pixels (Each bar is repeated to fill its width).
+        item_width = max(round(self._SCREEN_WIDTH / len(current_array)), 1)
+        bar_heights = numpy.asarray(current_array, dtype=numpy.float64) / maximum * max_height + min_height
+        column_heights = numpy.repeat(bar_heights, item_width)[:self._SCREEN_WIDTH]
         
-        # Set current_array to only elements that can fit on the screen. (Extremely scalable, can render millions of items extremely quickly)
-        # EXPLAINATION:
-        # Python array slicing syntax is [start:end:step].
-        # This means that if we divide the length of the array by the width, we can get every Nth element, stopping screen overflow (No rectangle should have a width less than 1px).
-        current_array = current_array[::math.ceil(len(current_array)/self._SCREEN_WIDTH)]
+        # A pixel is part of a bar when it is lower down the screen than the top of the bar in its column.
+        # (Every comparison for every pixel is done in one call, rather than one draw call per bar.)
+        column_tops = numpy.full(self._SCREEN_WIDTH, self.height, dtype=numpy.float64)
+        column_tops[:len(column_heights)] = self.height - column_heights
+        is_bar = self._pixel_rows >= column_tops[:, numpy.newaxis]
         
-        # Store current_array dependant constants.
-        STORED_LEN, STORED_MAX = len(current_array), max(current_array) # Get the length and maximum value of the array.
+        # Turn the mask into the colour of every pixel and copy it onto the bars surface in one go.
+        pygame.surfarray.blit_array(self._bars, numpy.where(is_bar, self._mapped_foreground, self._mapped_background))
+
+    def _draw_bar(self, item_index, item_width, value, maximum, min_height, max_height):
+        """ Draw a single bar, clearing whatever was drawn in its place before.
+
+        Args:
+            item_index (int): The position of the bar on screen (Its index in the downsampled array).
+            item_width (int): The width of each bar.
+            value (float): The value the bar represents.
+            maximum (float): The largest value of the array.
+            min_height (float): The height of the smallest bar.
+            max_height (float): The height added to the smallest bar for the largest value.
+
+        Returns:
+            pygame.Rect: The area of the screen the bar covers (Its whole column).
+        """
+        column = pygame.Rect(item_index*item_width, 0, item_width, self.height) # The whole column of the bar.
+        self._bars.fill(self._SCREEN_BACKGROUND, column) # Clear the old bar.
+        bar_top = math.ceil(self.height-(((value/maximum)*max_height)+min_height)) # The y position of the top of the rectangle (Rounded as the vectorized drawing does).
+        # Draw rectangle to represent the item (x, y, width, height).
+        pygame.draw.rect(self._bars, self.foreground, (item_index*item_width, bar_top, item_width, self.height-bar_top))
+        return column
+
+    def _draw_bars_rects(self, current_array, maximum, min_height, max_height):
+        """ Draw the bars one rectangle at a time, used when NumPy is not installed.
+
+        Args:
+            current_array (array): The (downsampled) array to be displayed.
+            maximum (float): The largest value of the array.
+            min_height (float): The height of the smallest bar.
+            max_height (float): The height added to the smallest bar for the largest value.
+        """
+        STORED_LEN = len(current_array) # Get the length of the array.
         ITEM_WIDTH = round(self._SCREEN_WIDTH/STORED_LEN) # The width of each item.
         
+        self._bars.fill(self._SCREEN_BACKGROUND) # Fill the bars surface with the background colour to empty it.
+        
+        # Iterate through all the elements in the current array, drawing a rectangle to represent each item.
+        for item_index in range(STORED_LEN):
+            self._draw_bar(item_index, ITEM_WIDTH, current_array[item_index], maximum, min_height, max_height)
+
+    def update_window(self, snapshot, dirty_bars=None):
+        """ Update the window with a snapshot of the array and the current times.
+
+        Only the bars that changed since the last frame (and the text) are redrawn and sent to the display,
+        when the snapshot channel knows which changed. Otherwise the whole window is redrawn.
+
+        Args:
+            snapshot (snapshot_channel.Snapshot): The snapshot of the array (one value per bar), the algorithm and its times.
+            dirty_bars (set, optional): The positions of the bars that changed since the last frame. Defaults to None (Redraw every bar).
+        """
+        MAX_HEIGHT = self.height*0.8 # The maximum height of the array.
+        MIN_HEIGHT = self.height*0.1 # The minimum height of the array.
+        
+        # The snapshot only holds elements that can fit on the screen, every Nth element of the array. (Extremely scalable, can render millions of items extremely quickly)
+        current_array, STORED_MAX = snapshot.values, snapshot.maximum # The values and the largest value of the whole array.
+        ITEM_WIDTH = round(self._SCREEN_WIDTH/len(current_array)) # The width of each item.
+        finished_times = snapshot.finished_times
+        
         # Store strings to display on screen.
         data_strings = [
-            (f"Algorithm: {display_name} | Time: {round(current_time, 2)} | {'Running' if is_running else 'Finished'}" if is_running else f"Algorithm: {display_name} | Mean: {round(sum(self.algorithm_engine._finished_times)/len(self.algorithm_engine._finished_times),2)}"), # Display the algorithm name, time taken and whether the algorithm is running or finished.
-            *[round(time, 2) for time in self.algorithm_engine._finished_times] # Add the finished times rounded to 2 significant figures to the data strings.
+            (f"Algorithm: {snapshot.display_name} | Time: {round(snapshot.current_time, 2)} | {'Running' if snapshot.running else 'Finished'}" if snapshot.running or not finished_times else f"Algorithm: {snapshot.display_name} | Mean: {round(sum(finished_times)/len(finished_times),2)}"), # Display the algorithm name, time taken and whether the algorithm is running or finished.
+            *[self._finished_string(time, run_stats) for time, run_stats in zip(finished_times, snapshot.run_stats)] # Add the finished times (and their counts, if instrumented).
         ] # Create a list of strings to display on screen.
+        if snapshot.running and snapshot.counters is not None: # If the run is instrumented, display its counts so far under the first line.
+            data_strings.insert(1, " | ".join(f"{name.capitalize()}: {count:,}" for name, count in snapshot.counters.items()))
+        if snapshot.running and snapshot.progress is not None: # If a file is being sorted, display how far through it the sort is.
+            phase, done, total = snapshot.progress
+            data_strings.insert(1, f"{phase}: {done:,} of {total:,} records ({done / max(total, 1):.0%})")
+        if snapshot.running and snapshot.paused: # If the algorithm is paused, display how far into the recording is being shown.
+            data_strings.insert(1, "Paused" if snapshot.recorded is None else f"Paused | Operation {snapshot.position:,} of {snapshot.recorded:,}")
+        text_surfaces = [self._text_surface(str(display_string)) for display_string in data_strings]
         
-        # Draw all relevent data to screen.
-        self._screen.fill(self._SCREEN_BACKGROUND) # Fill the screen with the background colour to empty display.
+        # A new array (or too many changed bars, redrawing lots of single bars is slower than redrawing everything at once) means redrawing everything.
+        if dirty_bars is None or snapshot.array_key != self._drawn_key or len(dirty_bars) > self._SCREEN_WIDTH // 4:
+            self._drawn_key = snapshot.array_key # Remember which array is on screen.
+            if numpy is not None:
+                self._draw_bars_vectorized(current_array, STORED_MAX, MIN_HEIGHT, MAX_HEIGHT)
+            else:
+                self._draw_bars_rects(current_array, STORED_MAX, MIN_HEIGHT, MAX_HEIGHT)
+            changed_areas = [self._screen.get_rect()]
+        else: # Otherwise redraw only the bars that changed.
+            changed_areas = [
+                self._draw_bar(bar_index, ITEM_WIDTH, current_array[bar_index], STORED_MAX, MIN_HEIGHT, MAX_HEIGHT)
+                for bar_index in dirty_bars if bar_index < len(current_array)
+            ]
         
-        # For each string in the data strings list (Enumerate method turns list to list of tuples with index and value)...
-        for string_index, display_string in enumerate(data_strings): 
-            text = self._SYSTEM_FONT.render(str(display_string), True, self.text_colour) # Create a new text object.
-            self._screen.blit(text, (15, 8 + string_index * 26)) # Display the text object on the screen, determining height from the index.
+        # The text is redrawn every frame, over the area it covers now and the area it covered last frame.
+        text_area = pygame.Rect(15, 8, max([surface.get_width() for surface in text_surfaces]), 26 * len(text_surfaces))
+        changed_areas.append(text_area.union(self._text_area))
+        self._text_area = text_area
         
-        # Iterate through all the elements in the current array...
-        for item_index in range(STORED_LEN):
-            # Draw rectangle to represent the item.
-            pygame.draw.rect(
-                self._screen, # The screen object to draw on.
-                self.foreground, # The colour of the rectangle.
-                (
-                    item_index*ITEM_WIDTH, # The x position of the rectangle.
-                    self.height-(((current_array[item_index]/STORED_MAX)*MAX_HEIGHT)+MIN_HEIGHT), # The y position of the rectangle.
-                    ITEM_WIDTH, # The width of the rectangle.
-                    ((current_array[item_index]/STORED_LEN)*MAX_HEIGHT)+MIN_HEIGHT # The height of the rectangle.
-                ),
-            )
+        # Copy the changed areas of the bars onto the screen, then draw the text over them.
+        for area in changed_areas:
+            self._screen.blit(self._bars, area, area)
+        # For each text surface (Enumerate method turns list to list of tuples with index and value)...
+        for string_index, text in enumerate(text_surfaces):
+            self._screen.blit(text, (15, 8 + string_index * 26)) # Display the text on the screen, determining height from the index.
         
-        # Update the display.
-        pygame.display.flip()
\ No newline at end of file
+        # Update only the changed areas of the display.
+        pygame.display.update(changed_areas)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""The directly runnable script for running the benchmark suite, storing its results and checking them for regressions.
+
+Please Note: These files are greatly overdocumented, this is because this is to be used as an educational tool, it should be understandable with zero python knowledge.
+"""
+
+import sys
+import modules.algorithm_registry as algorithm_registry
+import modules.benchmark_history as benchmark_history
+import modules.input_generators as input_generators
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+# The names of every registered algorithm, used as the default when no algorithm is specified.
+ALGORITHM_NAMES = algorithm_registry.names() # (Read from the registry's index, without importing every algorithm.)
+
+# The help text to be displayed on the screen.
+__help__ = f"""
+USAGE:
+    python regression.py
+
+    Runs every algorithm on every distribution at lengths of 2^k, stores the results with the git commit and machine they were run on,
+    then compares them with the last stored run on this machine. Exits with status 1 when a regression is found.
+
+    Flags:
+        -t [algorithms] (Optional): Comma separated algorithms to run. Defaults to all of them.
+            Choose from: {', '.join(ALGORITHM_NAMES)}
+        -dist [distributions] (Optional): Comma separated shapes of array to sort. Defaults to all of them.
+            Choose from: {', '.join(input_generators.__distributions__.keys())}
+        -k [smallest],[largest] (Optional): The smallest and largest powers of two to use as lengths. Defaults to {min(benchmark_history.DEFAULT_POWERS)},{max(benchmark_history.DEFAULT_POWERS)}.
+        -r [repeats] (Optional): The number of times to repeat each algorithm at each length. Defaults to {benchmark_history.DEFAULT_REPEATS}.
+            At least {benchmark_history.min_repeats()}, fewer can never show a significant slowdown.
+        -limit [seconds] (Optional): Stop running an algorithm at longer lengths once its median time passes this. Defaults to {benchmark_history.DEFAULT_TIME_LIMIT}.
+        -db [file] (Optional): The database the runs are stored in. Defaults to {benchmark_history.DEFAULT_DATABASE}.
+        -baseline [commit] (Optional): Compare with the last run on this commit (or the start of one) instead of the last run.
+        -nosave (Optional): Do not store this run, only compare it.
+        -h (Optional): Prints this message.
+
+    Example: python regression.py -t quick_sort,introsort,merge -k 8,16 -r 7
+"""
+
+
+def flag_value(flag, default):
+    """Get the value given after a command line flag.
+
+    Args:
+        flag (str): The flag to look for, e.g. "-k".
+        default (str): The value to return when the flag has not been given.
+
+    Returns:
+        str: The value after the flag, or the default.
+    """
+    if flag in sys.argv and sys.argv.index(flag) + 1 < len(sys.argv): # Checks if flag exists and has a value after it.
+        return sys.argv[sys.argv.index(flag) + 1]
+    return default
+
+
+def format_exponent(exponent):
+    """Format a fitted exponent for the report, e.g. "n^1.12", or "-" when there was none."""
+    return "-" if exponent is None else f"n^{exponent:.2f}"
+
+
+if __name__ == "__main__": # If the file is being run directly (not imported as a library)...
+
+    if "-h" in sys.argv: # Checks if help flag exists.
+        print(__help__)
+        sys.exit()
+
+    algorithms = flag_value("-t", ",".join(ALGORITHM_NAMES)).split(",") # The algorithms to run.
+    distributions = flag_value("-dist", ",".join(input_generators.__distributions__.keys())).split(",") # The shapes of array.
+    powers = flag_value("-k", f"{min(benchmark_history.DEFAULT_POWERS)},{max(benchmark_history.DEFAULT_POWERS)}").split(",") # The powers of two.
+    repeats, time_limit = flag_value("-r", str(benchmark_history.DEFAULT_REPEATS)), flag_value("-limit", str(benchmark_history.DEFAULT_TIME_LIMIT))
+    database, baseline_commit = flag_value("-db", benchmark_history.DEFAULT_DATABASE), flag_value("-baseline", None)
+
+    # Check every algorithm exists and every number is a number before spending any time benchmarking.
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHM_NAMES:
+            print(f"ERROR: The algorithm '{algorithm}' does not exist.")
+            print(__help__)
+            sys.exit(1)
+    for distribution in distributions:
+        if distribution not in input_generators.__distributions__:
+            print(f"ERROR: The distribution '{distribution}' does not exist.")
+            print(__help__)
+            sys.exit(1)
+    # With fewer repeats than min_repeats(), even the slowest possible new times are not significant, so nothing could be flagged.
+    if len(powers) != 2 or not all(power.isdigit() for power in powers) or not repeats.isdigit() or int(repeats) < benchmark_history.min_repeats():
+        print(f"ERROR: The powers must be two whole numbers, and there must be at least {benchmark_history.min_repeats()} repeats"
+              " (Fewer can never show a significant slowdown).")
+        print(__help__)
+        sys.exit(1)
+    try:
+        time_limit = float(time_limit)
+    except ValueError:
+        print("ERROR: The time limit must be a number.")
+        sys.exit(1)
+
+    commit_id, machine = benchmark_history.current_commit(), benchmark_history.machine_id()
+    print(f"Running the suite on commit {commit_id}, {machine}...")
+    results = benchmark_history.run_suite(
+        algorithms, distributions, range(int(powers[0]), int(powers[1]) + 1), int(repeats), time_limit,
+        progress=lambda result: print(f"    {result['algorithm']}, {result['distribution']}, n = {result['length']:,}: {result['median']:.6f}s"),
+    )
+
+    with benchmark_history.HistoryStore(database) as store:
+        run_id = None if "-nosave" in sys.argv else store.add_run(commit_id, machine, results)
+        baseline = store.find_run(machine, baseline_commit, run_id) # The baseline is always a run before this one.
+        baseline_results = store.get_results(baseline[0]) if baseline else []
+
+    summaries, regressions = benchmark_history.compare(results, baseline_results)
+    print("\nBaseline: " + (f"commit {baseline[1]}" if baseline else "none stored yet with these arrays, this run will be the baseline of the next."))
+    print("\nFitted complexity (time = c * n^exponent):")
+    for summary in summaries:
+        print(f"    {summary['algorithm']}, {summary['distribution']}: {format_exponent(summary['exponent'])} (baseline {format_exponent(summary['baseline_exponent'])})")
+
+    if regressions: # Exit with an error, so a script (e.g. CI) running the suite can tell a regression was found.
+        print(f"\n{len(regressions)} regression(s) found:")
+        for regression in regressions:
+            print(f"    {regression['algorithm']}, {regression['distribution']} ({regression['kind']}): {regression['detail']}")
+        sys.exit(1)
+    print("\nNo regressions found.")
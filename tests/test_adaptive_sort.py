@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Tests for the choices made by the adaptive sort (modules/adaptive_sort.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import random
+import unittest
+
+import modules.adaptive_sort as adaptive_sort
+import modules.step_scheduler as step_scheduler
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+def block_shuffled(length, smallest_block, largest_block, seed=0):
+    """Get the numbers 0 to length - 1 in order, with the numbers inside each block (of a random size) shuffled."""
+    rng, values, start = random.Random(seed), list(range(length)), 0
+    while start < length:
+        end = min(start + rng.randint(smallest_block, largest_block), length)
+        block = values[start:end]
+        rng.shuffle(block)
+        values[start:end] = block
+        start = end
+    return values
+
+
+def inversions(values):
+    """Count the pairs of values that are out of order, one pair at a time (Only for short arrays)."""
+    return sum(1 for i in range(len(values)) for j in range(i) if values[j] > values[i])
+
+
+class TestAdaptiveSort(unittest.TestCase):
+
+    def test_block_shuffled_is_not_insertion_sorted(self):
+        # Far too many inversions for insertion sort, but too few for a sample of pairs to find many of them.
+        values = block_shuffled(100000, 1000, 1500)
+        profile = adaptive_sort.probe(values)
+        self.assertIsNone(profile.inversion_bound)
+        self.assertNotEqual(adaptive_sort.choose(profile)[0], "insertion")
+
+    def test_nearly_sorted_is_insertion_sorted(self):
+        values = list(range(100000))
+        for index in range(0, len(values) - 1, 50): # Swap one neighbouring pair every 50 elements.
+            values[index], values[index + 1] = values[index + 1], values[index]
+        self.assertEqual(adaptive_sort.choose(adaptive_sort.probe(values))[0], "insertion")
+
+    def test_inversion_bound_is_never_below_the_inversions(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            values = sorted(rng.randint(0, 20) for _ in range(rng.randint(0, 60)))
+            for _ in range(rng.randint(0, 5)): # Move a few values out of place.
+                if len(values) > 1:
+                    values.insert(rng.randrange(len(values)), values.pop(rng.randrange(len(values))))
+            self.assertGreaterEqual(adaptive_sort._inversion_bound(values, len(values) ** 2), inversions(values))
+
+    def test_auto_sorts_block_shuffled(self):
+        values = block_shuffled(5000, 100, 150)
+        step_scheduler.fast_path(adaptive_sort.auto)(values)
+        self.assertEqual(values, list(range(5000)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Tests for the saved index of algorithm names (modules/algorithm_registry.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import modules.algorithm_registry as algorithm_registry
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+class TestAlgorithmRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.directory.name, "registry.json")
+        algorithm_registry._index = None # Forget the index read by anything before, so it is read from index_path.
+
+    def tearDown(self):
+        algorithm_registry._index = None
+        self.directory.cleanup()
+
+    def save_index(self, fingerprint, algorithms):
+        with open(self.index_path, "w") as file:
+            json.dump({"fingerprint": fingerprint, "algorithms": algorithms}, file)
+
+    def test_foreign_index_is_rebuilt(self):
+        # An index saved by another copy of the project, its providers are the same modules in other files.
+        fingerprint = algorithm_registry._fingerprint()
+        for provider in fingerprint["providers"]:
+            provider[1] = os.path.join("/elsewhere", os.path.basename(provider[1] or ""))
+        self.save_index(fingerprint, [["not_here", "modules.sorting_algorithms"]])
+        names = algorithm_registry.names(self.index_path)
+        self.assertNotIn("not_here", names)
+        self.assertIn("timsort", names)
+
+    def test_stale_index_is_rebuilt(self):
+        fingerprint = algorithm_registry._fingerprint()
+        fingerprint["providers"][0][3] -= 1 # The provider has been changed since.
+        self.save_index(fingerprint, [["not_here", "modules.sorting_algorithms"]])
+        self.assertNotIn("not_here", algorithm_registry.names(self.index_path))
+
+    def test_up_to_date_index_is_read(self):
+        self.save_index(algorithm_registry._fingerprint(), [["timsort", "modules.sorting_algorithms"]])
+        self.assertEqual(algorithm_registry.names(self.index_path), ["timsort"])
+
+
+if __name__ == "__main__":
+    unittest.main()
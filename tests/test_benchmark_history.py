@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Tests for the significance test used to flag slowdowns (modules/benchmark_history.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import modules.benchmark_history as benchmark_history
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+class TestMinRepeats(unittest.TestCase):
+
+    def test_fewer_repeats_can_never_be_significant(self):
+        repeats = benchmark_history.min_repeats()
+        p_value = benchmark_history.mann_whitney_p # (Every new time slower than every old time gives its smallest p value.)
+        self.assertLess(p_value(range(repeats, 2 * repeats), range(repeats)), benchmark_history.SIGNIFICANCE)
+        self.assertGreaterEqual(p_value(range(repeats - 1, 2 * repeats - 2), range(repeats - 1)), benchmark_history.SIGNIFICANCE)
+
+    def test_default_repeats_are_enough(self):
+        self.assertGreaterEqual(benchmark_history.DEFAULT_REPEATS, benchmark_history.min_repeats())
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "history.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_runs_of_other_arrays_are_not_baselines(self):
+        with benchmark_history.HistoryStore(self.path) as store:
+            store.add_run("old", "machine", [], datasets="v0 (python)")
+            self.assertIsNone(store.find_run("machine"))
+            run_id = store.add_run("new", "machine", [])
+            self.assertEqual(store.find_run("machine"), (run_id, "new"))
+
+    def test_databases_without_datasets_are_upgraded(self):
+        with sqlite3.connect(self.path) as connection: # A database made before the datasets were stored.
+            connection.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY, commit_id TEXT, machine TEXT, created REAL)")
+            connection.execute("INSERT INTO runs (commit_id, machine, created) VALUES ('old', 'machine', 0)")
+        connection.close()
+        with benchmark_history.HistoryStore(self.path) as store:
+            self.assertIsNone(store.find_run("machine"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Tests for sorting files too large for memory (modules/external_sort.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+import modules.external_sort as external_sort
+import modules.sorting_algorithms as sorting_algorithms
+import modules.step_scheduler as step_scheduler
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+def sort_run(run):
+    """Sort a run with the fast path of a registered algorithm, as the engine does."""
+    step_scheduler.fast_path(sorting_algorithms.timsort)(run)
+    return run
+
+
+class TestExternalSort(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, "input.bin")
+        self.output_path = os.path.join(self.directory.name, "output.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def sort(self, values, record_width=8, **kwargs):
+        external_sort.write_records(self.input_path, values, record_width)
+        run_count = external_sort.sort_file(self.input_path, self.output_path, sort_run, record_width=record_width, **kwargs)
+        return run_count, list(external_sort.read_records(self.output_path, record_width))
+
+    def test_merge_in_passes(self):
+        # More runs than MAX_FAN_IN, so they are merged into groups before the final merge.
+        values = [random.Random(0).randint(-1000, 1000) for _ in range(external_sort.MAX_FAN_IN * 3 + 5)]
+        run_count, output = self.sort(values, run_records=1)
+        self.assertGreater(run_count, external_sort.MAX_FAN_IN)
+        self.assertEqual(output, sorted(values))
+
+    def test_record_widths(self):
+        for record_width, bits in ((4, 32), (8, 64)):
+            with self.subTest(record_width=record_width):
+                rng = random.Random(1)
+                values = [-2**(bits - 1), 2**(bits - 1) - 1, 0, -1] + [rng.randrange(-2**(bits - 1), 2**(bits - 1)) for _ in range(500)]
+                run_count, output = self.sort(values, record_width, run_records=50)
+                self.assertEqual(run_count, 11)
+                self.assertEqual(output, sorted(values))
+        with self.assertRaises(ValueError):
+            external_sort.sort_file(self.input_path, self.output_path, sort_run, record_width=2)
+
+    def test_empty_file(self):
+        self.assertEqual(self.sort([]), (0, []))
+
+    def test_partial_record(self):
+        with open(self.input_path, "wb") as file:
+            file.write(bytes(12)) # One and a half 8 byte records.
+        with self.assertRaises(ValueError):
+            external_sort.sort_file(self.input_path, self.output_path, sort_run)
+
+    def test_cancelled(self):
+        external_sort.write_records(self.input_path, range(300, 0, -1))
+        for calls_before_cancel in (0, 3): # While splitting the file into runs, and while merging them.
+            with self.subTest(calls_before_cancel=calls_before_cancel):
+                calls = []
+                def cancelled():
+                    calls.append(None)
+                    return len(calls) > calls_before_cancel
+                with self.assertRaises(external_sort.ExternalSortCancelled):
+                    external_sort.sort_file(self.input_path, self.output_path, sort_run, run_records=100, cancelled=cancelled)
+                self.assertFalse(os.path.exists(self.output_path)) # Nothing is left half written.
+
+
+if __name__ == "__main__":
+    unittest.main()
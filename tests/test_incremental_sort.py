@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""Tests for sorting values as they arrive in batches (modules/incremental_sort.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import collections
+import random
+import unittest
+
+import modules.algorithm_registry as algorithm_registry
+import modules.incremental_sort as incremental_sort
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+def batches(values, rng):
+    """Split values into batches of random sizes (Including empty batches)."""
+    start = 0
+    while start < len(values):
+        size = rng.randint(0, 40)
+        yield values[start:start + size]
+        start += size
+
+
+class TestIncrementalSorter(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.values = [rng.randint(-50, 50) for _ in range(500)] # Many duplicates.
+        self.batches = list(batches(self.values, rng))
+
+    def check(self, sorter, values):
+        expected = sorted(values)
+        for k in (0, 1, 7, len(values), len(values) + 10):
+            with self.subTest(k=k):
+                self.assertEqual(sorter.smallest(k), expected[:k])
+                self.assertEqual(sorter.largest(k), expected[::-1][:k])
+        self.assertEqual(sorter.sorted(), expected)
+        self.assertEqual(list(sorter), expected)
+        self.assertEqual(len(sorter), len(values))
+
+    def test_push(self):
+        sorter = incremental_sort.IncrementalSorter()
+        self.check(sorter, [])
+        for batch_index, batch in enumerate(self.batches):
+            sorter.push(batch)
+            if batch_index % 5 == 0: # Before the runs are merged into one.
+                pushed = [value for batch in self.batches[:batch_index + 1] for value in batch]
+                self.assertEqual(sorter.smallest(10), sorted(pushed)[:10])
+                self.assertEqual(sorter.largest(10), sorted(pushed, reverse=True)[:10])
+        self.check(sorter, self.values)
+
+    def test_push_steps_with_every_algorithm(self):
+        for algorithm in algorithm_registry.load_all():
+            with self.subTest(algorithm=algorithm.__name__):
+                sorter = incremental_sort.IncrementalSorter(algorithm)
+                for batch in self.batches:
+                    collections.deque(sorter.push_steps(batch), maxlen=0)
+                self.check(sorter, self.values)
+
+    def test_streamed(self):
+        for batch_size in (1, 16, 1000):
+            with self.subTest(batch_size=batch_size):
+                values = self.values.copy()
+                collections.deque(incremental_sort.streamed(algorithm_registry.load_all()[0], batch_size)(values), maxlen=0)
+                self.assertEqual(values, sorted(self.values))
+
+
+class TestTopK(unittest.TestCase):
+
+    def test_largest(self):
+        rng = random.Random(1)
+        values = [rng.randint(0, 30) for _ in range(300)]
+        for k in (0, 1, 10, 300, 400):
+            with self.subTest(k=k):
+                top = incremental_sort.TopK(k)
+                for batch in batches(values, rng):
+                    top.push(batch)
+                self.assertEqual(top.largest(), sorted(values, reverse=True)[:k])
+                self.assertEqual(len(top), min(k, len(values)))
+
+
+if __name__ == "__main__":
+    unittest.main()
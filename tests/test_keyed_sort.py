@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Tests for sorting by a key, largest first and by columns with every registered algorithm (modules/keyed_sort.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import collections
+import random
+import unittest
+
+import modules.algorithm_registry as algorithm_registry
+import modules.keyed_sort as keyed_sort
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+ALGORITHMS = algorithm_registry.load_all()
+
+
+def drained(func, sorting_array):
+    """Run every step of an algorithm (rather than its fast path), as the engine does with a window open."""
+    collections.deque(func(sorting_array), maxlen=0)
+
+
+class TestKeyedSort(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.words = ["".join(rng.choice("abcde") for _ in range(rng.randint(1, 3))) for _ in range(300)]
+        self.records = [(rng.randint(0, 9), rng.choice("xyz"), index) for index in range(300)]
+        self.wide = [rng.choice([-2**62, -5, 0, 7, 2**62]) + rng.randint(0, 3) for _ in range(300)] # Too far apart to pack.
+
+    def check(self, values, key, reverse=False):
+        expected = sorted(values, key=key, reverse=reverse)
+        for algorithm in ALGORITHMS:
+            with self.subTest(algorithm=algorithm.__name__, reverse=reverse):
+                records = values.copy()
+                keyed_sort.sort(records, algorithm, key=key, reverse=reverse)
+                self.assertEqual(records, expected)
+                records = values.copy()
+                drained(keyed_sort.keyed(algorithm, key, reverse), records)
+                self.assertEqual(records, expected)
+
+    def test_string_keys(self):
+        self.check(self.words, None)
+        self.check(self.words, len, reverse=True)
+
+    def test_tuple_keys(self):
+        self.check(self.records, lambda record: record[:2])
+        self.check(self.records, lambda record: record[:2], reverse=True)
+
+    def test_wide_whole_number_keys(self):
+        self.check(self.wide, None)
+        self.check(self.wide, None, reverse=True)
+
+    def test_decorations_fit_in_64_bits(self):
+        for keys in (self.wide, self.words, [2**100, -2**100, 0]):
+            decorations = keyed_sort.decorate(keys, reverse=True)
+            self.assertTrue(all(0 <= decoration < keyed_sort.DECORATION_LIMIT for decoration in decorations))
+
+    def test_columns(self):
+        rng = random.Random(1)
+        ages, names = [rng.randint(20, 25) for _ in range(200)], [rng.choice(["ann", "bob", "cy"]) for _ in range(200)]
+        expected = sorted(range(200), key=lambda index: (ages[index], names[index]), reverse=True)
+        for algorithm in ALGORITHMS:
+            with self.subTest(algorithm=algorithm.__name__):
+                columns = {"age": ages.copy(), "name": names.copy(), "index": list(range(200))}
+                keyed_sort.sort_columns(columns, by=["age", "name"], algorithm=algorithm, descending=["age", "name"])
+                self.assertEqual(columns["index"], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
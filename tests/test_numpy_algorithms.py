@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Tests for the vectorized algorithms on NumPy arrays (modules/numpy_algorithms.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import unittest
+
+import modules.numpy_algorithms as numpy_algorithms
+import modules.step_scheduler as step_scheduler
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+@unittest.skipIf(numpy_algorithms.numpy is None, "NumPy is not installed")
+class TestGapPasses(unittest.TestCase):
+
+    def arrays(self):
+        numpy = numpy_algorithms.numpy
+        rng = numpy.random.default_rng(0)
+        return [
+            rng.integers(0, 100, 3000), # Many duplicates.
+            rng.random(2000), # Floating point, padded with infinity.
+            numpy.array([numpy.iinfo(numpy.int64).max, numpy.iinfo(numpy.int64).min, 0, numpy.iinfo(numpy.int64).max]),
+            numpy.arange(500)[::-1].copy(),
+            numpy.array([], dtype=numpy.int64),
+        ]
+
+    def test_vectorized_gap_sorts(self):
+        for algorithm in (numpy_algorithms.shell_vectorized, numpy_algorithms.comb_vectorized):
+            for array in self.arrays():
+                with self.subTest(algorithm=algorithm.__name__, dtype=str(array.dtype), length=len(array)):
+                    expected = numpy_algorithms.numpy.sort(array)
+                    step_scheduler.fast_path(algorithm)(array)
+                    self.assertEqual(array.tolist(), expected.tolist())
+
+    def test_comb_pass_compares_each_pair_once(self):
+        array = numpy_algorithms.numpy.array([4, 3, 2, 1])
+        numpy_algorithms._gap_pass(array, 2, False) # (4, 2) and (3, 1) are swapped, the chains are not sorted any further.
+        self.assertEqual(array.tolist(), [2, 1, 4, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
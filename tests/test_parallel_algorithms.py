@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Tests for the algorithms sorted by worker processes at the same time (modules/parallel_algorithms.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import random
+import unittest
+
+import modules.numpy_algorithms as numpy_algorithms
+import modules.parallel_algorithms as parallel_algorithms
+import modules.step_scheduler as step_scheduler
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+ALGORITHMS = (parallel_algorithms.parallel_merge, parallel_algorithms.sample_sort)
+SMALLEST, LARGEST = -2**63, 2**63 - 1 # The limits of the 64-bit shared buffers.
+
+
+class TestParallelAlgorithms(unittest.TestCase):
+
+    def setUp(self):
+        self.workers = parallel_algorithms.get_workers()
+
+    def tearDown(self):
+        parallel_algorithms.set_workers(self.workers) # (Also stops any pool started by a test.)
+
+    def arrays(self):
+        rng = random.Random(0)
+        return {
+            "empty": [],
+            "one": [5],
+            "fewer than the tasks": [3, 1, 2], # Fewer values than workers * TASKS_PER_WORKER.
+            "duplicates": [rng.randint(0, 3) for _ in range(1000)],
+            "all equal": [7] * 300, # Every splitter of the sample sort is the same value.
+            "limits": [rng.choice([SMALLEST, LARGEST, 0, -1, 1]) for _ in range(500)],
+            "random": [rng.randint(SMALLEST, LARGEST) for _ in range(2000)],
+        }
+
+    def check(self, workers):
+        parallel_algorithms.set_workers(workers)
+        for algorithm in ALGORITHMS:
+            for name, values in self.arrays().items():
+                with self.subTest(algorithm=algorithm.__name__, workers=workers, values=name):
+                    sorting_array = values.copy()
+                    step_scheduler.fast_path(algorithm)(sorting_array)
+                    self.assertEqual(sorting_array, sorted(values))
+
+    def test_one_worker(self):
+        self.check(1)
+
+    def test_worker_processes(self):
+        self.check(3)
+
+    def test_more_workers_than_values(self):
+        self.check(8)
+
+    @unittest.skipIf(numpy_algorithms.numpy is None, "NumPy is not installed")
+    def test_numpy_arrays(self):
+        parallel_algorithms.set_workers(2)
+        values = numpy_algorithms.numpy.random.default_rng(0).integers(SMALLEST, LARGEST, 1000, endpoint=True)
+        for algorithm in ALGORITHMS:
+            with self.subTest(algorithm=algorithm.__name__):
+                sorting_array = values.copy()
+                step_scheduler.fast_path(algorithm)(sorting_array)
+                self.assertEqual(sorting_array.tolist(), sorted(values.tolist()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Tests for the snapshots published to the window (modules/snapshot_channel.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import unittest
+
+import modules.algorithm_engine as algorithm_engine
+import modules.instrumentation as instrumentation
+import modules.snapshot_channel as snapshot_channel
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+class TestSnapshotChannel(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = algorithm_engine.Algorithm()
+        self.engine._snapshot_channel = self.channel = snapshot_channel.SnapshotChannel(100)
+
+    def publish(self):
+        self.channel.publish(self.engine)
+        return self.channel.take()[0]
+
+    def test_new_array_at_the_same_address_finds_its_maximum(self):
+        array = [1, 2, 3]
+        self.engine._install_array(array)
+        self.assertEqual(self.publish().maximum, 3)
+        array[:] = [100, 5, 6] # The same list (and so the same id) holding a new array.
+        self.engine._install_array(array)
+        self.assertEqual(self.publish().maximum, 100)
+
+    def test_publishing_counts_no_reads(self):
+        array = instrumentation.instrument_array(range(500))
+        self.engine._install_array(array)
+        self.publish()
+        self.assertEqual(array.counters.reads, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Tests for the fast paths compiled from the algorithms (modules/step_scheduler.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import random
+import unittest
+
+import modules.algorithm_registry as algorithm_registry
+import modules.input_generators as input_generators
+import modules.step_scheduler as step_scheduler
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+SCALE = 1 # Read by scaled() each time it runs.
+
+
+def _sort_steps(sorting_array):
+    yield
+    sorting_array.sort()
+
+
+def finally_step(sorting_array):
+    try:
+        yield from _sort_steps(sorting_array)
+    finally:
+        yield # The only statement of the block, so removing it leaves the block empty.
+    for _ in sorting_array:
+        yield
+    else:
+        yield
+
+
+def scaled(sorting_array):
+    sorting_array[:] = [value * SCALE for value in sorting_array]
+    yield
+
+
+class TestFastPath(unittest.TestCase):
+
+    def test_blocks_left_empty_are_compiled(self):
+        self.assertIsNotNone(step_scheduler._compile_fast_path(finally_step))
+        values = [3, 1, 2]
+        step_scheduler.fast_path(finally_step)(values)
+        self.assertEqual(values, [1, 2, 3])
+
+    def test_module_names_are_read_when_run(self):
+        global SCALE
+        fast_scaled = step_scheduler.fast_path(scaled)
+        SCALE = 10
+        try:
+            values = [1, 2]
+            fast_scaled(values)
+            self.assertEqual(values, [10, 20])
+        finally:
+            SCALE = 1
+
+
+class TestEveryAlgorithm(unittest.TestCase):
+
+    def test_fast_path_sorts_like_the_steps(self):
+        for algorithm in algorithm_registry.load_all():
+            for distribution, generate in input_generators.__distributions__.items():
+                for length in (0, 1, 37, 600):
+                    with self.subTest(algorithm=algorithm.__name__, distribution=distribution, length=length):
+                        values = generate(length, random.Random(length))
+                        fast_values, stepped_values = values.copy(), values.copy()
+                        step_scheduler.fast_path(algorithm)(fast_values)
+                        step_scheduler._drained(algorithm)(stepped_values)
+                        self.assertEqual(fast_values, sorted(values))
+                        self.assertEqual(stepped_values, fast_values)
+
+    def test_plain_algorithms_are_compiled(self):
+        # A compiled fast path that quietly stopped compiling (e.g. its source could not be read) would only show up as slower benchmarks.
+        for algorithm in algorithm_registry.load_all():
+            if hasattr(algorithm, "__wrapped__") or hasattr(algorithm, "__fast_path__"): continue # These are never compiled.
+            with self.subTest(algorithm=algorithm.__name__):
+                self.assertIsNotNone(step_scheduler._compile_fast_path(algorithm))
+
+
+if __name__ == "__main__":
+    unittest.main()
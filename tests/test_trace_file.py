@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Tests for reading damaged trace files (modules/trace_file.py).
+
+Run from the top folder with: python -m pytest tests (or python -m unittest discover tests).
+"""
+
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+import modules.sorting_algorithms as sorting_algorithms
+import modules.trace_file as trace_file
+
+__author__ = "Archer Hume"
+__copyright__ = "Copyright (C) 2022 Archer Hume"
+__license__ = "MIT"
+__version__ = "1.0.0"
+__maintainer__ = "Archer Hume"
+__email__ = "archer@hume.email"
+__status__ = "Development"
+
+
+class TestTraceFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run.trace")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data):
+        with open(self.path, "wb") as file:
+            file.write(data)
+
+    def test_damaged_files_are_format_errors(self):
+        header = trace_file.MAGIC + bytes([trace_file.FORMAT_VERSION, 0])
+        damaged_files = [
+            b"", # Empty.
+            trace_file.MAGIC, # Cut short in the header.
+            header + struct.pack("<I", 1000) + b"{}", # Cut short in the metadata.
+            header + struct.pack("<I", 3) + b'{"a' + struct.pack("<Q", 0), # Metadata that is not JSON.
+            header + struct.pack("<I", 2) + b"{}" + struct.pack("<Q", 1000), # Cut short in the array.
+        ]
+        for data in damaged_files:
+            self.write(data)
+            with self.assertRaises(trace_file.TraceFormatError):
+                trace_file.TraceReader(self.path)
+
+    def test_reader_is_closed_by_with(self):
+        values = random.Random(0).sample(range(200), 200)
+        trace_file.record_trace(sorting_algorithms.insertion, values.copy(), self.path)
+        with trace_file.TraceReader(self.path) as reader:
+            self.assertEqual(reader.initial_array(), values)
+        with self.assertRaises(ValueError): # Reading a closed mapping fails.
+            reader.initial_array()
+
+
+if __name__ == "__main__":
+    unittest.main()